@@ -1,6 +1,6 @@
-import random
 from utils import manhattan_distance
 from logger import DEBUG
+from field_goal import evaluate_field_goal
 
 class AIGoalSystem:
     """Handles goal setting for goblins"""
@@ -24,25 +24,25 @@ class AIGoalSystem:
             
             # Check path to end zone for active defenders
             path_defender_count = self.count_defenders_in_path(goblin, target_y)
-            DEBUG.log(f"Carrier {goblin.name} has {path_defender_count} defenders in path to end zone")
+            DEBUG.log("Carrier %s has %s defenders in path to end zone", goblin.name, path_defender_count)
             
             # Count defenders that are still up nearby
             nearby_defender_count = self.count_nearby_opponents(goblin.position, goblin.team)
-            DEBUG.log(f"Carrier {goblin.name} has {nearby_defender_count} nearby defenders")
+            DEBUG.log("Carrier %s has %s nearby defenders", goblin.name, nearby_defender_count)
             
             # Check if in immediate danger of being blocked (adjacent to defender)
             in_danger = self.is_adjacent_to_opponent(goblin)
             if in_danger:
-                DEBUG.log(f"Carrier {goblin.name} is in immediate danger (adjacent to defender)")
+                DEBUG.log("Carrier %s is in immediate danger (adjacent to defender)", goblin.name)
             
             # First check if very close to end zone, always prioritize scoring when close
             if distance <= 3:
-                DEBUG.log(f"Carrier {goblin.name} is close to end zone, prioritizing touchdown")
+                DEBUG.log("Carrier %s is close to end zone, prioritizing touchdown", goblin.name)
                 return "score_touchdown"
             # Check for clear path to end zone - be more aggressive
             elif path_defender_count == 0:
                 # Clear path to end zone, prioritize direct scoring run
-                DEBUG.log(f"Carrier {goblin.name} has clear path to end zone, prioritizing touchdown")
+                DEBUG.log("Carrier %s has clear path to end zone, prioritizing touchdown", goblin.name)
                 return "score_touchdown"
             # Field goal as a last resort if:
             # 1. Multiple defenders blocking path to end zone, or
@@ -54,24 +54,24 @@ class AIGoalSystem:
                 
                 # Calculate field goal success chance to decide if it's worth attempting
                 field_goal_chance = self.estimate_field_goal_chance(goblin)
-                DEBUG.log(f"Carrier {goblin.name} considering field goal, success chance: {field_goal_chance:.2f}")
+                DEBUG.log("Carrier %s considering field goal, success chance: %.2f", goblin.name, field_goal_chance)
                 
                 # Only attempt field goal if chance is reasonable (above 30%)
                 # And we're at least a moderate distance from the end zone
                 if field_goal_chance >= 0.3 and distance >= 4:
-                    DEBUG.log(f"Carrier {goblin.name} decided to attempt field goal")
+                    DEBUG.log("Carrier %s decided to attempt field goal", goblin.name)
                     return "attempt_field_goal"
                 else:
                     # If field goal chance is too low, try to advance or evade
-                    DEBUG.log(f"Carrier {goblin.name} decided against field goal, will evade instead")
+                    DEBUG.log("Carrier %s decided against field goal, will evade instead", goblin.name)
                     return "evade_defenders"
             # Only evade if multiple defenders are nearby and active
             elif nearby_defender_count >= 2:
-                DEBUG.log(f"Carrier {goblin.name} has multiple defenders nearby, will evade")
+                DEBUG.log("Carrier %s has multiple defenders nearby, will evade", goblin.name)
                 return "evade_defenders"
             # Default goal is to advance
             else:
-                DEBUG.log(f"Carrier {goblin.name} will advance downfield")
+                DEBUG.log("Carrier %s will advance downfield", goblin.name)
                 return "advance_downfield"
         
         elif goblin.team == self.game.offense_team:
@@ -133,19 +133,8 @@ class AIGoalSystem:
         Returns:
             int: Number of nearby enemies
         """
-        count = 0
-        x, y = position
-        
         # Check a 3x3 area around the position
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                check_pos = (x + dx, y + dy)
-                if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                    entity = self.game.grid.get_entity_at_position(check_pos)
-                    if entity and hasattr(entity, 'team') and entity.team != team and not entity.knocked_down:
-                        count += 1
-                        
-        return count
+        return self.game.grid.area_count(position, team)
     
     def find_closest_opponent_to(self, goblin):
         """Find the closest enemy goblin to a goblin
@@ -159,14 +148,11 @@ class AIGoalSystem:
         closest = None
         min_distance = float('inf')
         
-        for x in range(self.game.grid.width):
-            for y in range(self.game.grid.height):
-                entity = self.game.grid.get_entity_at_position((x, y))
-                if entity and hasattr(entity, 'team') and entity.team != goblin.team and not entity.knocked_down:
-                    distance = manhattan_distance(goblin.position, (x, y))
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest = entity
+        for entity in self.game.grid.get_standing_goblins(goblin.team):
+            distance = manhattan_distance(goblin.position, entity.position)
+            if distance < min_distance:
+                min_distance = distance
+                closest = entity
                         
         return closest
     
@@ -229,28 +215,27 @@ class AIGoalSystem:
         # Determine direction to end zone
         direction = -1 if target_y < goblin.position[1] else 1
         
-        # Count opponents in a corridor between goblin and end zone
-        count = 0
         current_x, current_y = goblin.position
+        width = self.game.grid.width
         
         # Define the corridor width (wider = more conservative)
         corridor_width = 2  # Check 2 squares to each side of direct path
         
-        # Scan squares in path to end zone
+        # Bitmask of the corridor columns within a single row
+        left = max(0, current_x - corridor_width)
+        right = min(width - 1, current_x + corridor_width)
+        row_mask = ((1 << (right - left + 1)) - 1) << left
+        
+        # Combine the rows between the goblin and the end zone
+        corridor = 0
         for y in range(current_y + direction, target_y + direction, direction):
             if not (0 <= y < self.game.grid.height):
                 break
-                
-            # Check squares in this row within corridor
-            for x in range(current_x - corridor_width, current_x + corridor_width + 1):
-                if not (0 <= x < self.game.grid.width):
-                    continue
-                    
-                entity = self.game.grid.get_entity_at_position((x, y))
-                if entity and hasattr(entity, 'team') and entity.team != goblin.team and not entity.knocked_down:
-                    count += 1
+            corridor |= row_mask << (y * width)
         
-        return count
+        # Count opponents in a corridor between goblin and end zone
+        opponents = self.game.grid.zones.standing_opponents(goblin.team)
+        return bin(opponents & corridor).count("1")
     
     def is_adjacent_to_opponent(self, goblin):
         """Check if a goblin is adjacent to any opponent
@@ -261,21 +246,7 @@ class AIGoalSystem:
         Returns:
             bool: True if adjacent to an opponent, False otherwise
         """
-        x, y = goblin.position
-        
-        # Check all adjacent squares
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                if dx == 0 and dy == 0:
-                    continue  # Skip self
-                    
-                check_pos = (x + dx, y + dy)
-                if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                    entity = self.game.grid.get_entity_at_position(check_pos)
-                    if entity and hasattr(entity, 'team') and entity.team != goblin.team and not entity.knocked_down:
-                        return True
-                        
-        return False
+        return self.game.grid.zone_count(goblin.position, goblin.team) > 0
             
     def estimate_field_goal_chance(self, goblin):
         """Estimate the chance of a successful field goal
@@ -286,55 +257,14 @@ class AIGoalSystem:
         Returns:
             float: Estimated success chance (0.0-1.0)
         """
-        # Find hoop position
-        if goblin.team == self.game.team1:
-            hoop_y = 0
-        else:
-            hoop_y = self.game.grid.height - 1
-            
-        hoop_x = self.game.grid.width // 2
-        hoop_pos = (hoop_x, hoop_y)
-        
-        # Calculate distance to hoop
-        distance = manhattan_distance(goblin.position, hoop_pos)
-        
-        # Base chance calculation (more conservative than before)
-        if distance > 5:
-            # "Hail Magoo" shot - very low chance
-            base_chance = 0.05 + (0.05 * min(5, goblin.agility) / 5.0)  # Max 10% for highest agility
-            DEBUG.log(f"Hail Magoo shot from distance {distance}, base chance: {base_chance:.2f}")
-        else:
-            # More conservative base percentages:
-            # 35% at 5 squares, +10% for each square closer
-            base_chance = 0.35 + (5 - distance) * 0.10
-            DEBUG.log(f"Field goal from distance {distance}, base chance: {base_chance:.2f}")
-            
-        # Simple adjustment for nearby defenders (quick estimate)
-        nearby_defenders = self.count_nearby_opponents(goblin.position, goblin.team)
-        defender_penalty = nearby_defenders * -0.15  # More significant penalty
-        DEBUG.log(f"Field goal defender penalty ({nearby_defenders} defenders): {defender_penalty:.2f}")
-        
-        # Simple adjustment for dexterity
-        dexterity = getattr(goblin, 'agility', 5)
-        dexterity_mod = (dexterity - 5) * 0.05
-        DEBUG.log(f"Field goal dexterity modifier (agility {dexterity}): {dexterity_mod:.2f}")
-        
-        # Additional distance penalty for longer shots
-        distance_penalty = -0.05 * max(0, distance - 3)  # Additional penalty beyond 3 squares
-        DEBUG.log(f"Field goal additional distance penalty: {distance_penalty:.2f}")
-        
-        # Calculate estimated chance
-        chance = base_chance + dexterity_mod + defender_penalty + distance_penalty
-        
-        # Cap "Hail Magoo" shots at 10%
-        if distance > 5:
-            chance = min(0.10, chance)
-            
-        # Ensure chance is at least 5% and at most 90% (never guaranteed)
-        final_chance = max(0.05, min(0.90, chance))
-        DEBUG.log(f"Field goal final estimated chance: {final_chance:.2f}")
+        # Shares its odds with the resolution in CarrierMovement.attempt_field_goal
+        shot = evaluate_field_goal(self.game, goblin)
+        DEBUG.log("Field goal from distance %d: base %.2f, dexterity %.2f, defenders %.2f, path %.2f, "
+                  "distance %.2f, final estimated chance: %.2f",
+                  shot['distance'], shot['base_chance'], shot['dexterity_mod'], shot['defender_zoc_penalty'],
+                  shot['path_zoc_penalty'], shot['distance_penalty'], shot['success_chance'])
             
-        return final_chance
+        return shot["success_chance"]
 
 class MovementStyleSelector:
     """Selects movement styles based on goals and situation"""
@@ -396,13 +326,10 @@ class MovementStyleSelector:
         if goal == "advance_downfield" and goblin.has_ball:
             # Count active defenders nearby
             active_defenders = 0
-            for x in range(self.game.grid.width):
-                for y in range(self.game.grid.height):
-                    entity = self.game.grid.get_entity_at_position((x, y))
-                    if entity and hasattr(entity, 'team') and entity.team != goblin.team and not entity.knocked_down:
-                        # Only count defenders that are actually near enough to be a threat
-                        if manhattan_distance(goblin.position, (x, y)) <= 4:
-                            active_defenders += 1
+            for entity in self.game.grid.get_standing_goblins(goblin.team):
+                # Only count defenders that are actually near enough to be a threat
+                if manhattan_distance(goblin.position, entity.position) <= 4:
+                    active_defenders += 1
             
             # If few defenders are active, be much more aggressive and direct
             if active_defenders == 0:
@@ -421,11 +348,11 @@ class MovementStyleSelector:
         
         # Add randomness, but less than before to ensure more consistent behavior
         for style in weights:
-            weights[style] += random.uniform(-0.05, 0.05)
+            weights[style] += self.game.rng.uniform(-0.05, 0.05)
             weights[style] = max(0.05, min(0.9, weights[style]))
         
         # Choose style based on weights
         styles = list(weights.keys())
         chances = [weights[s] for s in styles]
         
-        return random.choices(styles, weights=chances)[0] 
\ No newline at end of file
+        return self.game.rng.choices(styles, weights=chances)[0] 
\ No newline at end of file
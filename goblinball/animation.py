@@ -1,11 +1,16 @@
+from collections import deque
+from config import CONFIG
+
 class Animation:
     """Represents an animation sequence for visualization"""
-    def __init__(self, type, source=None, target=None, result=None, duration=30):
+    def __init__(self, type, source=None, target=None, result=None, duration=30, group=None, origin=None):
         self.type = type  # "move", "block", "knockdown", "score", etc.
         self.source = source  # Source goblin
         self.target = target  # Target position or goblin
         self.result = result  # Outcome
         self.duration = duration  # In frames
+        self.group = group  # Animations sharing a group (e.g. (play, turn)) belong to one turn
+        self.origin = origin  # Square a move starts from, or None for the source goblin's position
         self.frame = 0  # Current frame
         self.complete = False
     
@@ -33,20 +38,95 @@ class Animation:
         return self.get_progress()
         
 class AnimationManager:
-    """Manages a queue of animations"""
-    def __init__(self):
-        self.animations = []
-        self.active_animation = None
+    """Manages a queue of animations
+    
+    Animations can be grouped by turn. In concurrent mode every animation of a turn
+    plays at once; otherwise they play one after another. While turns are waiting
+    behind the one playing, playback speeds up, and once more than max_turns_behind
+    turns are waiting the oldest are skipped, so the viewer never lags the game.
+    """
+    def __init__(self, concurrent=None, max_turns_behind=None):
+        """Create an empty queue
+        
+        Args:
+            concurrent: Play a turn's animations together, defaults to the
+                        "animation_concurrent" config value
+            max_turns_behind: Turns that may wait behind the one playing before the
+                              oldest are skipped, defaults to the
+                              "animation_max_turns_behind" config value
+        """
+        self.animations = deque()
+        self.active = []  # Animations playing now
         self.paused = False
+        self.concurrent = CONFIG.get("animation_concurrent", True) if concurrent is None else concurrent
+        self.max_turns_behind = (CONFIG.get("animation_max_turns_behind", 1)
+                                 if max_turns_behind is None else max_turns_behind)
+        
+        # [group, count] for each run of queued animations, oldest first; an
+        # ungrouped animation is a run of its own
+        self.queued_groups = deque()
+        
+        # Animations dropped to catch up
+        self.skipped = 0
+        
+    @property
+    def active_animation(self):
+        """The first animation playing now, or None"""
+        return self.active[0] if self.active else None
+        
+    def add_animation(self, animation_type, source=None, target=None, result=None, duration=30, group=None,
+                      origin=None):
+        """Add a new animation to the queue
         
-    def add_animation(self, animation_type, source=None, target=None, result=None, duration=30):
-        """Add a new animation to the queue"""
-        animation = Animation(animation_type, source, target, result, duration)
+        Args:
+            animation_type: "move", "block", "knockdown" or "score"
+            source: Source goblin
+            target: Target position or goblin
+            result: Outcome
+            duration: Length in frames
+            group: Turn the animation belongs to, e.g. (play, turn), or None
+            origin: Square a move starts from, or None for the source goblin's position
+        """
+        animation = Animation(animation_type, source, target, result, duration, group, origin)
+        
+        # Join the turn playing now, if that is the turn it belongs to
+        if (self.concurrent and group is not None and not self.animations
+                and self.active and self.active[0].group == group):
+            self.active.append(animation)
+            return
+            
         self.animations.append(animation)
+        if group is not None and self.queued_groups and self.queued_groups[-1][0] == group:
+            self.queued_groups[-1][1] += 1
+        else:
+            self.queued_groups.append([group, 1])
         
         # If no active animation, start this one
-        if not self.active_animation:
-            self.active_animation = self.animations.pop(0)
+        if not self.active:
+            self.start_next()
+        else:
+            self.catch_up()
+            
+    def start_next(self):
+        """Start the next queued animation, with the rest of its turn in concurrent mode"""
+        self.active = []
+        if not self.animations:
+            return
+            
+        group, count = self.queued_groups.popleft()
+        if not self.concurrent or group is None:
+            # Only take the first of the run
+            count, remaining = 1, count - 1
+            if remaining:
+                self.queued_groups.appendleft([group, remaining])
+        for _ in range(count):
+            self.active.append(self.animations.popleft())
+            
+    def catch_up(self):
+        """Skip what is playing until no more than max_turns_behind turns are waiting"""
+        while len(self.queued_groups) > self.max_turns_behind:
+            self.skipped += len(self.active)
+            self.start_next()
             
     def update(self, delta_time=1.0):
         """Update animations
@@ -54,26 +134,30 @@ class AnimationManager:
         Args:
             delta_time: Time delta multiplier (default: 1.0)
         """
-        if self.paused or not self.active_animation:
+        if self.paused or not self.active:
             return
             
-        self.active_animation.update(delta_time)
+        # Play faster for every turn waiting behind this one
+        delta_time *= 1 + len(self.queued_groups)
         
-        if self.active_animation.is_complete():
+        complete = True
+        for animation in self.active:
+            animation.update(delta_time)
+            complete = complete and animation.is_complete()
+            
+        if complete:
             # Move to next animation
-            if self.animations:
-                self.active_animation = self.animations.pop(0)
-            else:
-                self.active_animation = None
+            self.start_next()
                 
     def clear(self):
         """Clear all animations"""
-        self.animations = []
-        self.active_animation = None
+        self.animations.clear()
+        self.queued_groups.clear()
+        self.active = []
         
     def is_complete(self):
         """Check if all animations are complete"""
-        return self.active_animation is None and not self.animations
+        return not self.active and not self.animations
         
     def set_paused(self, paused):
         """Pause or unpause animations"""
@@ -85,4 +169,4 @@ class AnimationManager:
         
     def get_queue_size(self):
         """Get the number of queued animations"""
-        return len(self.animations) 
\ No newline at end of file
+        return len(self.animations)
@@ -1,6 +1,7 @@
 import pygame
 import math
 from animation import Animation
+from text_cache import TEXT
 
 class AnimationRenderer:
     """Handles rendering of animations in the game"""
@@ -10,7 +11,7 @@ class AnimationRenderer:
         self.animation_manager = game.animation_manager
         
     def draw(self, screen, animation_manager, offset_x, offset_y):
-        """Draw the current animation
+        """Draw the animations playing now
         
         Args:
             screen: The pygame screen to draw on
@@ -18,20 +19,56 @@ class AnimationRenderer:
             offset_x: The x offset for drawing
             offset_y: The y offset for drawing
         """
-        if not animation_manager.active_animation:
-            return
+        for animation in animation_manager.active:
+            if animation.type == "move":
+                self._render_move_animation(screen, animation, offset_x, offset_y)
+            elif animation.type == "block":
+                self._render_block_animation(screen, animation, offset_x, offset_y)
+            elif animation.type == "knockdown":
+                self._render_knockdown_animation(screen, animation, offset_x, offset_y)
+            elif animation.type == "score":
+                self._render_score_animation(screen, animation, offset_x, offset_y)
+            
+    def dirty_rects(self, regions, animation_manager, offset_x, offset_y):
+        """Report the area of the animations playing now, which changes every frame they play
+        
+        Args:
+            regions: The DirtyRegions shared by the renderers
+            animation_manager: The AnimationManager instance
+            offset_x: The x offset for drawing
+            offset_y: The y offset for drawing
             
-        animation = animation_manager.active_animation
-        
-        if animation.type == "move":
-            self._render_move_animation(screen, animation, offset_x, offset_y)
-        elif animation.type == "block":
-            self._render_block_animation(screen, animation, offset_x, offset_y)
-        elif animation.type == "knockdown":
-            self._render_knockdown_animation(screen, animation, offset_x, offset_y)
-        elif animation.type == "score":
-            self._render_score_animation(screen, animation, offset_x, offset_y)
+        Returns:
+            list: Rects that changed since the last frame
+        """
+        bounds = [rect for rect in (self.animation_bounds(animation, offset_x, offset_y)
+                                    for animation in animation_manager.active) if rect is not None]
+        if not bounds:
+            return regions.check("animation", None, None)
+        key = tuple((id(animation), animation.frame) for animation in animation_manager.active)
+        return regions.check("animation", key, bounds[0].unionall(bounds[1:]))
+        
+    def animation_bounds(self, animation, offset_x, offset_y):
+        """Screen area an animation can draw on
+        
+        Returns:
+            pygame.Rect or None: Around the animation's source and target, or None if it has neither
+        """
+        points = []
+        for end in (animation.origin, animation.source, animation.target):
+            position = getattr(end, "position", end)
+            if isinstance(position, tuple):
+                points.append(position)
+        if not points:
+            return None
             
+        # Score animations grow to five cells across and put their text above that
+        reach = self.cell_size * 6 if animation.type == "score" else self.cell_size
+        xs = [offset_x + x * self.cell_size + self.cell_size // 2 for x, _ in points]
+        ys = [offset_y + y * self.cell_size + self.cell_size // 2 for _, y in points]
+        return pygame.Rect(min(xs) - reach, min(ys) - reach,
+                           max(xs) - min(xs) + 2 * reach, max(ys) - min(ys) + 2 * reach)
+        
     def _render_move_animation(self, screen, animation, offset_x, offset_y):
         """Render a goblin movement animation"""
         if not animation.source or not animation.target:
@@ -39,8 +76,8 @@ class AnimationRenderer:
             
         progress = animation.get_progress()
         
-        # Calculate interpolated position
-        start_x, start_y = animation.source.position
+        # Calculate interpolated position, from where the move started if the goblin is already there
+        start_x, start_y = animation.origin or animation.source.position
         end_x, end_y = animation.target
         
         current_x = start_x + (end_x - start_x) * progress
@@ -152,9 +189,9 @@ class AnimationRenderer:
         if 0.2 <= progress <= 0.8:
             font_size = int(48 * (1 - abs(progress - 0.5) * 2.5))
             try:
-                font = pygame.font.SysFont("Arial", font_size, bold=True)
+                font = TEXT.font("Arial", font_size, bold=True)
                 score_text = f"+{animation.result}" if animation.result else "+1"
-                text_surface = font.render(score_text, True, (255, 255, 0))
+                text_surface = TEXT.render(font, score_text, (255, 255, 0))
                 text_rect = text_surface.get_rect(center=(screen_x, screen_y - self.cell_size))
                 screen.blit(text_surface, text_rect)
             except:
@@ -0,0 +1,354 @@
+"""
+Batch Monte Carlo runner for Goblinball
+This module plays large numbers of headless games across worker processes for
+balance studies. Workers rebuild the teams from plain definitions, play a chunk
+of games each and send back only aggregated counts, never Game objects.
+Run from any directory: python goblinball/batch.py --games 100000 --workers 8
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Make the flat module imports work when run from elsewhere
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from config import CONFIG
+
+logger = logging.getLogger("goblinball.batch")
+
+
+def team_definition(team):
+    """Describe a team with the plain data needed to rebuild it in a worker
+
+    Args:
+        team: The Team to describe
+
+    Returns:
+        dict: Name, color and base stats of every goblin
+    """
+    return {
+        "name": team.name,
+        "color": list(team.color),
+        "goblins": [{
+            "name": goblin.name,
+            "strength": goblin.strength,
+            "toughness": goblin.toughness,
+            "movement": goblin.max_movement,
+            "agility": goblin.agility,
+            "injury_resistance": goblin.injury_resistance
+        } for goblin in team.goblins]
+    }
+
+
+def build_team(definition):
+    """Create a team from a definition made by team_definition
+
+    Args:
+        definition: Dict with "name", "color" and a list of "goblins"
+
+    Returns:
+        Team: A fresh team with its goblins added
+    """
+    from team import Team
+    from goblin import Goblin
+
+    team = Team(definition["name"], tuple(definition["color"]))
+    for stats in definition["goblins"]:
+        stats = dict(stats)
+        injury_resistance = stats.pop("injury_resistance", None)
+        goblin = Goblin(**stats)
+        if injury_resistance is not None:
+            goblin.injury_resistance = injury_resistance
+        team.add_goblin(goblin)
+    return team
+
+
+def default_definitions(seed, team_size=5):
+    """Generate the two default teams from a seed
+
+    Args:
+        seed: Seed for the teams' random stream
+        team_size: Number of goblins per team
+
+    Returns:
+        list: Two team definitions
+    """
+    from team import Team
+
+    rng = random.Random(seed)
+    definitions = []
+    for name, color in [("Mudcrushers", (200, 50, 50)), ("Skullsmashers", (50, 50, 200))]:
+        team = Team(name, color)
+        team.create_team(team_size, rng=rng)
+        definitions.append(team_definition(team))
+    return definitions
+
+
+class BatchStats:
+    """Aggregated results of many games between the same two teams"""
+
+    COUNTERS = ["points", "touchdowns", "field_goals", "knockdowns", "injuries"]
+
+    def __init__(self, team_names):
+        """Start with empty counts
+
+        Args:
+            team_names: Names of the two teams
+        """
+        self.team_names = list(team_names)
+        self.games = 0
+        self.completed = 0
+        self.ties = 0
+        self.plays = 0
+        self.turns = 0
+        self.game_time = 0.0  # Seconds spent inside games, summed over workers
+        self.wins = {name: 0 for name in self.team_names}
+        for counter in self.COUNTERS:
+            setattr(self, counter, {name: 0 for name in self.team_names})
+
+    def add_result(self, result):
+        """Count a finished game
+
+        Args:
+            result: SimulationResult of the game
+        """
+        self.games += 1
+        self.completed += int(result.completed)
+        self.plays += result.plays
+        self.turns += result.turns
+        self.game_time += result.elapsed
+
+        if result.winner is None:
+            self.ties += 1
+        else:
+            self.wins[result.winner] += 1
+
+        self.points[result.team1_name] += result.team1_score
+        self.points[result.team2_name] += result.team2_score
+        for counter in ["touchdowns", "field_goals", "knockdowns", "injuries"]:
+            for name, count in getattr(result, counter).items():
+                getattr(self, counter)[name] += count
+
+    def merge(self, data):
+        """Add counts sent back by a worker
+
+        Args:
+            data: Dict made by to_dict
+        """
+        self.games += data["games"]
+        self.completed += data["completed"]
+        self.ties += data["ties"]
+        self.plays += data["plays"]
+        self.turns += data["turns"]
+        self.game_time += data["game_time"]
+        for name in self.team_names:
+            self.wins[name] += data["wins"][name]
+            for counter in self.COUNTERS:
+                getattr(self, counter)[name] += data[counter][name]
+
+    def to_dict(self):
+        """Convert the counts to a dictionary for sending between processes or saving"""
+        data = {
+            "team_names": self.team_names,
+            "games": self.games,
+            "completed": self.completed,
+            "ties": self.ties,
+            "plays": self.plays,
+            "turns": self.turns,
+            "game_time": self.game_time,
+            "wins": dict(self.wins)
+        }
+        for counter in self.COUNTERS:
+            data[counter] = dict(getattr(self, counter))
+        return data
+
+    def summary(self):
+        """Per-game rates for each team
+
+        Returns:
+            dict: Team name -> win rate and average points, scores, knockdowns and injuries
+        """
+        games = max(1, self.games)
+        summary = {}
+        for name in self.team_names:
+            summary[name] = {"win_rate": self.wins[name] / games}
+            for counter in self.COUNTERS:
+                summary[name][counter] = getattr(self, counter)[name] / games
+        summary["tie_rate"] = self.ties / games
+        return summary
+
+    def __str__(self):
+        """Human-readable report"""
+        games = max(1, self.games)
+        lines = [f"{self.games} games ({self.completed} completed), "
+                 f"{self.plays / games:.1f} plays and {self.turns / games:.1f} turns per game"]
+        for name in self.team_names:
+            lines.append(f"  {name}: win {self.wins[name] / games:.1%}, "
+                         f"points {self.points[name] / games:.2f}, "
+                         f"TD {self.touchdowns[name] / games:.2f}, "
+                         f"FG {self.field_goals[name] / games:.2f}, "
+                         f"knockdowns {self.knockdowns[name] / games:.2f}, "
+                         f"injuries {self.injuries[name] / games:.2f}")
+        lines.append(f"  ties: {self.ties / games:.1%}")
+        return "\n".join(lines)
+
+
+# Per-process state set up by init_worker
+_worker = {}
+
+
+def init_worker(definitions, config_overrides):
+    """Prepare a worker process
+
+    Args:
+        definitions: The two team definitions
+        config_overrides: Settings to apply on top of the config file
+    """
+    for key, value in config_overrides.items():
+        CONFIG.set(key, value)
+    _worker["definitions"] = definitions
+
+
+def play_games(first_seed, num_games):
+    """Play a run of consecutive seeds and aggregate them
+
+    Every game gets fresh teams and plays on its own random stream, so a
+    game's result only depends on the definitions and its seed, not on how
+    games are split between workers.
+
+    Args:
+        first_seed: Seed of the first game
+        num_games: Number of games to play
+
+    Returns:
+        dict: BatchStats.to_dict of the games played
+    """
+    from simulation import SimulationEngine
+
+    definitions = _worker["definitions"]
+    stats = BatchStats([d["name"] for d in definitions])
+
+    for seed in range(first_seed, first_seed + num_games):
+        engine = SimulationEngine(build_team(definitions[0]), build_team(definitions[1]), seed=seed)
+        stats.add_result(engine.run_game(seed))
+
+    return stats.to_dict()
+
+
+def available_cpus():
+    """Count the CPUs this process may run on
+
+    Returns:
+        int: CPUs in the process's affinity mask where the platform reports one,
+             otherwise every CPU in the machine
+    """
+    # os.process_cpu_count (Python 3.13) and the affinity mask both respect
+    # taskset and container CPU sets, which os.cpu_count ignores
+    if hasattr(os, "process_cpu_count"):
+        return os.process_cpu_count() or 1
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def run_batch(definitions, games, seed=0, workers=None, chunk_size=None, config_overrides=None, progress=None):
+    """Play games across a pool of worker processes
+
+    Args:
+        definitions: The two team definitions
+        games: Number of games to play
+        seed: Seed of the first game; game i uses seed + i
+        workers: Number of worker processes, or None for one per available CPU
+        chunk_size: Games per task, or None to pick one from the game and worker counts
+        config_overrides: Settings to apply in every worker
+        progress: Optional callback taking the running BatchStats after each chunk
+
+    Returns:
+        tuple: (BatchStats, wall time in seconds)
+    """
+    if len(definitions) != 2 or definitions[0]["name"] == definitions[1]["name"]:
+        raise ValueError("A batch needs two teams with different names")
+
+    workers = workers or available_cpus()
+    if chunk_size is None:
+        # Enough chunks to keep every worker busy without drowning the parent in results
+        chunk_size = max(1, min(500, games // (workers * 8)))
+
+    stats = BatchStats([d["name"] for d in definitions])
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(definitions, config_overrides or {})) as executor:
+        futures = [executor.submit(play_games, seed + first, min(chunk_size, games - first))
+                   for first in range(0, games, chunk_size)]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            if progress:
+                progress(stats)
+
+    return stats, time.perf_counter() - start_time
+
+
+def main():
+    """Parse arguments, run the batch and report the results"""
+    parser = argparse.ArgumentParser(description="Play Goblinball games in bulk")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per available CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--teams", help="JSON file with a list of two team definitions")
+    parser.add_argument("--team-seed", type=int, default=1, help="seed for the default teams")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--grid-size", type=int, default=None)
+    parser.add_argument("--output", help="write the aggregated results to this JSON file")
+    parser.add_argument("--replay-dir", help="write a replay of every game to this directory")
+    parser.add_argument("--quiet", action="store_true", help="no progress lines")
+    args = parser.parse_args()
+
+    if args.teams:
+        with open(args.teams, 'r') as f:
+            definitions = json.load(f)
+    else:
+        definitions = default_definitions(args.team_seed)
+
+    overrides = {}
+    if args.grid_size:
+        overrides["grid_size"] = args.grid_size
+    if args.replay_dir:
+        os.makedirs(args.replay_dir, exist_ok=True)
+        overrides["replay_dir"] = os.path.abspath(args.replay_dir)
+
+    def report_progress(stats):
+        elapsed = time.perf_counter() - start_time
+        print(f"\r{stats.games}/{args.games} games, {stats.games / elapsed:.1f} games/s", end="", flush=True)
+
+    start_time = time.perf_counter()
+    stats, elapsed = run_batch(definitions, args.games, args.seed, args.workers, args.chunk_size,
+                               overrides, None if args.quiet else report_progress)
+    if not args.quiet:
+        print()
+
+    print(stats)
+    print(f"{stats.games} games in {elapsed:.2f}s: {stats.games / elapsed:.1f} games/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "teams": definitions,
+                "seed": args.seed,
+                "elapsed": elapsed,
+                "games_per_second": stats.games / elapsed,
+                "totals": stats.to_dict(),
+                "summary": stats.summary()
+            }, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,795 @@
+"""
+Benchmarks for Goblinball
+Each benchmark plays headless games or times a hot path in isolation.
+Run from any directory: python goblinball/benchmark.py <benchmark> [options]
+"""
+
+import os
+import sys
+import math
+import time
+import heapq
+import random
+import argparse
+import tempfile
+
+# Make the flat module imports work when run from elsewhere
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from config import CONFIG
+from logger import DEBUG
+
+
+def time_turns(grid_size, games, seed):
+    """Play headless games and time the average turn
+
+    Args:
+        grid_size: Width and height of the field
+        games: Number of games to play
+        seed: Seed for the teams and games
+
+    Returns:
+        tuple: (turns played, total seconds)
+    """
+    from simulation import SimulationEngine
+
+    CONFIG.set("grid_size", grid_size)
+    engine = SimulationEngine(seed=seed)
+
+    turns = 0
+    elapsed = 0.0
+    for _ in range(games):
+        result = engine.run_game()
+        turns += result.turns
+        elapsed += result.elapsed
+
+    return turns, elapsed
+
+
+def scan_zone_count(grid, position, team):
+    """Count adjacent standing opponents by scanning the 8 neighbours (the old approach)"""
+    count = 0
+    x, y = position
+    for dx in [-1, 0, 1]:
+        for dy in [-1, 0, 1]:
+            if dx == 0 and dy == 0:
+                continue
+            entity = grid.get_entity_at_position((x + dx, y + dy))
+            if entity and hasattr(entity, 'team') and entity.team != team and not entity.knocked_down:
+                count += 1
+    return count
+
+
+def bench_zones(args):
+    """Compare neighbour scans with zone-of-control lookups, then time full turns"""
+    from simulation import SimulationEngine
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        random.seed(args.seed)
+
+        # Set up a game in the middle of its first play
+        engine = SimulationEngine()
+        game = engine.create_game()
+        game.start_play()
+        for _ in range(3):
+            game.process_turn()
+
+        grid = game.grid
+        team = game.offense_team
+        cells = [(x, y) for y in range(grid.height) for x in range(grid.width)]
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            scanned = [scan_zone_count(grid, pos, team) for pos in cells]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            looked_up = [grid.zone_count(pos, team) for pos in cells]
+        lookup_time = time.perf_counter() - start
+
+        assert scanned == looked_up, "zone map disagrees with a neighbour scan"
+
+        queries = len(cells) * args.repeat
+        print(f"{grid_size}x{grid_size} ZoC query: scan {scan_time / queries * 1e6:.2f} us, "
+              f"lookup {lookup_time / queries * 1e6:.2f} us "
+              f"({scan_time / lookup_time:.1f}x)")
+
+        turns, elapsed = time_turns(grid_size, args.games, args.seed)
+        print(f"{grid_size}x{grid_size} turns: {turns} in {elapsed:.2f}s, "
+              f"{elapsed / turns * 1000:.3f} ms/turn")
+
+
+def uniform_cost_route(movement_system, goblin, target_pos):
+    """Cheapest route cost by uniform-cost search without a heuristic (the reference)
+
+    Returns:
+        tuple: (route cost or None, nodes expanded)
+    """
+    grid = movement_system.game.grid
+    risk_weight = movement_system.game.config.get("ai_duke_risk_weight", 10.0)
+    heap = [(0.0, goblin.position)]
+    best_cost = {goblin.position: 0.0}
+    expanded = 0
+
+    while heap:
+        cost, pos = heapq.heappop(heap)
+        if cost > best_cost[pos]:
+            continue
+        expanded += 1
+        if pos == target_pos:
+            return cost, expanded
+
+        step_cost = 1.0
+        num_blockers = grid.zone_count(pos, goblin.team)
+        if num_blockers:
+            step_cost -= risk_weight * math.log(movement_system.estimate_duke_success_chance(goblin, num_blockers))
+
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            new_pos = (pos[0] + dx, pos[1] + dy)
+            if not grid.is_valid_position(new_pos):
+                continue
+            if grid.get_entity_at_position(new_pos) is not None and new_pos != target_pos:
+                continue
+            if new_pos not in best_cost or cost + step_cost < best_cost[new_pos]:
+                best_cost[new_pos] = cost + step_cost
+                heapq.heappush(heap, (cost + step_cost, new_pos))
+
+    return None, expanded
+
+
+def route_cost(movement_system, goblin, path):
+    """Cost of a route under the pathfinder's step and DUKE risk model"""
+    grid = movement_system.game.grid
+    risk_weight = movement_system.game.config.get("ai_duke_risk_weight", 10.0)
+    cost = 0.0
+    for pos in [goblin.position] + path[:-1]:
+        cost += 1.0
+        num_blockers = grid.zone_count(pos, goblin.team)
+        if num_blockers:
+            cost -= risk_weight * math.log(movement_system.estimate_duke_success_chance(goblin, num_blockers))
+    return cost
+
+
+def bench_paths(args):
+    """Compare A* routes with the straight L path and an uninformed search"""
+    from simulation import SimulationEngine
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        random.seed(args.seed)
+
+        engine = SimulationEngine()
+        game = engine.create_game()
+        game.start_play()
+        for _ in range(3):
+            game.process_turn()
+
+        grid = game.grid
+        movement_system = game.movement_system
+        goblins = [g for g in grid.positions if not g.knocked_down]
+        empty = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.cells[y][x] is None]
+        queries = [(random.choice(goblins), random.choice(empty)) for _ in range(args.repeat)]
+
+        # The old approach: walk an L path and give up at the first occupied square
+        start = time.perf_counter()
+        blocked = 0
+        for goblin, target in queries:
+            path = movement_system.calculate_path(goblin.position, target)
+            if any(grid.get_entity_at_position(pos) is not None for pos in path[1:]):
+                blocked += 1
+        l_path_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = []
+        ucs_expanded = 0
+        for goblin, target in queries:
+            cost, expanded = uniform_cost_route(movement_system, goblin, target)
+            reference.append(cost)
+            ucs_expanded += expanded
+        ucs_time = time.perf_counter() - start
+
+        movement_system.clear_path_cache()
+        movement_system.pathfinding_stats["nodes_expanded"] = 0
+        start = time.perf_counter()
+        for (goblin, target), expected in zip(queries, reference):
+            path = movement_system.find_path_to(goblin, target)
+            found = route_cost(movement_system, goblin, path) if path else None
+            assert (found is None) == (expected is None), "A* and uniform-cost search disagree on reachability"
+            assert found is None or abs(found - expected) < 1e-9, "A* found a costlier route"
+        astar_time = time.perf_counter() - start
+        astar_expanded = movement_system.pathfinding_stats["nodes_expanded"]
+
+        # Repeat the queries against a warm cache
+        start = time.perf_counter()
+        for goblin, target in queries:
+            movement_system.find_path_to(goblin, target)
+        cached_time = time.perf_counter() - start
+
+        n = len(queries)
+        print(f"{grid_size}x{grid_size} L path: {l_path_time / n * 1e6:.1f} us/query, "
+              f"{blocked}/{n} blocked")
+        print(f"{grid_size}x{grid_size} uniform cost: {ucs_time / n * 1e6:.1f} us/query, "
+              f"{ucs_expanded / n:.1f} nodes")
+        print(f"{grid_size}x{grid_size} A*: {astar_time / n * 1e6:.1f} us/query, "
+              f"{astar_expanded / n:.1f} nodes, cached {cached_time / n * 1e6:.2f} us/query")
+
+
+def scan_field_goal_chance(game, kicker):
+    """Field goal chance from a fresh line of shot and per-square scans (the old approach)"""
+    from field_goal import line_of_shot, field_goal_chance
+
+    grid = game.grid
+    hoop_pos = (grid.width // 2, 0 if kicker.team == game.team1 else grid.height - 1)
+    distance = abs(hoop_pos[0] - kicker.position[0]) + abs(hoop_pos[1] - kicker.position[1])
+    path_zoc_count = sum(1 for point in line_of_shot(kicker.position, hoop_pos)[1:-1]
+                         if scan_zone_count(grid, point, kicker.team) > 0 or
+                         (grid.get_entity_at_position(point) is not None and
+                          grid.get_entity_at_position(point).team != kicker.team and
+                          not grid.get_entity_at_position(point).knocked_down))
+    defender_zoc_count = scan_zone_count(grid, kicker.position, kicker.team)
+    return field_goal_chance(distance, kicker.agility, defender_zoc_count, path_zoc_count)[-1]
+
+
+def bench_field_goals(args):
+    """Compare field goal odds from scans with the precomputed line-of-shot table"""
+    from simulation import SimulationEngine
+    from field_goal import evaluate_field_goal, get_field_goal_table
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        random.seed(args.seed)
+
+        engine = SimulationEngine()
+        game = engine.create_game()
+        game.start_play()
+        for _ in range(3):
+            game.process_turn()
+
+        start = time.perf_counter()
+        get_field_goal_table(grid_size, grid_size)
+        build_time = time.perf_counter() - start
+
+        # Kick from every empty square, as each team's carrier
+        grid = game.grid
+        kickers = [game.team1.goblins[0], game.team2.goblins[0]]
+        squares = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.cells[y][x] is None]
+        saved = [k.position for k in kickers]
+
+        def run(evaluate):
+            chances = []
+            for _ in range(args.repeat):
+                for kicker in kickers:
+                    for pos in squares:
+                        kicker.position = pos
+                        chances.append(evaluate(kicker))
+            return chances
+
+        start = time.perf_counter()
+        scanned = run(lambda kicker: scan_field_goal_chance(game, kicker))
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        looked_up = run(lambda kicker: evaluate_field_goal(game, kicker)["success_chance"])
+        lookup_time = time.perf_counter() - start
+
+        for kicker, pos in zip(kickers, saved):
+            kicker.position = pos
+
+        assert scanned == looked_up, "field goal table disagrees with a scan"
+
+        n = len(scanned)
+        print(f"{grid_size}x{grid_size} field goal odds: scan {scan_time / n * 1e6:.1f} us, "
+              f"table {lookup_time / n * 1e6:.1f} us ({scan_time / lookup_time:.1f}x), "
+              f"table built in {build_time * 1000:.1f} ms")
+
+
+def read_names_file(names_file):
+    """Read and tokenise the names file from scratch (the old per-name cost)"""
+    all_names = []
+    with open(names_file, 'r') as f:
+        for line in f:
+            all_names.extend(name.strip() for name in line.split() if name.strip())
+    return all_names
+
+
+def bench_names(args):
+    """Compare re-reading the names file with the cached corpus, then time bulk roster creation"""
+    from goblin import load_name_corpus
+    from team import Team
+
+    names_file = os.path.join(script_dir, "names.txt")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        read_names_file(names_file)
+    read_time = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    corpus = load_name_corpus(names_file)
+    first_time = time.perf_counter() - start
+
+    assert list(corpus) == read_names_file(names_file), "cached corpus differs from the names file"
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        load_name_corpus(names_file)
+    cached_time = (time.perf_counter() - start) / args.repeat
+
+    print(f"names corpus ({len(corpus)} names): read {read_time * 1e6:.0f} us, "
+          f"first load {first_time * 1e6:.0f} us, cached {cached_time * 1e6:.2f} us")
+
+    goblins = args.games * 1000
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    team = Team("Roster", (0, 0, 0))
+    team.create_team(goblins, rng=rng)
+    roster_time = time.perf_counter() - start
+
+    print(f"roster of {goblins} goblins: {roster_time:.3f}s, {roster_time / goblins * 1e6:.1f} us/goblin "
+          f"(re-reading the file would add about {read_time * goblins:.1f}s)")
+
+
+def bench_events(args):
+    """Compare dict events with slotted typed events and the no-listener fast path"""
+    import tracemalloc
+    from event import EventManager, GameEvent, BlockEvent
+    from goblin import Goblin
+
+    rng = random.Random(args.seed)
+    blocker, target = Goblin(rng=rng), Goblin(rng=rng)
+    count = args.repeat * 1000
+
+    def dict_event():
+        return GameEvent("block", {
+            "blocker_id": blocker.id,
+            "blocker_name": blocker.name,
+            "blocker": blocker,
+            "target_id": target.id,
+            "target_name": target.name,
+            "target": target,
+            "result": "push",
+            "blocker_roll": 9,
+            "defender_roll": 6,
+            "diff": 3,
+            "target_knocked_down": False
+        })
+
+    def typed_event():
+        return BlockEvent(blocker, target, "push", 9, 6, 3, False)
+
+    # Memory per event, for events held in a list
+    for name, make in [("dict", dict_event), ("slotted", typed_event)]:
+        tracemalloc.start()
+        events = [make() for _ in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name} events: {size / len(events):.0f} bytes each")
+        del events
+
+    def timed(dispatch, manager):
+        start = time.perf_counter()
+        for _ in range(count):
+            dispatch(manager)
+        return (time.perf_counter() - start) / count * 1e6
+
+    listening = EventManager()
+    listening.add_listener("block", lambda event: None)
+    dict_time = timed(lambda m: m.dispatch(dict_event()), listening)
+    typed_time = timed(lambda m: m.emit(BlockEvent, blocker, target, "push", 9, 6, 3, False), listening)
+
+    unheard = EventManager()
+    unheard.fast_path = True
+    skipped_time = timed(lambda m: m.emit(BlockEvent, blocker, target, "push", 9, 6, 3, False), unheard)
+
+    print(f"dispatch: dict {dict_time:.2f} us, slotted {typed_time:.2f} us, "
+          f"fast path with no listener {skipped_time:.2f} us")
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        for fast in [False, True]:
+            from simulation import SimulationEngine
+            engine = SimulationEngine(seed=args.seed, fast_events=fast)
+            results = engine.run(args.games)
+            turns = sum(r.turns for r in results)
+            elapsed = sum(r.elapsed for r in results)
+            print(f"{grid_size}x{grid_size} turns with fast path {'on' if fast else 'off'}: "
+                  f"{elapsed / turns * 1000:.3f} ms/turn")
+
+
+def bench_interception(args):
+    """Compare straight-line and walking interception maps for defenders"""
+    from simulation import SimulationEngine
+    from interception import InterceptionMap
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+
+        # Time building the map and scoring every square on the board at the start of a play
+        engine = SimulationEngine(seed=args.seed)
+        game = engine.create_game(args.seed)
+        game.start_play()
+        carrier = game.offense_team.get_carrier()
+        target_y = 0 if carrier.team == game.team1 else game.grid.height - 1
+        squares = [(x, y) for y in range(game.grid.height) for x in range(game.grid.width)]
+
+        for walk in [False, True]:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                interception = InterceptionMap(game.grid, carrier, target_y, walk)
+            build_time = (time.perf_counter() - start) / args.repeat
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                interception.square_scores.clear()
+                for pos in squares:
+                    interception.score(pos)
+            score_time = (time.perf_counter() - start) / (args.repeat * len(squares))
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for pos in squares:
+                    interception.score(pos)
+            lookup_time = (time.perf_counter() - start) / (args.repeat * len(squares))
+
+            print(f"{grid_size}x{grid_size} {'walking' if walk else 'straight'} map: built in "
+                  f"{build_time * 1e6:.0f} us, {score_time * 1e6:.2f} us to score a square, "
+                  f"{lookup_time * 1e6:.2f} us to look it up again")
+
+        for walk in [False, True]:
+            CONFIG.set("ai_interception_walk", walk)
+            engine = SimulationEngine(seed=args.seed)
+            results = engine.run(args.games)
+            turns = sum(r.turns for r in results)
+            plays = sum(r.plays for r in results)
+            elapsed = sum(r.elapsed for r in results)
+            touchdowns = sum(sum(r.touchdowns.values()) for r in results)
+            print(f"{grid_size}x{grid_size} turns with {'walking' if walk else 'straight'} interception: "
+                  f"{elapsed / turns * 1000:.3f} ms/turn, {touchdowns / plays:.2f} touchdowns/play")
+        CONFIG.set("ai_interception_walk", True)
+
+
+def dict_snapshot(game):
+    """Snapshot every goblin as nested dicts (the old history format)"""
+    state = {
+        'turn': game.turn,
+        'play': game.current_play,
+        'goblin_positions': {},
+        'goblin_states': {},
+        'trails': {},
+        'ball_carrier': game.get_ball_carrier().id if game.get_ball_carrier() else None
+    }
+    for team in [game.team1, game.team2]:
+        for goblin in team.goblins:
+            state['goblin_positions'][goblin.id] = goblin.position
+            state['goblin_states'][goblin.id] = {
+                'knocked_down': goblin.knocked_down,
+                'movement': goblin.movement,
+                'has_ball': goblin.has_ball
+            }
+    for goblin_id, trail in game.movement_trails.items():
+        state['trails'][goblin_id] = trail.copy()
+    return state
+
+
+def deep_size(obj, seen=None):
+    """Bytes used by an object and everything it contains, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)) or type(obj).__name__ == "deque":
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+
+def bench_history(args):
+    """Compare full dict snapshots with row diffs for the Previous Turn history"""
+    from simulation import SimulationEngine
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        CONFIG.set("turn_history_size", 100000)
+
+        # Play whole games, recording every turn both ways
+        engine = SimulationEngine(seed=args.seed)
+        snapshots = []
+        dict_time = 0.0
+        record_time = 0.0
+        for game_number in range(args.games):
+            game = engine.create_game(args.seed + game_number)
+            game.start_play()
+            while not game.game_complete:
+                if game.play_complete:
+                    game.start_play()
+                    continue
+
+                start = time.perf_counter()
+                snapshots.append(dict_snapshot(game))
+                dict_time += time.perf_counter() - start
+
+                start = time.perf_counter()
+                game.save_state_to_history()
+                record_time += time.perf_counter() - start
+
+                game.process_turn()
+
+        # The last game's history stands in for all of them
+        history = game.turn_history
+        turns = len(history)
+        dict_memory = deep_size(snapshots[-turns:]) / turns
+        history_memory = deep_size((history.entries, history.head, history.points)) / turns
+
+        n = len(snapshots)
+        print(f"{grid_size}x{grid_size} history over {n} turns: dict snapshots "
+              f"{dict_memory:.0f} bytes and {dict_time / n * 1e6:.1f} us per turn, row diffs "
+              f"{history_memory:.0f} bytes and {record_time / n * 1e6:.1f} us per turn")
+
+        # Step back through the last game, then forward again to the live state
+        start = time.perf_counter()
+        for _ in range(turns):
+            game.previous_turn()
+        for _ in range(turns):
+            game.next_turn()
+        step_time = (time.perf_counter() - start) / (2 * turns)
+        print(f"{grid_size}x{grid_size} Previous/Next Turn through {turns} turns: {step_time * 1e6:.1f} us per step")
+
+        CONFIG.set("turn_history_size", 1000)
+
+
+def bench_replay(args):
+    """Measure replay file size and recording overhead, and check seeking against the live game"""
+    from simulation import SimulationEngine
+    from game import Game
+    from history import capture_rows
+    from replay import ReplayReader
+
+    replay_dir = tempfile.mkdtemp(prefix="goblinball_replays_")
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+
+        # Play the same games without and with a replay being written, alternating
+        # a few rounds and keeping each one's best time
+        times = {"plain": float("inf"), "recorded": float("inf")}
+        for _ in range(3):
+            for label, directory in [("plain", None), ("recorded", replay_dir)]:
+                CONFIG.set("replay_dir", directory)
+                engine = SimulationEngine(seed=args.seed)
+                start = time.perf_counter()
+                for game_number in range(args.games):
+                    engine.run_game(args.seed + game_number)
+                times[label] = min(times[label], time.perf_counter() - start)
+        CONFIG.set("replay_dir", None)
+
+        paths = [os.path.join(replay_dir, f"goblinball_{args.seed + n}.gbr") for n in range(args.games)]
+        sizes = [os.path.getsize(path) for path in paths]
+        overhead = (times["recorded"] - times["plain"]) / times["plain"]
+        print(f"{grid_size}x{grid_size} replays of {args.games} games: {sum(sizes) / len(sizes) / 1024:.1f} KB "
+              f"per game (largest {max(sizes) / 1024:.1f} KB), recording overhead {overhead:+.1%}")
+
+        # Replay one game live, keeping the state at every turn start to check seeks against
+        CONFIG.set("replay_dir", replay_dir)
+        engine = SimulationEngine(seed=args.seed)
+        game = engine.create_game(args.seed)
+        expected = {}
+
+        def capture(event):
+            turn = 0 if event.event_type == "play_start" else event.turn
+            expected[(game.current_play, turn)] = capture_rows(game)
+
+        game.event_manager.add_listener("play_start", capture)
+        game.event_manager.add_listener("turn_start", capture)
+        game.start_play()
+        while not game.game_complete:
+            if game.play_complete:
+                game.start_play()
+            else:
+                game.process_turn()
+        game.close()
+        CONFIG.set("replay_dir", None)
+
+        reader = ReplayReader(paths[0])
+        mismatches = 0
+        start = time.perf_counter()
+        for (play, turn), rows in expected.items():
+            state = reader.state_at(play, turn)
+            if state is None or state.rows != rows:
+                mismatches += 1
+        seek_time = (time.perf_counter() - start) / len(expected)
+        print(f"{grid_size}x{grid_size} seeking to {len(expected)} turn starts: {seek_time * 1e6:.1f} us per seek, "
+              f"{mismatches} mismatches against the live game")
+
+        # Jump a viewer's game around the same match in random order
+        viewer = Game.from_replay(paths[0])
+        jumps = random.Random(args.seed).choices(range(len(viewer.replay)), k=args.repeat * 10)
+        start = time.perf_counter()
+        for index in jumps:
+            viewer.replay.show(index)
+        jump_time = (time.perf_counter() - start) / len(jumps)
+        print(f"{grid_size}x{grid_size} viewer jumps between random turns: {jump_time * 1e6:.1f} us per jump")
+
+
+def bench_render(args):
+    """Time viewer frames with the dummy video driver: full redraws with a full event log, and idle frames"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from team import Team
+    from renderer import GameRenderer
+    from text_cache import TEXT
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        rng = random.Random(args.seed)
+        team1 = Team("Mudcrushers", (200, 50, 50))
+        team2 = Team("Skullsmashers", (50, 50, 200))
+        team1.create_team(5, rng=rng)
+        team2.create_team(5, rng=rng)
+        game = Game(team1, team2, seed=args.seed)
+        game.start_play()
+        renderer = GameRenderer(game)
+        game.renderer = renderer
+
+        # Play into the first play and fill the event log with long entries
+        for _ in range(3):
+            if not game.play_complete:
+                game.next_turn()
+        ui = renderer.ui_renderer
+        for number in range(ui.max_displayed_events):
+            ui.add_event(f"Event {number}: a goblin did something long-winded enough to wrap over several lines")
+
+        def time_frames(full, cached):
+            TEXT.max_surfaces = CONFIG.get("text_cache_size", 512) if cached else 0
+            TEXT.clear()
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                if full:
+                    renderer.dirty_regions.invalidate()
+                if not cached:
+                    ui.event_log_surface = None
+                renderer.draw()
+            return (time.perf_counter() - start) / args.repeat
+
+        renderer.draw()
+        uncached = time_frames(full=True, cached=False)
+        cached = time_frames(full=True, cached=True)
+        idle = time_frames(full=False, cached=True)
+        print(f"{grid_size}x{grid_size} full redraw with {ui.max_displayed_events} events in the log: "
+              f"{uncached * 1000:.2f} ms uncached, {cached * 1000:.2f} ms with the text cache; "
+              f"idle frame {idle * 1000:.3f} ms")
+    pygame.quit()
+
+
+def bench_frames(args):
+    """Time viewer frames during auto play, with turns played inline and on the simulation thread"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from game import Game
+    from team import Team
+    from renderer import GameRenderer
+
+    for grid_size in args.grid_sizes:
+        CONFIG.set("grid_size", grid_size)
+        for threaded in (False, True):
+            rng = random.Random(args.seed)
+            team1 = Team("Mudcrushers", (200, 50, 50))
+            team2 = Team("Skullsmashers", (50, 50, 200))
+            team1.create_team(5, rng=rng)
+            team2.create_team(5, rng=rng)
+            game = Game(team1, team2, seed=args.seed, record=False)
+            game.start_play()
+            if threaded:
+                game = game.run_on_worker()
+            renderer = GameRenderer(game)
+            game.renderer = renderer
+
+            # The viewer's loop, as in GameRenderer.run, for a fixed number of shown turns
+            game.turn_delay = 0.05
+            game.auto_advance = True
+            clock = pygame.time.Clock()
+            frames = []
+            shown = 0
+            while shown < args.repeat * 5 and not game.game_complete:
+                start = time.perf_counter()
+                if game.auto_advance_turns() and game.simulation is None:
+                    shown += 1
+                if game.simulation is not None and game.simulation.update():
+                    shown += 1
+                renderer.draw()
+                frames.append(time.perf_counter() - start)
+                clock.tick(60)
+            if game.simulation is not None:
+                game.simulation.stop()
+
+            frames.sort()
+            print(f"{grid_size}x{grid_size} {'simulation thread' if threaded else 'inline turns'}: "
+                  f"{len(frames)} frames for {shown} turns, median {frames[len(frames) // 2] * 1000:.2f} ms, "
+                  f"99th percentile {frames[int(len(frames) * 0.99)] * 1000:.2f} ms, "
+                  f"worst {frames[-1] * 1000:.2f} ms")
+    pygame.quit()
+
+
+def bench_animations(args):
+    """Feed the animation queue a turn of moves every half second and see how far behind playback falls"""
+    from animation import AnimationManager
+
+    frames_per_turn = 30  # Half a second at 60 FPS
+    moves_per_turn = 12
+    turns = args.repeat * 10
+    modes = [
+        ("one at a time, never skipping", False, turns),
+        ("one at a time, at most one turn behind", False, 1),
+        ("a turn at once, at most one turn behind", True, 1),
+    ]
+    for label, concurrent, max_turns_behind in modes:
+        manager = AnimationManager(concurrent=concurrent, max_turns_behind=max_turns_behind)
+        worst = 0
+        start = time.perf_counter()
+        for turn in range(turns):
+            for move in range(moves_per_turn):
+                manager.add_animation("move", target=(move, turn), duration=10, group=turn)
+            for _ in range(frames_per_turn):
+                manager.update(1.0)
+                worst = max(worst, len(manager.queued_groups))
+        elapsed = time.perf_counter() - start
+
+        # Frames still needed to finish what is queued once the turns stop
+        drain = 0
+        while not manager.is_complete():
+            manager.update(1.0)
+            drain += 1
+        print(f"{label}: {turns} turns of {moves_per_turn} moves in {elapsed * 1000:.1f} ms, "
+              f"at worst {worst} turns waiting, {drain} frames behind at the end, "
+              f"{manager.skipped} animations skipped")
+
+    # Queue throughput, where list.pop(0) made draining a long queue quadratic
+    count = args.repeat * 5000
+    manager = AnimationManager(concurrent=False, max_turns_behind=count)
+    start = time.perf_counter()
+    for number in range(count):
+        manager.add_animation("move", target=(0, 0), duration=1, group=number)
+    while not manager.is_complete():
+        manager.update(1.0)
+    print(f"Queued and played {count} animations in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+BENCHMARKS = {
+    "zones": bench_zones,
+    "paths": bench_paths,
+    "fieldgoals": bench_field_goals,
+    "names": bench_names,
+    "events": bench_events,
+    "interception": bench_interception,
+    "history": bench_history,
+    "replay": bench_replay,
+    "render": bench_render,
+    "frames": bench_frames,
+    "animations": bench_animations,
+}
+
+
+def main():
+    """Parse arguments and run the selected benchmark"""
+    parser = argparse.ArgumentParser(description="Goblinball benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Benchmarks drive games directly as well as through SimulationEngine.run_game,
+    # so keep the debug log out of every timing
+    DEBUG.enabled = False
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
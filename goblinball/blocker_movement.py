@@ -1,7 +1,7 @@
-import random
 import logging
 from utils import manhattan_distance, is_adjacent
 from logger import DEBUG
+from interception import InterceptionMap
 
 class BlockerMovement:
     """Handles movement logic for blockers (both offensive and defensive)"""
@@ -18,6 +18,10 @@ class BlockerMovement:
             (-1, 1),  (0, 1),  (1, 1)    # Row behind
         ]
         
+        # Defenders' shared view of the carrier, rebuilt once per turn
+        self.interception_map = None
+        self.interception_key = None
+        
     def move_blocker(self, blocker):
         """Move a blocker according to its team role
         
@@ -50,27 +54,21 @@ class BlockerMovement:
         if blocker.movement <= 0 or blocker.knocked_down or blocker.unavailable:
             return False
             
-        DEBUG.log(f"Moving offensive blocker {blocker.name} with {blocker.movement} movement points")
+        DEBUG.log("Moving offensive blocker %s with %s movement points", blocker.name, blocker.movement)
         
         # Get carrier and current positions
         carrier = blocker.team.get_carrier()
         if not carrier:
-            DEBUG.log(f"No carrier found for team {blocker.team.name}!")
+            DEBUG.log("No carrier found for team %s!", blocker.team.name)
             return False
             
-        blocker_x, blocker_y = blocker.position
-        carrier_x, carrier_y = carrier.position
-        
         # Identify defensive blockers near carrier
         enemies_near_carrier = []
         
-        for x in range(self.game.grid.width):
-            for y in range(self.game.grid.height):
-                goblin = self.game.grid.get_entity_at_position((x, y))
-                if goblin and goblin.team != blocker.team and not goblin.knocked_down:
-                    dist_to_carrier = manhattan_distance((x, y), carrier.position)
-                    if dist_to_carrier <= 3:  # Within threatening range
-                        enemies_near_carrier.append((goblin, dist_to_carrier))
+        for goblin in self.game.grid.get_standing_goblins(blocker.team):
+            dist_to_carrier = manhattan_distance(goblin.position, carrier.position)
+            if dist_to_carrier <= 3:  # Within threatening range
+                enemies_near_carrier.append((goblin, dist_to_carrier))
         
         # Sort enemies by distance to carrier (closest first)
         enemies_near_carrier.sort(key=lambda x: x[1])
@@ -80,14 +78,52 @@ class BlockerMovement:
             for enemy, dist in enemies_near_carrier:
                 if self.is_adjacent(blocker, enemy):
                     # Try to block this enemy
-                    DEBUG.log(f"Attempt block of {enemy.name} by {blocker.name}")
+                    DEBUG.log("Attempt block of %s by %s", enemy.name, blocker.name)
                     if self.movement_system.attempt_block(blocker, enemy):
-                        DEBUG.log(f"Block succeeded!")
+                        DEBUG.log("Block succeeded!")
                         return True
         
         # Get possible moves
         possible_moves = self.movement_system.get_possible_moves(blocker)
         
+        # Score each possible move
+        move_scores = self.score_offensive_moves(blocker, carrier, enemies_near_carrier, possible_moves)
+        
+        # Choose the best move
+        if move_scores:
+            best_move = max(move_scores.items(), key=lambda x: x[1])[0]
+            DEBUG.log("Offensive blocker chose move %s with score %s", best_move, move_scores[best_move])
+            
+            # If this move puts us adjacent to an enemy, try to block after moving
+            move_successful = self.movement_system.move_goblin(blocker, best_move)
+            
+            if move_successful:
+                # Check if we can block an enemy after moving
+                if blocker.movement >= self.game.config.get("blocking_cost", 2):
+                    for enemy, _ in enemies_near_carrier:
+                        if self.is_adjacent(blocker, enemy):
+                            DEBUG.log("Offensive blocker %s attempting to block %s after moving", blocker.name, enemy.name)
+                            self.movement_system.attempt_block(blocker, enemy)
+                            return True
+                return True
+            
+        return False
+        
+    def score_offensive_moves(self, blocker, carrier, enemies_near_carrier, possible_moves):
+        """Score an offensive blocker's moves
+        
+        Args:
+            blocker: The blocker goblin to move
+            carrier: Its team's ball carrier
+            enemies_near_carrier: (enemy, distance to carrier) pairs, closest first
+            possible_moves: Squares the blocker can move to
+            
+        Returns:
+            dict: Move -> score, in the order of possible_moves
+        """
+        blocker_x, blocker_y = blocker.position
+        carrier_x, carrier_y = carrier.position
+        
         # Get direction to end zone
         target_y = 0 if carrier.team == self.game.team1 else self.game.grid.height - 1
         forward_dir = -1 if carrier.team == self.game.team1 else 1
@@ -114,7 +150,7 @@ class BlockerMovement:
                     score += 1500 + (threat_score * 50)
                     
                     # If blocker has enough movement to block after moving, even better
-                    if blocker.movement - manhattan_distance(blocker.position, move) >= self.game.config.get("blocking_cost", 2):
+                    if self.movement_after_move(blocker, move) >= self.game.config.get("blocking_cost", 2):
                         score += 500
             
             # SECOND PRIORITY: Blocking path between carrier and enemies
@@ -179,30 +215,12 @@ class BlockerMovement:
                 score -= 25
                 
             # Add some randomness
-            score += random.randint(-20, 20)
+            score += self.game.rng.randint(-20, 20)
             
             # Store the score
             move_scores[move] = score
             
-        # Choose the best move
-        if move_scores:
-            best_move = max(move_scores.items(), key=lambda x: x[1])[0]
-            DEBUG.log(f"Offensive blocker chose move {best_move} with score {move_scores[best_move]}")
-            
-            # If this move puts us adjacent to an enemy, try to block after moving
-            move_successful = self.movement_system.move_goblin(blocker, best_move)
-            
-            if move_successful:
-                # Check if we can block an enemy after moving
-                if blocker.movement >= self.game.config.get("blocking_cost", 2):
-                    for enemy, _ in enemies_near_carrier:
-                        if self.is_adjacent(blocker, enemy):
-                            DEBUG.log(f"Offensive blocker {blocker.name} attempting to block {enemy.name} after moving")
-                            self.movement_system.attempt_block(blocker, enemy)
-                            return True
-                return True
-            
-        return False
+        return move_scores
         
     def move_defensive_blocker(self, blocker):
         """Move a defensive blocker to tackle the carrier or disrupt the offense
@@ -217,23 +235,19 @@ class BlockerMovement:
         if blocker.movement <= 0 or blocker.knocked_down or blocker.unavailable:
             return False
             
-        DEBUG.log(f"Moving defensive blocker {blocker.name} with {blocker.movement} movement points")
+        DEBUG.log("Moving defensive blocker %s with %s movement points", blocker.name, blocker.movement)
         
         # Get carrier
         carrier = self.game.offense_team.get_carrier()
         if not carrier:
-            DEBUG.log(f"No carrier found for team {self.game.offense_team.name}!")
+            DEBUG.log("No carrier found for team %s!", self.game.offense_team.name)
             return False
             
-        # Get blocker and carrier positions
-        blocker_x, blocker_y = blocker.position
-        carrier_x, carrier_y = carrier.position
-        
         # 1. If adjacent to carrier, ALWAYS try to block
         if self.is_adjacent(blocker, carrier) and blocker.movement >= self.game.config.get("blocking_cost", 2):
-            DEBUG.log(f"Defensive blocker {blocker.name} attempting to block carrier {carrier.name}")
+            DEBUG.log("Defensive blocker %s attempting to block carrier %s", blocker.name, carrier.name)
             if self.movement_system.attempt_block(blocker, carrier):
-                DEBUG.log(f"Block succeeded!")
+                DEBUG.log("Block succeeded!")
                 return True
                 
         # 2. If not adjacent to carrier but close enough, prioritize getting adjacent over intercepting
@@ -242,65 +256,23 @@ class BlockerMovement:
         # Get possible moves
         possible_moves = self.movement_system.get_possible_moves(blocker)
         
+        # The carrier's projected route and square scores, shared by every defender this turn
+        interception = self.get_interception_map(carrier)
+        blocking_cost = self.game.config.get("blocking_cost", 2)
+        
         # Score each move with a high emphasis on getting adjacent to carrier
         move_scores = {}
         
         for move in possible_moves:
-            move_x, move_y = move
-            
-            # Initialize score
-            score = 0
-            
-            # Check if this move would put us adjacent to the carrier
-            would_be_adjacent = manhattan_distance(move, carrier.position) == 1
+            score = interception.score(move)
             
-            # HIGHEST PRIORITY: Get adjacent to carrier for blocking
-            if would_be_adjacent:
-                # Much higher score for positions that enable blocking
-                score += 2000
-                
-                # If blocker has enough movement to block after moving, even better
-                if blocker.movement - manhattan_distance(blocker.position, move) >= self.game.config.get("blocking_cost", 2):
+            # If blocker has enough movement to block after moving, even better
+            if manhattan_distance(move, carrier.position) == 1:
+                if self.movement_after_move(blocker, move) >= blocking_cost:
                     score += 1000
-            
-            # SECOND PRIORITY: Get as close as possible to carrier
-            distance = manhattan_distance(move, carrier.position)
-            proximity_score = 20 - min(20, distance)  # Higher for closer positions
-            score += proximity_score * 50
-                
-            # THIRD PRIORITY: Intercept path to end zone
-            target_y = 0 if carrier.team == self.game.team1 else self.game.grid.height - 1
-            
-            # Check if position is between carrier and their goal
-            is_intercepting = False
-            if carrier.team == self.game.team1:
-                # Carrier moving up, blocker should be above (lower y)
-                if move_y < carrier_y:
-                    is_intercepting = True
-                    # Bonus for being in the same column or adjacent
-                    if abs(move_x - carrier_x) <= 1:
-                        score += 200
-            else:
-                # Carrier moving down, blocker should be below (higher y)
-                if move_y > carrier_y:
-                    is_intercepting = True
-                    # Bonus for being in the same column or adjacent
-                    if abs(move_x - carrier_x) <= 1:
-                        score += 200
-                        
-            if is_intercepting:
-                score += 150
-                
-            # Position relative to end zone
-            dist_to_target = abs(move_y - target_y)
-            dist_carrier_to_target = abs(carrier_y - target_y)
-            
-            if dist_to_target < dist_carrier_to_target:
-                # Position is between carrier and their goal
-                score += 100
                 
             # Add some randomness
-            score += random.randint(-25, 25)
+            score += self.game.rng.randint(-25, 25)
             
             # Store the score
             move_scores[move] = score
@@ -308,7 +280,7 @@ class BlockerMovement:
         # Choose the best move
         if move_scores:
             best_move = max(move_scores.items(), key=lambda x: x[1])[0]
-            DEBUG.log(f"Defensive blocker chose move {best_move} with score {move_scores[best_move]}")
+            DEBUG.log("Defensive blocker chose move %s with score %s", best_move, move_scores[best_move])
             
             # If this move puts us adjacent to carrier, try to block after moving
             if manhattan_distance(best_move, carrier.position) == 1:
@@ -316,7 +288,7 @@ class BlockerMovement:
                 if self.movement_system.move_goblin(blocker, best_move):
                     # Then check if we can still block
                     if blocker.movement >= self.game.config.get("blocking_cost", 2) and self.is_adjacent(blocker, carrier):
-                        DEBUG.log(f"Defensive blocker {blocker.name} attempting to block carrier {carrier.name} after moving")
+                        DEBUG.log("Defensive blocker %s attempting to block carrier %s after moving", blocker.name, carrier.name)
                         self.movement_system.attempt_block(blocker, carrier)
                         return True
                     return True
@@ -326,6 +298,38 @@ class BlockerMovement:
             
         return False
         
+    def get_interception_map(self, carrier):
+        """Get the carrier's interception map for this turn, building it on first use
+        
+        The carrier moves before the defenders, so this is built once per carrier move.
+        
+        Args:
+            carrier: The ball carrier
+            
+        Returns:
+            InterceptionMap: Map for the carrier's current position
+        """
+        key = (self.game.current_play, self.game.turn, carrier.position)
+        if key != self.interception_key:
+            target_y = 0 if carrier.team == self.game.team1 else self.game.grid.height - 1
+            walk = self.game.config.get("ai_interception_walk", True)
+            self.interception_map = InterceptionMap(self.game.grid, carrier, target_y, walk)
+            self.interception_key = key
+        return self.interception_map
+        
+    def movement_after_move(self, blocker, move):
+        """Movement points a blocker has left after taking the safest route to a square
+        
+        Args:
+            blocker: The blocker goblin
+            move: The (x, y) position it would move to
+            
+        Returns:
+            int: Movement points left on arrival
+        """
+        route = self.movement_system.find_route(blocker, move, blocker.movement)
+        return blocker.movement - (route["steps"] if route else 0)
+        
     def is_adjacent(self, goblin1, goblin2):
         """Check if two goblins are adjacent"""
         return is_adjacent(goblin1.position, goblin2.position) 
\ No newline at end of file
@@ -1,7 +1,8 @@
-import random
 import logging
 from utils import manhattan_distance, get_adjacent_positions
 from logger import DEBUG
+from field_goal import evaluate_field_goal
+from event import FieldGoalMissEvent
 
 class CarrierMovement:
     """Handles movement logic for the ball carrier"""
@@ -24,7 +25,7 @@ class CarrierMovement:
         if carrier.movement <= 0 or carrier.knocked_down or carrier.unavailable:
             return False
             
-        DEBUG.log(f"Moving carrier {carrier.name} with {carrier.movement} movement points")
+        DEBUG.log("Moving carrier %s with %s movement points", carrier.name, carrier.movement)
         
         # Get current position
         current_x, current_y = carrier.position
@@ -38,88 +39,39 @@ class CarrierMovement:
         
         # Get the carrier's goal from the AI system
         goal = self.game.goal_system.set_goblin_goal(carrier)
-        DEBUG.log(f"Carrier {carrier.name} has goal: {goal}")
+        DEBUG.log("Carrier %s has goal: %s", carrier.name, goal)
         
         # Check if the goal is to attempt a field goal
         if goal == "attempt_field_goal":
-            DEBUG.log(f"Carrier {carrier.name} is attempting a field goal")
+            DEBUG.log("Carrier %s is attempting a field goal", carrier.name)
             # Calculate field goal success chance
             fg_chance = self.game.goal_system.estimate_field_goal_chance(carrier)
-            DEBUG.log(f"Field goal success chance: {fg_chance:.2f}")
+            DEBUG.log("Field goal success chance: %.2f", fg_chance)
             
             # Attempt the field goal
             self.attempt_field_goal(carrier)
             return True
         
-        # Check if there's a clear path to the end zone
-        has_clear_path = True
-        path_to_end = []
-        
-        # Determine the direct path to end zone target
+        # Check if there's a clear path to the end zone: the safest route there
+        # never has to step out of a defender's zone of control
         end_zone_target = (target_x, target_y)
-        
-        # Calculate the direct path
-        direction_x = 1 if target_x > current_x else -1 if target_x < current_x else 0
-        direction_y = forward_direction  # Already calculated based on team
-        
-        # Simple path calculation - move diagonally as far as possible, then straight
-        # Calculate the number of diagonal moves (min of x and y distance)
-        x_distance = abs(target_x - current_x)
-        y_distance = abs(target_y - current_y)
-        diagonal_moves = min(x_distance, y_distance)
-        
-        # Add diagonal moves
-        x, y = current_x, current_y
-        for i in range(diagonal_moves):
-            x += direction_x
-            y += direction_y
-            path_to_end.append((x, y))
-        
-        # Add remaining horizontal moves
-        for i in range(diagonal_moves, x_distance):
-            x += direction_x
-            path_to_end.append((x, y))
-            
-        # Add remaining vertical moves
-        x = target_x  # Reset to where the horizontal moves ended
-        y = current_y + diagonal_moves * direction_y  # Reset to where the diagonal moves ended
-        for i in range(diagonal_moves, y_distance):
-            y += direction_y
-            path_to_end.append((x, y))
-        
-        # Check if each square in path is empty or has a knocked down opponent
-        for pos in path_to_end:
-            entity = self.game.grid.get_entity_at_position(pos)
-            if entity and (not hasattr(entity, 'team') or entity.team == carrier.team or not entity.knocked_down):
-                has_clear_path = False
-                break
+        route_to_end = self.movement_system.find_route(carrier, end_zone_target)
         
         # If there's a clear path to end zone, prioritize direct movement
-        if has_clear_path and carrier.movement > 0:
-            # Find the farthest point on the path we can reach with our movement
-            reachable_path = [pos for pos in path_to_end if manhattan_distance(carrier.position, pos) <= carrier.movement]
+        if route_to_end and route_to_end["success_chance"] == 1.0 and carrier.movement > 0:
+            # Move to the farthest point on the path we can reach with our movement
+            target_pos = route_to_end["path"][:carrier.movement][-1]
             
-            if reachable_path:
-                # Move to the farthest reachable point on the path
-                target_pos = reachable_path[-1]
-                
-                # NEW: Safety check - ensure we're not moving directly into danger
-                # Count defenders near the target position
-                defenders_near_target = 0
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        check_pos = (target_pos[0] + dx, target_pos[1] + dy)
-                        if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                            entity = self.game.grid.get_entity_at_position(check_pos)
-                            if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                                defenders_near_target += 1
-                
-                # Only take clear path if there are no nearby defenders threatening the target position
-                if defenders_near_target == 0:
-                    # Try to move directly to this position
-                    if self.movement_system.move_goblin(carrier, target_pos):
-                        DEBUG.log(f"Carrier {carrier.name} moved along clear path to {target_pos}")
-                        return True
+            # NEW: Safety check - ensure we're not moving directly into danger
+            # Count defenders near the target position
+            defenders_near_target = self.game.grid.area_count(target_pos, carrier.team)
+            
+            # Only take clear path if there are no nearby defenders threatening the target position
+            if defenders_near_target == 0:
+                # Try to move directly to this position
+                if self.movement_system.move_goblin(carrier, target_pos):
+                    DEBUG.log("Carrier %s moved along clear path to %s", carrier.name, target_pos)
+                    return True
         
         # Use different strategies for finding movement targets
         # 1. First try to move directly toward the end zone
@@ -146,11 +98,10 @@ class CarrierMovement:
         # Filter out moves that are beyond movement range, blocked, backwards, or previously visited
         valid_moves = []
         for move, priority in all_paths:
-            # Check if we have enough movement points
-            distance = manhattan_distance(carrier.position, move)
-            if distance <= carrier.movement:
-                # Check if the move is valid (empty space, on grid)
-                if self.is_valid_move(carrier, move):
+            # Check the move is valid (empty space, on grid) and a route reaches it this turn
+            if self.is_valid_move(carrier, move):
+                route = self.movement_system.find_route(carrier, move, carrier.movement)
+                if route:
                     # Check if this move is backwards (away from end zone)
                     move_y_diff = move[1] - current_y
                     
@@ -160,12 +111,12 @@ class CarrierMovement:
                     
                     # Only include moves that are not backwards and not previously visited
                     if not is_backwards and move not in previously_visited:
-                        valid_moves.append((move, priority))
+                        valid_moves.append((move, priority, route["steps"]))
         
         # NEW: Evaluate safety of each valid move
         if valid_moves:
             move_scores = []
-            for move, priority in valid_moves:
+            for move, priority, steps in valid_moves:
                 # Base score is the priority (3, 2, or 1)
                 base_score = priority * 10.0
                 
@@ -179,9 +130,8 @@ class CarrierMovement:
                 progress_score = 10.0 - abs(move[1] - target_y) / self.game.grid.height * 10.0
                 total_score += progress_score
                 
-                # Calculate distance from current position (closer moves are slightly preferred)
-                distance = manhattan_distance(carrier.position, move)
-                distance_score = (carrier.movement - distance) * 0.2  # Small bonus for shorter moves
+                # Closer moves are slightly preferred
+                distance_score = (carrier.movement - steps) * 0.2  # Small bonus for shorter moves
                 total_score += distance_score
                 
                 move_scores.append((move, total_score))
@@ -192,15 +142,7 @@ class CarrierMovement:
             # Try moves in order of score
             for move, score in move_scores:
                 # Extra safety check - don't move directly adjacent to a defender
-                adjacent_defender = False
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        check_pos = (move[0] + dx, move[1] + dy)
-                        if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                            entity = self.game.grid.get_entity_at_position(check_pos)
-                            if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                                adjacent_defender = True
-                                break
+                adjacent_defender = self.game.grid.area_count(move, carrier.team) > 0
                 
                 # Skip moves that put carrier directly next to a defender unless well screened
                 # (high safety score indicates good screening)
@@ -209,14 +151,13 @@ class CarrierMovement:
                 
                 # Try to move to this position
                 if self.movement_system.move_goblin(carrier, move):
-                    DEBUG.log(f"Carrier {carrier.name} moved to {move} (score: {score:.1f})")
+                    DEBUG.log("Carrier %s moved to %s (score: %.1f)", carrier.name, move, score)
                     return True
         
         # If we get here, try lateral moves as a fallback
         lateral_moves = []
         for move, priority in all_paths:
-            distance = manhattan_distance(carrier.position, move)
-            if distance <= carrier.movement and self.is_valid_move(carrier, move):
+            if self.is_valid_move(carrier, move) and self.movement_system.find_route(carrier, move, carrier.movement):
                 # Check if move is backwards
                 move_y_diff = move[1] - current_y
                 is_backwards = (forward_direction == -1 and move_y_diff > 0) or \
@@ -234,26 +175,18 @@ class CarrierMovement:
         # Try lateral moves in order of safety
         for move, score in lateral_moves:
             # Extra safety check - don't move directly adjacent to a defender
-            adjacent_defender = False
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    check_pos = (move[0] + dx, move[1] + dy)
-                    if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                        entity = self.game.grid.get_entity_at_position(check_pos)
-                        if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                            adjacent_defender = True
-                            break
+            adjacent_defender = self.game.grid.area_count(move, carrier.team) > 0
             
             # Skip moves that put carrier directly next to a defender unless well screened
             if adjacent_defender and score < 2.0:  # Lower threshold for lateral moves
                 continue
                 
             if self.movement_system.move_goblin(carrier, move):
-                DEBUG.log(f"Carrier {carrier.name} moved to lateral position {move} (safety: {score:.1f})")
+                DEBUG.log("Carrier %s moved to lateral position %s (safety: %.1f)", carrier.name, move, score)
                 return True
                 
         # If we get here, no valid moves found or all moves failed
-        DEBUG.log(f"Carrier {carrier.name} couldn't find valid move")
+        DEBUG.log("Carrier %s couldn't find valid move", carrier.name)
         return False
         
     def get_direct_path(self, carrier, target_pos):
@@ -275,12 +208,7 @@ class CarrierMovement:
         dy = 1 if target_y > current_y else -1 if target_y < current_y else 0
         
         # Check how many defenders are active on the field - if few or none, be more aggressive
-        active_defenders = 0
-        for x in range(self.game.grid.width):
-            for y in range(self.game.grid.height):
-                entity = self.game.grid.get_entity_at_position((x, y))
-                if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                    active_defenders += 1
+        active_defenders = bin(self.game.grid.zones.standing_opponents(carrier.team)).count("1")
                     
         # Generate more direct paths if few defenders are active
         if active_defenders <= 1:
@@ -384,12 +312,7 @@ class CarrierMovement:
         current_x, current_y = carrier.position
         
         # Get positions of all enemy goblins
-        enemy_positions = []
-        for x in range(self.game.grid.width):
-            for y in range(self.game.grid.height):
-                entity = self.game.grid.get_entity_at_position((x, y))
-                if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                    enemy_positions.append((x, y))
+        enemy_positions = [e.position for e in self.game.grid.get_standing_goblins(carrier.team)]
                     
         # Generate all possible moves within range
         for i in range(1, carrier.movement + 1):
@@ -482,98 +405,20 @@ class CarrierMovement:
         if not carrier or not carrier.has_ball:
             return False
             
-        # Find hoop position (center of opponent's end zone)
-        if carrier.team == self.game.team1:
-            hoop_y = 0
-        else:
-            hoop_y = self.game.grid.height - 1
-            
-        hoop_x = self.game.grid.width // 2
-        hoop_pos = (hoop_x, hoop_y)
-        
-        # Calculate distance to hoop
-        distance = manhattan_distance(carrier.position, hoop_pos)
-        
-        # Calculate base success chance based on distance
-        if distance > 5:
-            # "Hail Magoo" shot - very low chance
-            base_chance = 0.05 + (0.05 * min(5, carrier.agility) / 5.0)  # Max 10% for highest agility
-        else:
-            # More conservative base percentages:
-            # 35% at 5 squares, +10% for each square closer
-            base_chance = 0.35 + (5 - distance) * 0.10
-        
-        # Get carrier's dexterity (default to 5 if not found)
-        dexterity = getattr(carrier, 'agility', 5)  # Using agility as dexterity
-        
-        # Calculate dexterity modifier (0% at 5, -5% at 4, +5% at 6, etc.)
-        dexterity_mod = (dexterity - 5) * 0.05
-        
-        # Count defenders whose zone of control the carrier is in
-        defender_zoc_count = 0
-        carrier_x, carrier_y = carrier.position
-        
-        # Check all adjacent positions for defenders (8-way adjacency)
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                if dx == 0 and dy == 0:
-                    continue  # Skip the carrier's own position
-                
-                check_pos = (carrier_x + dx, carrier_y + dy)
-                if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                    entity = self.game.grid.get_entity_at_position(check_pos)
-                    if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                        defender_zoc_count += 1
-        
-        # Apply -15% per defender zone of control (more significant penalty)
-        defender_zoc_penalty = defender_zoc_count * -0.15
-        
-        # Check for defender zones of control along the path to the hoop
-        path_zoc_penalty = 0
-        
-        # Calculate a simple path from carrier to hoop
-        path_points = self.calculate_path_to_hoop(carrier.position, hoop_pos)
-        
-        # Check each point on the path (excluding start and end points)
-        for point in path_points[1:-1]:  # Skip carrier position and hoop
-            # Check adjacent squares for defenders
-            x, y = point
-            has_defender_zoc = False
-            
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    check_pos = (x + dx, y + dy)
-                    if 0 <= check_pos[0] < self.game.grid.width and 0 <= check_pos[1] < self.game.grid.height:
-                        entity = self.game.grid.get_entity_at_position(check_pos)
-                        if entity and hasattr(entity, 'team') and entity.team != carrier.team and not entity.knocked_down:
-                            has_defender_zoc = True
-                            break
-                            
-            if has_defender_zoc:
-                path_zoc_penalty -= 0.15  # Higher penalty
-        
-        # Additional distance penalty for longer shots
-        distance_penalty = -0.05 * max(0, distance - 3)  # Additional penalty beyond 3 squares
-        
-        # Calculate final success chance
-        success_chance = base_chance + dexterity_mod + defender_zoc_penalty + path_zoc_penalty + distance_penalty
-        
-        # Ensure "Hail Magoo" shots never exceed 10%
-        if distance > 5:
-            success_chance = min(0.10, success_chance)
-        
-        # Ensure chance is between 0.05 and 0.90 (always at least 5% chance, never more than 90%)
-        success_chance = max(0.05, min(0.90, success_chance))
+        # Work out the odds with the same table the AI uses to decide on a kick
+        shot = evaluate_field_goal(self.game, carrier)
+        distance = shot["distance"]
+        success_chance = shot["success_chance"]
         
         # Roll for success
-        roll = random.random()
+        roll = self.game.rng.random()
         success = roll < success_chance
         
         # Log the attempt details
         self.logger.info(f"Field goal attempt by {carrier.name} from distance {distance}")
-        self.logger.info(f"Base chance: {base_chance:.2f}, Dexterity mod: {dexterity_mod:.2f}")
-        self.logger.info(f"Defender ZOC penalty: {defender_zoc_penalty:.2f}, Path ZOC penalty: {path_zoc_penalty:.2f}")
-        self.logger.info(f"Distance penalty: {distance_penalty:.2f}")
+        self.logger.info(f"Base chance: {shot['base_chance']:.2f}, Dexterity mod: {shot['dexterity_mod']:.2f}")
+        self.logger.info(f"Defender ZOC penalty: {shot['defender_zoc_penalty']:.2f}, Path ZOC penalty: {shot['path_zoc_penalty']:.2f}")
+        self.logger.info(f"Distance penalty: {shot['distance_penalty']:.2f}")
         self.logger.info(f"Final chance: {success_chance:.2f}, Roll: {roll:.2f}, Result: {'SUCCESS' if success else 'FAIL'}")
         
         # If successful, score points
@@ -585,55 +430,12 @@ class CarrierMovement:
             carrier.has_ball = False
             
             # Log the event
-            self.game.event_manager.create_and_dispatch("field_goal_miss", {
-                "carrier_id": carrier.id,
-                "carrier_name": carrier.name,
-                "team_id": carrier.team.id,
-                "team_name": carrier.team.name,
-                "position": carrier.position,
-                "distance": distance,
-                "success_chance": success_chance,
-                "roll": roll
-            })
+            self.game.event_manager.emit(FieldGoalMissEvent, carrier, carrier.position, distance, success_chance, roll)
             
             # End the play
             self.game.end_play()
             return False
             
-    def calculate_path_to_hoop(self, start_pos, hoop_pos):
-        """Calculate a simple path from the carrier to the hoop
-        
-        Args:
-            start_pos: Starting position (x, y)
-            hoop_pos: Hoop position (x, y)
-            
-        Returns:
-            list: List of positions (x, y) forming the path
-        """
-        path = [start_pos]
-        current_x, current_y = start_pos
-        target_x, target_y = hoop_pos
-        
-        # Bresenham's line algorithm for a reasonably straight path
-        dx = abs(target_x - current_x)
-        dy = abs(target_y - current_y)
-        sx = 1 if current_x < target_x else -1
-        sy = 1 if current_y < target_y else -1
-        err = dx - dy
-        
-        while current_x != target_x or current_y != target_y:
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                current_x += sx
-            if e2 < dx:
-                err += dx
-                current_y += sy
-                
-            path.append((current_x, current_y))
-            
-        return path
-
     def evaluate_move_safety(self, carrier, move_pos):
         """Evaluate how safe a potential move is based on blocker positions
         
@@ -647,17 +449,10 @@ class CarrierMovement:
         safety_score = 0.0
         
         # Get all defenders and friendly blockers
-        defenders = []
-        blockers = []
-        
-        for x in range(self.game.grid.width):
-            for y in range(self.game.grid.height):
-                entity = self.game.grid.get_entity_at_position((x, y))
-                if entity and hasattr(entity, 'team') and not entity.knocked_down:
-                    if entity.team != carrier.team:
-                        defenders.append(entity)
-                    elif entity != carrier:  # Friendly blocker, not the carrier
-                        blockers.append(entity)
+        defenders = self.game.grid.get_standing_goblins(carrier.team)
+        
+        # Friendly blockers, not the carrier
+        blockers = [g for g in self.game.grid.get_standing_goblins(carrier.team, opponents=False) if g != carrier]
         
         # For each defender, check if they're screened by a friendly blocker
         for defender in defenders:
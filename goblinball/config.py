@@ -34,6 +34,8 @@ class Config:
             # AI behavior
             "ai_aggression": 0.7,
             "ai_blocking_preference": 0.6,
+            "ai_duke_risk_weight": 10.0,
+            "ai_interception_walk": True,
             "movement_style_weights": {
                 "direct": 0.3,
                 "flanking": 0.2,
@@ -49,12 +51,34 @@ class Config:
             
             # Visuals
             "animation_speed": 1.0,
+            "animation_concurrent": True,
+            "animation_max_turns_behind": 1,
+            "animation_move_duration": 0.2,
+            "idle_fps": 10,
+            "text_cache_size": 512,
             "show_grid": True,
             "show_debug_info": False,
             "debug_logging": True,
-            "verbose_debug": False
+            "verbose_debug": False,
+            "debug_log_level": "INFO",
+            "debug_log_buffered": True,
+            "debug_log_flush_interval": 0.5,
+            "debug_log_queue_size": 10000,
+            "event_history_size": 1000,
+            "event_fast_path": False,
+            "turn_history_size": 1000,
+            "replay_dir": None,
+            "replay_keyframe_interval": 10,
+            "simulation_thread": False,
+            "simulation_lookahead": 1,
+            "grid_consistency_checks": False
         }
         
+        # Resolve relative paths against this module's directory so the
+        # config is found no matter where the game is launched from
+        if not os.path.isabs(config_file):
+            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
+        
         # Load custom config if exists
         self.config = self.load_config(config_file)
     
@@ -78,6 +102,10 @@ class Config:
     
     def get(self, key, default=None):
         return self.config.get(key, default)
+    
+    def set(self, key, value):
+        """Override a setting for this run without saving it to the config file"""
+        self.config[key] = value
 
 # Create a global instance of the config
 CONFIG = Config() 
\ No newline at end of file
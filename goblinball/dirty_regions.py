@@ -0,0 +1,73 @@
+"""
+Dirty-rectangle tracking for the Goblinball viewer
+Each renderer describes the regions it draws as a name, a screen rect and a key
+summing up what the region shows. A region only needs redrawing when its key or
+rect changed since the last frame, so a paused game with nothing moving redraws
+nothing at all.
+"""
+
+import pygame
+
+
+class DirtyRegions:
+    """Remembers what each named screen region last showed"""
+
+    def __init__(self):
+        self.shown = {}  # Region name -> (key, rect or None)
+
+    def check(self, name, key, rect):
+        """Record a region's current state
+
+        Args:
+            name: Name of the region, unique across renderers
+            key: Hashable summary of what the region shows; any change means a redraw
+            rect: Screen rect the region covers, or None if it isn't drawn
+
+        Returns:
+            list: Rects to redraw, the old and new area of the region if it changed, else empty
+        """
+        shown = self.shown.get(name)
+        if shown is not None and shown[0] == key and shown[1] == rect:
+            return []
+        self.shown[name] = (key, None if rect is None else pygame.Rect(rect))
+
+        rects = []
+        if shown is not None and shown[1] is not None:
+            rects.append(shown[1])
+        if rect is not None:
+            rects.append(pygame.Rect(rect))
+        return rects
+
+    def invalidate(self):
+        """Forget every region, so the next frame redraws everything"""
+        self.shown.clear()
+
+
+def merge_rects(rects, bounds, full_screen_ratio=0.5):
+    """Combine overlapping dirty rects and clip them to the screen
+
+    Args:
+        rects: Rects to redraw
+        bounds: The screen rect
+        full_screen_ratio: If the rects cover more than this share of the screen,
+                           redraw the whole screen in one pass instead
+
+    Returns:
+        list: Disjoint rects covering every input rect
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+
+        # Swallow every rect this one touches, growing it until nothing overlaps
+        overlapping = rect.collidelist(merged)
+        while overlapping != -1:
+            rect.union_ip(merged.pop(overlapping))
+            overlapping = rect.collidelist(merged)
+        merged.append(rect)
+
+    if sum(rect.width * rect.height for rect in merged) > bounds.width * bounds.height * full_screen_ratio:
+        return [pygame.Rect(bounds)]
+    return merged
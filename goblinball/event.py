@@ -1,11 +1,27 @@
+import json
 import time
+from collections import deque
+from config import CONFIG
 
 class GameEvent:
     """Represents a significant game event for logging and visualization"""
+    __slots__ = ("event_type", "timestamp", "_data")
+    
     def __init__(self, event_type, data=None):
         self.event_type = event_type  # "move", "block", "score", etc.
-        self.data = data or {}        # Event-specific data
-        self.timestamp = time.time()
+        self._data = data or {}       # Event-specific data
+        self.timestamp = time.monotonic()
+        
+    @property
+    def data(self):
+        """Event-specific data as a dictionary, built on first access for typed events"""
+        if self._data is None:
+            self._data = self.build_data()
+        return self._data
+        
+    def build_data(self):
+        """Build the data dictionary from a typed event's fields"""
+        return {}
         
     def __str__(self):
         """String representation for logging"""
@@ -33,15 +49,361 @@ class GameEvent:
     @classmethod
     def from_dict(cls, data):
         """Create event from dictionary"""
-        event = cls(data["event_type"], data["data"])
+        event = GameEvent(data["event_type"], data["data"])
         event.timestamp = data["timestamp"]
         return event
 
 
-class EventManager:
+class TypedEvent(GameEvent):
+    """Base for events with fixed fields; data is only built if someone asks for it"""
+    __slots__ = ()
+    EVENT_TYPE = None
+    
     def __init__(self):
+        self.event_type = self.EVENT_TYPE
+        self.timestamp = time.monotonic()
+        self._data = None
+
+
+class MoveEvent(TypedEvent):
+    """A goblin stepped to a new square"""
+    __slots__ = ("goblin", "from_pos", "to_pos")
+    EVENT_TYPE = "move"
+    
+    def __init__(self, goblin, from_pos, to_pos):
+        TypedEvent.__init__(self)
+        self.goblin = goblin
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        
+    def build_data(self):
+        return {
+            "goblin_id": self.goblin.id,
+            "goblin_name": self.goblin.name,
+            "goblin": self.goblin,
+            "from_pos": self.from_pos,
+            "target": self.to_pos
+        }
+
+
+class BlockEvent(TypedEvent):
+    """A goblin blocked an adjacent opponent"""
+    __slots__ = ("blocker", "target", "result", "blocker_roll", "defender_roll", "diff", "target_knocked_down")
+    EVENT_TYPE = "block"
+    
+    def __init__(self, blocker, target, result, blocker_roll, defender_roll, diff, target_knocked_down):
+        TypedEvent.__init__(self)
+        self.blocker = blocker
+        self.target = target
+        self.result = result
+        self.blocker_roll = blocker_roll
+        self.defender_roll = defender_roll
+        self.diff = diff
+        self.target_knocked_down = target_knocked_down
+        
+    def build_data(self):
+        return {
+            "blocker_id": self.blocker.id,
+            "blocker_name": self.blocker.name,
+            "blocker": self.blocker,
+            "target_id": self.target.id,
+            "target_name": self.target.name,
+            "target": self.target,
+            "result": self.result,
+            "blocker_roll": self.blocker_roll,
+            "defender_roll": self.defender_roll,
+            "diff": self.diff,
+            "target_knocked_down": self.target_knocked_down
+        }
+
+
+class PushEvent(TypedEvent):
+    """A block pushed the target back a square"""
+    __slots__ = ("pusher", "target", "from_pos", "to_pos")
+    EVENT_TYPE = "push"
+    
+    def __init__(self, pusher, target, from_pos, to_pos):
+        TypedEvent.__init__(self)
+        self.pusher = pusher
+        self.target = target
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        
+    def build_data(self):
+        return {
+            "pusher_id": self.pusher.id,
+            "pusher_name": self.pusher.name,
+            "pusher": self.pusher,
+            "target_id": self.target.id,
+            "target_name": self.target.name,
+            "target": self.target,
+            "from_pos": self.from_pos,
+            "to_pos": self.to_pos
+        }
+
+
+class DukeCheckEvent(TypedEvent):
+    """A goblin tried to leave an opponent's zone of control"""
+    __slots__ = ("goblin", "blockers", "success", "chance")
+    EVENT_TYPE = "duke_check"
+    
+    def __init__(self, goblin, blockers, success, chance):
+        TypedEvent.__init__(self)
+        self.goblin = goblin
+        self.blockers = blockers
+        self.success = success
+        self.chance = chance
+        
+    def build_data(self):
+        return {
+            "goblin_id": self.goblin.id,
+            "goblin_name": self.goblin.name,
+            "goblin": self.goblin,
+            "blockers": self.blockers,
+            "success": self.success,
+            "chance": self.chance
+        }
+
+
+class KnockdownEvent(TypedEvent):
+    """A goblin was knocked to the ground"""
+    __slots__ = ("goblin", "cause")
+    EVENT_TYPE = "knockdown"
+    
+    def __init__(self, goblin, cause=None):
+        TypedEvent.__init__(self)
+        self.goblin = goblin
+        self.cause = cause
+        
+    def build_data(self):
+        data = {
+            "goblin_id": self.goblin.id,
+            "goblin_name": self.goblin.name,
+            "goblin": self.goblin
+        }
+        if self.cause:
+            data["cause"] = self.cause
+        return data
+
+
+class BallDroppedEvent(TypedEvent):
+    """The carrier lost the ball"""
+    __slots__ = ("goblin", "position")
+    EVENT_TYPE = "ball_dropped"
+    
+    def __init__(self, goblin, position):
+        TypedEvent.__init__(self)
+        self.goblin = goblin
+        self.position = position
+        
+    def build_data(self):
+        return {
+            "goblin_id": self.goblin.id,
+            "goblin_name": self.goblin.name,
+            "goblin": self.goblin,
+            "position": self.position
+        }
+
+
+class ScoreEvent(TypedEvent):
+    """Base for touchdowns and field goals"""
+    __slots__ = ("carrier", "points", "position")
+    
+    def __init__(self, carrier, points, position):
+        TypedEvent.__init__(self)
+        self.carrier = carrier
+        self.points = points
+        self.position = position
+        
+    def build_data(self):
+        return {
+            "carrier_id": self.carrier.id,
+            "carrier_name": self.carrier.name,
+            "team_id": self.carrier.team.id,
+            "team_name": self.carrier.team.name,
+            "points": self.points,
+            "position": self.position,
+            "goblin": self.carrier
+        }
+
+
+class TouchdownEvent(ScoreEvent):
+    """The carrier reached the end zone"""
+    __slots__ = ()
+    EVENT_TYPE = "touchdown"
+
+
+class FieldGoalEvent(ScoreEvent):
+    """The carrier kicked a field goal"""
+    __slots__ = ()
+    EVENT_TYPE = "field_goal"
+
+
+class FieldGoalMissEvent(TypedEvent):
+    """The carrier missed a field goal"""
+    __slots__ = ("carrier", "position", "distance", "success_chance", "roll")
+    EVENT_TYPE = "field_goal_miss"
+    
+    def __init__(self, carrier, position, distance, success_chance, roll):
+        TypedEvent.__init__(self)
+        self.carrier = carrier
+        self.position = position
+        self.distance = distance
+        self.success_chance = success_chance
+        self.roll = roll
+        
+    def build_data(self):
+        return {
+            "carrier_id": self.carrier.id,
+            "carrier_name": self.carrier.name,
+            "team_id": self.carrier.team.id,
+            "team_name": self.carrier.team.name,
+            "position": self.position,
+            "distance": self.distance,
+            "success_chance": self.success_chance,
+            "roll": self.roll
+        }
+
+
+class TurnEvent(TypedEvent):
+    """Base for the start and end of a turn"""
+    __slots__ = ("turn", "play")
+    
+    def __init__(self, turn, play):
+        TypedEvent.__init__(self)
+        self.turn = turn
+        self.play = play
+        
+    def build_data(self):
+        return {"turn": self.turn, "play": self.play}
+
+
+class TurnStartEvent(TurnEvent):
+    """A turn began"""
+    __slots__ = ()
+    EVENT_TYPE = "turn_start"
+
+
+class TurnEndEvent(TurnEvent):
+    """A turn finished"""
+    __slots__ = ()
+    EVENT_TYPE = "turn_end"
+
+
+class TurnLimitEvent(TypedEvent):
+    """A play ran out of turns"""
+    __slots__ = ("max_turns",)
+    EVENT_TYPE = "turn_limit_reached"
+    
+    def __init__(self, max_turns):
+        TypedEvent.__init__(self)
+        self.max_turns = max_turns
+        
+    def build_data(self):
+        return {"max_turns": self.max_turns}
+
+
+class PlayStartEvent(TypedEvent):
+    """A play began"""
+    __slots__ = ("play_number", "offense_team", "carrier")
+    EVENT_TYPE = "play_start"
+    
+    def __init__(self, play_number, offense_team, carrier):
+        TypedEvent.__init__(self)
+        self.play_number = play_number
+        self.offense_team = offense_team
+        self.carrier = carrier
+        
+    def build_data(self):
+        return {
+            "play_number": self.play_number,
+            "offense_team": self.offense_team.name,
+            "carrier": self.carrier.name
+        }
+
+
+class PlayEndEvent(TypedEvent):
+    """A play finished"""
+    __slots__ = ("play_number", "turns", "score")
+    EVENT_TYPE = "play_end"
+    
+    def __init__(self, play_number, turns, score):
+        TypedEvent.__init__(self)
+        self.play_number = play_number
+        self.turns = turns
+        self.score = score  # Team name -> score
+        
+    def build_data(self):
+        return {"play_number": self.play_number, "turns": self.turns, "score": self.score}
+
+
+class GameEndEvent(TypedEvent):
+    """The game finished"""
+    __slots__ = ("winner", "score", "plays")
+    EVENT_TYPE = "game_end"
+    
+    def __init__(self, winner, score, plays):
+        TypedEvent.__init__(self)
+        self.winner = winner  # Winning team's name, or "Tie"
+        self.score = score  # Team name -> score
+        self.plays = plays
+        
+    def build_data(self):
+        return {"winner": self.winner, "score": self.score, "plays": self.plays}
+
+
+class JsonLinesEventSink:
+    """Appends every dispatched event to a file, one JSON object per line"""
+    def __init__(self, path, flush_every=100):
+        """Open the sink
+        
+        Args:
+            path: File to append events to
+            flush_every: Number of events between flushes
+        """
+        self.path = path
+        self.file = open(path, "a")
+        self.flush_every = flush_every
+        self.unflushed = 0
+        
+    def write(self, event):
+        """Write an event, turning objects in its data into strings"""
+        self.file.write(json.dumps(event.to_dict(), default=str) + "\n")
+        self.unflushed += 1
+        if self.unflushed >= self.flush_every:
+            self.file.flush()
+            self.unflushed = 0
+            
+    def close(self):
+        """Flush and close the file"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class EventManager:
+    def __init__(self, history_size=None, sink=None):
+        """Initialize the event manager
+        
+        Args:
+            history_size: Number of recent events kept in memory, overall and per type;
+                          defaults to the "event_history_size" config value
+            sink: Optional object with write(event) and close() that receives every event,
+                  e.g. a JsonLinesEventSink to keep the full history on disk
+        """
+        self.history_size = history_size or CONFIG.get("event_history_size", 1000)
         self.listeners = {}
-        self.events = []
+        self.sink = sink
+        
+        # Ring buffers of recent events, and an index of them by type
+        self.events = deque(maxlen=self.history_size)
+        self.events_by_type = {}
+        
+        # Events of each type dispatched since the last clear, including any evicted from the buffers
+        self.event_counts = {}
+        
+        # When set, events that no listener or sink would see are counted but never built or kept
+        self.fast_path = CONFIG.get("event_fast_path", False)
         
     def add_listener(self, event_type, callback):
         """Add a callback function for an event type"""
@@ -51,27 +413,78 @@ class EventManager:
         
     def dispatch(self, event):
         """Dispatch an event to all registered listeners"""
+        event_type = event.event_type
+        
         self.events.append(event)
+        recent = self.events_by_type.get(event_type)
+        if recent is None:
+            recent = deque(maxlen=self.history_size)
+            self.events_by_type[event_type] = recent
+        recent.append(event)
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        
+        if self.sink is not None:
+            self.sink.write(event)
         
-        event_type = event.event_type
         if event_type in self.listeners:
             for callback in self.listeners[event_type]:
                 callback(event)
                 
+    def wants(self, event_type):
+        """Check whether an event of a type needs to be built at all"""
+        return not self.fast_path or self.sink is not None or event_type in self.listeners
+        
+    def skip(self, event_type):
+        """Count an event that was never built"""
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        
     def create_and_dispatch(self, event_type, data=None):
         """Create and dispatch an event in one step"""
+        if not self.wants(event_type):
+            self.skip(event_type)
+            return None
         event = GameEvent(event_type, data)
         self.dispatch(event)
         return event
         
+    def emit(self, event_class, *args):
+        """Create and dispatch a typed event, unless the fast path says nobody would see it
+        
+        Args:
+            event_class: A TypedEvent subclass
+            *args: Arguments for the event's constructor
+            
+        Returns:
+            The event, or None if it was skipped
+        """
+        event_type = event_class.EVENT_TYPE
+        if not self.wants(event_type):
+            self.skip(event_type)
+            return None
+        event = event_class(*args)
+        self.dispatch(event)
+        return event
+        
     def get_recent_events(self, count=10):
-        """Get the most recent events"""
-        return self.events[-count:] if self.events else []
+        """Get the most recent events, oldest first"""
+        count = min(count, len(self.events))
+        return [self.events[i] for i in range(len(self.events) - count, len(self.events))]
         
     def get_events_by_type(self, event_type):
-        """Get all events of a specific type"""
-        return [e for e in self.events if e.event_type == event_type]
+        """Get the recent events of a specific type, oldest first"""
+        return list(self.events_by_type.get(event_type, ()))
+        
+    def count_events(self, event_type):
+        """Count the events of a type dispatched since the last clear"""
+        return self.event_counts.get(event_type, 0)
         
     def clear_events(self):
         """Clear all events"""
-        self.events = [] 
\ No newline at end of file
+        self.events.clear()
+        self.events_by_type = {}
+        self.event_counts = {}
+        
+    def close(self):
+        """Close the sink, if any"""
+        if self.sink is not None:
+            self.sink.close()
@@ -0,0 +1,190 @@
+"""
+Field goal odds for Goblinball
+This module is the single implementation of field goal success chances, shared by
+the AI's estimate and the resolution of an actual attempt. The line of shot from
+every square to each hoop is precomputed once per grid size, so an estimate is a
+handful of lookups against the grid's zone-of-control maps.
+"""
+
+from functools import lru_cache
+
+
+def line_of_shot(start_pos, hoop_pos):
+    """Calculate a reasonably straight path from a square to the hoop
+
+    Args:
+        start_pos: Starting position (x, y)
+        hoop_pos: Hoop position (x, y)
+
+    Returns:
+        list: List of positions (x, y) from the start to the hoop, inclusive
+    """
+    path = [start_pos]
+    current_x, current_y = start_pos
+    target_x, target_y = hoop_pos
+
+    # Bresenham's line algorithm
+    dx = abs(target_x - current_x)
+    dy = abs(target_y - current_y)
+    sx = 1 if current_x < target_x else -1
+    sy = 1 if current_y < target_y else -1
+    err = dx - dy
+
+    while current_x != target_x or current_y != target_y:
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            current_x += sx
+        if e2 < dx:
+            err += dx
+            current_y += sy
+
+        path.append((current_x, current_y))
+
+    return path
+
+
+@lru_cache(maxsize=None)
+def field_goal_chance(distance, dexterity, defender_zoc_count, path_zoc_count):
+    """Work out the success chance of a field goal
+
+    Args:
+        distance: Manhattan distance to the hoop
+        dexterity: The kicker's dexterity (agility)
+        defender_zoc_count: Defenders whose zone of control covers the kicker
+        path_zoc_count: Squares on the line of shot on or next to a standing defender
+
+    Returns:
+        tuple: (base chance, dexterity modifier, defender ZOC penalty,
+                path ZOC penalty, distance penalty, final chance)
+    """
+    # Calculate base success chance based on distance
+    if distance > 5:
+        # "Hail Magoo" shot - very low chance
+        base_chance = 0.05 + (0.05 * min(5, dexterity) / 5.0)  # Max 10% for highest agility
+    else:
+        # More conservative base percentages:
+        # 35% at 5 squares, +10% for each square closer
+        base_chance = 0.35 + (5 - distance) * 0.10
+
+    # Calculate dexterity modifier (0% at 5, -5% at 4, +5% at 6, etc.)
+    dexterity_mod = (dexterity - 5) * 0.05
+
+    # Apply -15% per defender zone of control (more significant penalty)
+    defender_zoc_penalty = defender_zoc_count * -0.15
+
+    # -15% for each contested square along the line of shot
+    path_zoc_penalty = 0
+    for _ in range(path_zoc_count):
+        path_zoc_penalty -= 0.15
+
+    # Additional distance penalty for longer shots
+    distance_penalty = -0.05 * max(0, distance - 3)  # Additional penalty beyond 3 squares
+
+    # Calculate final success chance
+    success_chance = base_chance + dexterity_mod + defender_zoc_penalty + path_zoc_penalty + distance_penalty
+
+    # Ensure "Hail Magoo" shots never exceed 10%
+    if distance > 5:
+        success_chance = min(0.10, success_chance)
+
+    # Ensure chance is between 0.05 and 0.90 (always at least 5% chance, never more than 90%)
+    success_chance = max(0.05, min(0.90, success_chance))
+
+    return base_chance, dexterity_mod, defender_zoc_penalty, path_zoc_penalty, distance_penalty, success_chance
+
+
+class FieldGoalTable:
+    """Line-of-shot bitboards from every square to both hoops of one grid size"""
+
+    def __init__(self, width, height):
+        """Precompute the lines of shot for a grid
+
+        Args:
+            width: Number of columns
+            height: Number of rows
+        """
+        self.width = width
+        self.height = height
+
+        # hoop_y -> per-cell (distance, bitboard of the squares between the cell and the hoop)
+        self.lines = {}
+        for hoop_y in {0, height - 1}:
+            hoop_pos = self.hoop_position(hoop_y)
+            shots = []
+            for y in range(height):
+                for x in range(width):
+                    mask = 0
+                    for px, py in line_of_shot((x, y), hoop_pos)[1:-1]:
+                        mask |= 1 << (py * width + px)
+                    distance = abs(hoop_pos[0] - x) + abs(hoop_pos[1] - y)
+                    shots.append((distance, mask))
+            self.lines[hoop_y] = shots
+
+    def hoop_position(self, hoop_y):
+        """Get the hoop in the end zone on a given row"""
+        return (self.width // 2, hoop_y)
+
+    def evaluate(self, grid, kicker, hoop_y):
+        """Evaluate a field goal from the kicker's square against the live board
+
+        Args:
+            grid: The grid the kicker stands on
+            kicker: The goblin taking the shot
+            hoop_y: Row of the hoop being aimed at
+
+        Returns:
+            dict: The distance, the chance components and the final "success_chance"
+        """
+        x, y = kicker.position
+        distance, mask = self.lines[hoop_y][y * self.width + x]
+
+        defender_zoc_count = grid.zone_count(kicker.position, kicker.team)
+        path_zoc_count = bin(grid.zones.opponent_area(kicker.team) & mask).count("1")
+
+        dexterity = getattr(kicker, 'agility', 5)  # Using agility as dexterity
+        base, dexterity_mod, defender_penalty, path_penalty, distance_penalty, chance = \
+            field_goal_chance(distance, dexterity, defender_zoc_count, path_zoc_count)
+
+        return {
+            "distance": distance,
+            "hoop": self.hoop_position(hoop_y),
+            "base_chance": base,
+            "dexterity_mod": dexterity_mod,
+            "defender_zoc_count": defender_zoc_count,
+            "defender_zoc_penalty": defender_penalty,
+            "path_zoc_count": path_zoc_count,
+            "path_zoc_penalty": path_penalty,
+            "distance_penalty": distance_penalty,
+            "success_chance": chance
+        }
+
+
+_tables = {}
+
+
+def get_field_goal_table(width, height):
+    """Get the shared line-of-shot table for a grid size, building it on first use"""
+    table = _tables.get((width, height))
+    if table is None:
+        table = FieldGoalTable(width, height)
+        _tables[(width, height)] = table
+    return table
+
+
+def evaluate_field_goal(game, kicker):
+    """Evaluate a field goal by a goblin at the hoop its team attacks
+
+    Args:
+        game: The game being played
+        kicker: The goblin taking the shot
+
+    Returns:
+        dict: See FieldGoalTable.evaluate
+    """
+    grid = game.grid
+
+    # Team 1 shoots at the top hoop, team 2 at the bottom one
+    hoop_y = 0 if kicker.team == game.team1 else grid.height - 1
+
+    return get_field_goal_table(grid.width, grid.height).evaluate(grid, kicker, hoop_y)
@@ -0,0 +1,423 @@
+"""
+Game state for Goblinball
+This module holds the Game class, which owns the grid, teams and rule systems.
+It has no rendering dependencies so it can be driven headlessly.
+"""
+
+import os
+import time
+import random
+from config import CONFIG
+from event import EventManager, TouchdownEvent, FieldGoalEvent
+from logger import DEBUG
+from animation import AnimationManager
+from movement_system import MovementSystem
+from carrier_movement import CarrierMovement
+from blocker_movement import BlockerMovement
+from ai_goals import AIGoalSystem, MovementStyleSelector
+from grid import Grid
+from roster import Roster
+from replay import ReplayWriter, ReplayReader, ReplayPlayer
+from team import Team
+from goblin import Goblin
+from history import TurnHistory, POSITION, ON_GRID, KNOCKED_DOWN, MOVEMENT, HAS_BALL, TRAIL
+from game_controller import GameController
+
+class Game:
+    def __init__(self, team1, team2, config=None, seed=None, record=True, grid_size=None):
+        """Initialize a new game between two teams
+        
+        Args:
+            team1: First team
+            team2: Second team
+            config: Unused, the global CONFIG is always used
+            seed: Seed for the game's random stream, or None to draw one from the random module
+            record: Write a replay of the game when the "replay_dir" config value is set
+            grid_size: Width and height of the field, or None for the "grid_size" config value
+        """
+        # Configuration
+        self.config = CONFIG
+        
+        # Every rule and AI roll comes from this stream, so a game replays exactly from its seed
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        
+        # Teams
+        self.team1 = team1
+        self.team2 = team2
+        
+        # Every goblin in the game by slot, for history, replays and the simulation thread
+        self.roster = Roster([team1, team2])
+        
+        # Field
+        self.grid_size = grid_size or CONFIG.get("grid_size", 10)
+        self.grid = Grid(self.grid_size, self.grid_size, debug=CONFIG.get("grid_consistency_checks", False))
+        
+        # Game state
+        self.current_play = 0
+        self.max_plays = CONFIG.get("plays_per_game", 20)
+        self.turn = 0
+        self.play_complete = False
+        self.game_complete = False
+        self.auto_advance = False
+        self.turn_delay = 0.5  # Seconds between automatic turns
+        self.last_turn_time = time.time()
+        
+        # Turn history for Previous Turn functionality
+        self.turn_history = TurnHistory(self, CONFIG.get("turn_history_size", 1000))
+        self.current_history_index = -1  # -1 means we're at the current state
+        
+        # ReplayPlayer when the game shows a recorded match instead of playing one
+        self.replay = None
+        
+        # Simulation when the game shows a live game played on a worker thread
+        self.simulation = None
+        
+        # Role assignment
+        self.offense_team = team1
+        self.defense_team = team2
+        self.offense_team.is_offense = True
+        
+        # Events and logs
+        self.event_manager = EventManager()
+        
+        # Animation system
+        self.animation_manager = AnimationManager()
+        
+        # Movement systems
+        self.movement_system = MovementSystem(self)
+        self.carrier_movement = CarrierMovement(self, self.movement_system)
+        self.blocker_movement = BlockerMovement(self, self.movement_system)
+        
+        # AI systems
+        self.goal_system = AIGoalSystem(self)
+        self.style_selector = MovementStyleSelector(self)
+        
+        # Game-specific stats that don't persist to team/goblin records
+        self.game_stats = {
+            "longest_play_turns": 0,
+            "most_blocks_in_play": 0,
+            "injuries_this_game": 0
+        }
+        
+        # For each new game, reset team scores but preserve stats
+        self.team1.score = 0
+        self.team2.score = 0
+        
+        # Reset carrier tracking for new game
+        self.team1.carrier_rotation_counter = 0
+        self.team2.carrier_rotation_counter = 0
+        self.team1.carrier_history = []
+        self.team2.carrier_history = []
+        
+        # Movement trail tracking
+        self.movement_trails = {}  # Dictionary to store recent positions of goblins
+        self.trail_length = 5  # Number of previous positions to track
+        self.max_turn_movement = 3  # Maximum number of moves a goblin can make in a turn
+        
+        # Record the game to a replay file when a replay directory is configured.
+        # The file is opened by the first play (see open_replay) and finished by close()
+        replay_dir = CONFIG.get("replay_dir")
+        self.replay_path = os.path.join(replay_dir, f"goblinball_{self.seed}.gbr") if record and replay_dir else None
+        
+        # Create the game controller
+        self.controller = GameController(self)
+        
+        DEBUG.log("Game initialized with teams: %s vs %s", team1.name, team2.name)
+        
+        # Position the teams on the field
+        self.controller.position_teams()
+    
+    def update_movement_trail(self, goblin, new_position):
+        """Update the movement trail for a goblin after it moves"""
+        if goblin.id not in self.movement_trails:
+            self.movement_trails[goblin.id] = []
+            
+        # Add new position to the trail
+        self.movement_trails[goblin.id].append(new_position)
+        
+        # Keep only the most recent positions
+        if len(self.movement_trails[goblin.id]) > self.trail_length:
+            self.movement_trails[goblin.id].pop(0)
+            
+    def get_movement_trail(self, goblin):
+        """Get the movement trail for a goblin"""
+        return self.movement_trails.get(goblin.id, [])
+    
+    def score_touchdown(self, carrier):
+        """Score a touchdown
+        
+        Args:
+            carrier: The carrier goblin who scored
+        """
+        if not carrier or not carrier.has_ball:
+            return
+            
+        # Award points to the carrier's team
+        touchdown_points = self.config.get("touchdown_points", 3)
+        carrier.team.score += touchdown_points
+        
+        # Update stats
+        carrier.stats["touchdowns"] += 1
+        carrier.stats["career_touchdowns"] += 1
+        carrier.team.stats["touchdowns"] += 1
+        
+        # Log the event
+        self.event_manager.emit(TouchdownEvent, carrier, touchdown_points, carrier.position)
+        
+        # End the play
+        self.end_play()
+        
+    def score_field_goal(self, carrier):
+        """Score a field goal
+        
+        Args:
+            carrier: The carrier goblin who scored
+        """
+        if not carrier or not carrier.has_ball:
+            return
+            
+        # Award points to the carrier's team
+        field_goal_points = self.config.get("field_goal_points", 1)
+        carrier.team.score += field_goal_points
+        
+        # Update stats
+        carrier.stats["field_goals"] += 1
+        carrier.team.stats["field_goals"] += 1
+        
+        # Log the event
+        self.event_manager.emit(FieldGoalEvent, carrier, field_goal_points, carrier.position)
+        
+        # End the play
+        self.end_play()
+    
+    def start_play(self):
+        """Start a new play"""
+        self.controller.start_play()
+    
+    def process_turn(self):
+        """Process a single turn of the game"""
+        return self.controller.process_turn()
+    
+    def end_play(self):
+        """End the current play and swap offense/defense"""
+        self.controller.end_play()
+        
+        # After each play is over, swap offense and defense
+        # for the next play if the game isn't over
+        if not self.game_complete:
+            temp = self.offense_team
+            self.offense_team = self.defense_team
+            self.defense_team = temp
+            
+            # Update is_offense flags
+            self.offense_team.is_offense = True
+            self.defense_team.is_offense = False
+    
+    def end_game(self):
+        """End the game"""
+        self.controller.end_game()
+    
+    def auto_advance_turns(self):
+        """Auto-advance turns if enough time has passed"""
+        command = None
+        if self.simulation is not None:
+            from simulation_thread import ADVANCE
+            command = ADVANCE
+        return self.controller.auto_advance_turns(command)
+        
+    def get_ball_carrier(self):
+        """Get the current ball carrier from the offense team
+        
+        Returns:
+            Goblin or None: The current ball carrier, or None if no carrier
+        """
+        return self.offense_team.get_carrier()
+        
+    def turn_movement_count(self, goblin):
+        """Get the number of moves a goblin has made in the current turn
+        
+        Args:
+            goblin: The goblin to check
+            
+        Returns:
+            int: Number of moves in the current turn
+        """
+        # Default to 1 move per turn if not tracking
+        return 1
+    
+    def open_replay(self):
+        """Start writing the replay file if the game records one and hasn't started it"""
+        if self.replay_path is not None and self.event_manager.sink is None:
+            self.event_manager.sink = ReplayWriter(self.replay_path, self)
+            
+    def close(self):
+        """Stop the game's worker thread, if any, and finish its replay file
+        
+        Safe to call more than once, and on games that were abandoned part way
+        or stopped by an exception - their replay ends at the last event written.
+        """
+        if self.simulation is not None:
+            self.simulation.stop()
+        self.event_manager.close()
+        
+    @classmethod
+    def from_replay(cls, path):
+        """Build a game that shows a recorded match, starting at its first play
+        
+        Args:
+            path: Replay file written by ReplayWriter
+            
+        Returns:
+            Game: A game whose turn controls step through the recording
+        """
+        reader = ReplayReader(path)
+        
+        teams = []
+        for team_info in reader.teams:
+            team = Team(team_info["name"], team_info["color"])
+            for info in team_info["goblins"]:
+                team.add_goblin(Goblin(info["name"], info["strength"], info["toughness"],
+                                       info["movement"], info["agility"]))
+            teams.append(team)
+            
+        game = cls(teams[0], teams[1], seed=reader.seed, record=False, grid_size=reader.width)
+        game.trail_length = reader.trail_length
+        game.replay = ReplayPlayer(game, reader)
+        game.replay.show(0)
+        return game
+        
+    def run_on_worker(self):
+        """Play this game on a worker thread, shown in a copy the render thread can draw
+        
+        Returns:
+            Game: A game holding copies of both teams, whose turn controls ask the
+                  worker for turns and show each one once it is played
+        """
+        # Only the viewer plays on a worker, so headless games never load the thread module
+        from simulation_thread import Simulation
+        
+        teams = []
+        for team in self.roster.teams:
+            team_copy = Team(team.name, team.color)
+            for goblin in team.goblins:
+                team_copy.add_goblin(Goblin(goblin.name, goblin.strength, goblin.toughness,
+                                            goblin.max_movement, goblin.agility))
+            teams.append(team_copy)
+            
+        view = Game(teams[0], teams[1], seed=self.seed, record=False, grid_size=self.grid_size)
+        view.trail_length = self.trail_length
+        view.turn_delay = self.turn_delay
+        view.simulation = Simulation(view, self, CONFIG.get("simulation_lookahead", 1))
+        view.simulation.show(view.simulation.capture())
+        return view
+        
+    def next_turn(self):
+        """Process the next turn"""
+        # A recorded match steps through its recording instead
+        if self.replay is not None:
+            return self.replay.step(1)
+            
+        # If we're viewing history, move forward in history
+        if self.current_history_index >= 0:
+            self.current_history_index -= 1
+            if self.current_history_index >= 0:
+                # Restore state from history
+                self.restore_state_from_history(self.current_history_index)
+            else:
+                # Back to current state
+                self.restore_current_state()
+            return True
+            
+        # The worker plays the turn, and it is saved to history when it is shown
+        if self.simulation is not None:
+            return self.simulation.advance()
+            
+        # Save current state to history before processing next turn
+        self.save_state_to_history()
+        
+        # Process the turn
+        return self.process_turn()
+    
+    def previous_turn(self):
+        """Go back to the previous turn"""
+        if self.replay is not None:
+            return self.replay.step(-1)
+            
+        # If we're already at the earliest saved turn, do nothing
+        if self.current_history_index >= len(self.turn_history) - 1:
+            return False
+            
+        # If we're at current state, save it first
+        if self.current_history_index == -1:
+            self.save_current_state()
+            
+        # Move back in history
+        self.current_history_index += 1
+        
+        # Restore state from history
+        self.restore_state_from_history(self.current_history_index)
+        return True
+    
+    def save_state_to_history(self):
+        """Save the current game state to history"""
+        self.turn_history.record()
+    
+    def save_current_state(self):
+        """Save the current state for returning to it later"""
+        self.turn_history.start_browsing()
+    
+    def restore_state_from_history(self, index):
+        """Restore a game state from history
+        
+        Args:
+            index: The index in history to restore from
+        """
+        if index < 0 or index >= len(self.turn_history):
+            return
+            
+        self.apply_history_snapshot(self.turn_history.seek(index))
+    
+    def restore_current_state(self):
+        """Restore the current game state"""
+        self.apply_history_snapshot(self.turn_history.seek(-1))
+            
+        # Reset history index
+        self.current_history_index = -1
+        
+    def apply_history_snapshot(self, snapshot):
+        """Bring the goblins whose rows changed in step with a history snapshot
+        
+        Args:
+            snapshot: (turn, play, {slot: row}) from TurnHistory.seek, or None
+        """
+        if snapshot is None:
+            return
+            
+        turn, play, changes = snapshot
+        
+        # Restore turn and play
+        self.turn = turn
+        self.current_play = play
+        
+        # Lift every changed goblin off the grid first, so goblins can swap squares
+        goblins = self.roster.goblins
+        for slot in changes:
+            if goblins[slot] in self.grid.positions:
+                self.grid.remove_entity(goblins[slot])
+                
+        # Restore goblin positions and states
+        for slot, row in changes.items():
+            goblin = goblins[slot]
+            goblin.knocked_down = row[KNOCKED_DOWN]
+            goblin.movement = row[MOVEMENT]
+            goblin.has_ball = row[HAS_BALL]
+            goblin.position = row[POSITION]
+            if row[ON_GRID]:
+                self.grid.place_entity(goblin, row[POSITION])
+                
+            # Restore movement trail
+            if row[TRAIL] is None:
+                self.movement_trails.pop(goblin.id, None)
+            else:
+                self.movement_trails[goblin.id] = list(row[TRAIL])
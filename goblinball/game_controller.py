@@ -7,6 +7,10 @@ import random
 import time
 import logging
 from utils import manhattan_distance
+from event import (
+    PlayStartEvent, PlayEndEvent, GameEndEvent, TurnStartEvent, TurnEndEvent,
+    TurnLimitEvent, TouchdownEvent, FieldGoalEvent
+)
 
 logger = logging.getLogger("goblinball.controller")
 
@@ -46,12 +50,12 @@ class GameController:
         # Position teams
         self.position_teams()
         
+        # The replay file starts with the first play
+        self.game.open_replay()
+        
         # Log the play start
-        self.game.event_manager.create_and_dispatch("play_start", {
-            "play_number": self.game.current_play,
-            "offense_team": self.game.offense_team.name,
-            "carrier": self.game.offense_team.get_carrier().name
-        })
+        self.game.event_manager.emit(PlayStartEvent, self.game.current_play, self.game.offense_team,
+                                     self.game.offense_team.get_carrier())
     
     def position_teams(self):
         """Position the teams on the field for the start of a play"""
@@ -123,10 +127,10 @@ class GameController:
         logger.info(f"Offense Team: {self.game.offense_team.name}, Defense Team: {self.game.defense_team.name}")
         
         # Log turn start
-        self.game.event_manager.create_and_dispatch("turn_start", {
-            "turn": self.game.turn,
-            "play": self.game.current_play
-        })
+        self.game.event_manager.emit(TurnStartEvent, self.game.turn, self.game.current_play)
+        
+        # Paths cached during the previous turn no longer apply
+        self.game.movement_system.clear_path_cache()
         
         # Reset movement points for all goblins at the start of each turn
         for team in [self.game.team1, self.game.team2]:
@@ -136,9 +140,7 @@ class GameController:
         
         # Check for turn limit
         if self.game.turn > max_turns:
-            self.game.event_manager.create_and_dispatch("turn_limit_reached", {
-                "max_turns": max_turns
-            })
+            self.game.event_manager.emit(TurnLimitEvent, max_turns)
             logger.info(f"Turn limit of {max_turns} reached. Ending play.")
             self.end_play()
             return True
@@ -169,11 +171,12 @@ class GameController:
             if not goblin.knocked_down and not goblin.unavailable:
                 self.game.blocker_movement.move_blocker(goblin)
                 
+        # In debug mode, make sure goblin positions still agree with the grid
+        if self.game.grid.debug:
+            self.game.grid.reconcile_positions()
+                
         # Log turn end
-        self.game.event_manager.create_and_dispatch("turn_end", {
-            "turn": self.game.turn,
-            "play": self.game.current_play
-        })
+        self.game.event_manager.emit(TurnEndEvent, self.game.turn, self.game.current_play)
         
         return True
     
@@ -222,14 +225,7 @@ class GameController:
         carrier.team.stats["touchdowns"] += 1
         
         # Log the event
-        self.game.event_manager.create_and_dispatch("touchdown", {
-            "carrier_id": carrier.id,
-            "carrier_name": carrier.name,
-            "team_id": carrier.team.id,
-            "team_name": carrier.team.name,
-            "points": touchdown_points,
-            "position": carrier.position
-        })
+        self.game.event_manager.emit(TouchdownEvent, carrier, touchdown_points, carrier.position)
         
         # End the play
         self.end_play()
@@ -254,14 +250,7 @@ class GameController:
         carrier.team.stats["field_goals"] += 1
         
         # Log the event
-        self.game.event_manager.create_and_dispatch("field_goal", {
-            "carrier_id": carrier.id,
-            "carrier_name": carrier.name,
-            "team_id": carrier.team.id,
-            "team_name": carrier.team.name,
-            "points": field_goal_points,
-            "position": carrier.position
-        })
+        self.game.event_manager.emit(FieldGoalEvent, carrier, field_goal_points, carrier.position)
         
         # End the play
         self.end_play()
@@ -287,13 +276,9 @@ class GameController:
         logger.info(f"Score: {self.game.team1.name} {self.game.team1.score} - {self.game.team2.score} {self.game.team2.name}")
         
         # Log the play end
-        self.game.event_manager.create_and_dispatch("play_end", {
-            "play_number": self.game.current_play,
-            "turns": self.game.turn,
-            "score": {
-                self.game.team1.name: self.game.team1.score,
-                self.game.team2.name: self.game.team2.score
-            }
+        self.game.event_manager.emit(PlayEndEvent, self.game.current_play, self.game.turn, {
+            self.game.team1.name: self.game.team1.score,
+            self.game.team2.name: self.game.team2.score
         })
         
         # Update stats
@@ -309,29 +294,24 @@ class GameController:
         
         # Determine winner
         if self.game.team1.score > self.game.team2.score:
-            winner = self.game.team1
             winner_name = self.game.team1.name
         elif self.game.team2.score > self.game.team1.score:
-            winner = self.game.team2
             winner_name = self.game.team2.name
         else:
-            winner = None  # Tie
             winner_name = "Tie"
             
         logger.info("===== GAME OVER =====")
         logger.info(f"Final Score: {self.game.team1.name} {self.game.team1.score} - {self.game.team2.score} {self.game.team2.name}")
         logger.info(f"Winner: {winner_name}")
         
-        # Log the game end
-        self.game.event_manager.create_and_dispatch("game_end", {
-            "winner": winner_name,
-            "winner_team": winner,
-            "score": {
+        # Log the game end, and finish the replay even if a listener fails
+        try:
+            self.game.event_manager.emit(GameEndEvent, winner_name, {
                 self.game.team1.name: self.game.team1.score,
                 self.game.team2.name: self.game.team2.score
-            },
-            "plays": self.game.current_play
-        })
+            }, self.game.current_play)
+        finally:
+            self.game.event_manager.close()
         
         # Update team stats
         self.game.team1.update_stats(self.game.team2.score)
@@ -342,15 +322,24 @@ class GameController:
             for goblin in team.goblins:
                 goblin.add_game_stats_to_career()
     
-    def auto_advance_turns(self):
+    def auto_advance_turns(self, command=None):
         """Auto-advance turns if enough time has passed
         
+        Args:
+            command: Command to send the simulation thread, when one plays the game
+            
         Returns:
             bool: True if a turn was advanced, False otherwise
         """
         if self.game.auto_advance and time.time() - self.last_turn_time > self.game.turn_delay:
             self.last_turn_time = time.time()
             
+            if self.game.replay is not None:
+                return self.game.replay.step(1)
+            
+            if self.game.simulation is not None:
+                return self.game.simulation.advance(command)
+            
             if self.game.play_complete:
                 if not self.game.game_complete:
                     self.start_play()
@@ -1,11 +1,47 @@
+import os
 import uuid
 import random
 import time
 from config import CONFIG
 from utils import weighted_choice, distance
 
-def generate_goblin_name(names_file="names.txt"):
-    """Generate a unique goblin name with prefix, suffix, surname, and optional title"""
+# Surnames by resolved file path, read once per process
+_name_corpora = {}
+
+def load_name_corpus(names_file="names.txt"):
+    """Load the surnames in a names file, reading it only the first time
+    
+    Args:
+        names_file: File of surnames, relative to this module unless absolute
+        
+    Returns:
+        tuple: Every whitespace-separated name in the file, empty if it is missing
+    """
+    # Names file lives next to this module unless an absolute path is given
+    if not os.path.isabs(names_file):
+        names_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), names_file)
+        
+    corpus = _name_corpora.get(names_file)
+    if corpus is None:
+        try:
+            with open(names_file, 'r') as f:
+                # Split each line by spaces or tabs and keep the non-empty words
+                corpus = tuple(f.read().split())
+        except FileNotFoundError:
+            corpus = ()
+            print(f"Warning: Names file '{names_file}' not found")
+        _name_corpora[names_file] = corpus
+        
+    return corpus
+
+def generate_goblin_name(names_file="names.txt", rng=None):
+    """Generate a unique goblin name with prefix, suffix, surname, and optional title
+    
+    Args:
+        names_file: File of surnames, relative to this module unless absolute
+        rng: random.Random to draw from, or None for the random module
+    """
+    rng = rng or random
     
     # 20 colorful goblin name prefixes
     prefixes = [
@@ -24,30 +60,15 @@ def generate_goblin_name(names_file="names.txt"):
              "the Cunning", "the Mighty", "the Fierce", "the Sneaky"]
     
     # Generate first part of name
-    first_name = random.choice(prefixes) + random.choice(suffixes)
+    first_name = rng.choice(prefixes) + rng.choice(suffixes)
     
-    # Load a random surname from external file
-    try:
-        with open(names_file, 'r') as f:
-            # Read all lines and split them into individual words
-            all_names = []
-            for line in f:
-                # Split the line by spaces or tabs and add each non-empty word
-                names_in_line = [name.strip() for name in line.split() if name.strip()]
-                all_names.extend(names_in_line)
-            
-            if all_names:
-                surname = random.choice(all_names)
-            else:
-                surname = ""  # Fallback if file is empty
-    except FileNotFoundError:
-        # Fallback if file doesn't exist
-        surname = ""
-        print(f"Warning: Names file '{names_file}' not found")
+    # Pick a random surname from the names file
+    all_names = load_name_corpus(names_file)
+    surname = rng.choice(all_names) if all_names else ""  # Fallback if file is empty or missing
     
     # Decide whether to include title and surname
-    include_title = random.random() < 0.25  # 25% chance of having a title
-    include_surname = bool(surname) and random.random() < 0.4  # 40% chance of surname if available
+    include_title = rng.random() < 0.25  # 25% chance of having a title
+    include_surname = bool(surname) and rng.random() < 0.4  # 40% chance of surname if available
     
     # Assemble the full name
     name = first_name
@@ -56,27 +77,33 @@ def generate_goblin_name(names_file="names.txt"):
         name += f" {surname}"
         
     if include_title:
-        name += f" {random.choice(titles)}"
+        name += f" {rng.choice(titles)}"
         
     return name
 
 class Goblin:
-    def __init__(self, name=None, strength=None, toughness=None, movement=None, agility=None):
+    def __init__(self, name=None, strength=None, toughness=None, movement=None, agility=None, rng=None):
+        # Stats are rolled from the given random.Random, or the random module
+        rng = rng or random
+        
         # Identity
-        self.name = name or generate_goblin_name()
+        self.name = name or generate_goblin_name(rng=rng)
         self.id = str(uuid.uuid4())
         
         # Base stats - randomly generated if not provided
-        self.strength = strength or random.randint(CONFIG.get("min_strength", 1), CONFIG.get("max_strength", 10))
-        self.toughness = toughness or random.randint(CONFIG.get("min_toughness", 1), CONFIG.get("max_toughness", 10))
-        self.movement = movement or random.randint(CONFIG.get("min_movement", 1), CONFIG.get("max_movement", 4))
+        self.strength = strength or rng.randint(CONFIG.get("min_strength", 1), CONFIG.get("max_strength", 10))
+        self.toughness = toughness or rng.randint(CONFIG.get("min_toughness", 1), CONFIG.get("max_toughness", 10))
+        self.movement = movement or rng.randint(CONFIG.get("min_movement", 1), CONFIG.get("max_movement", 4))
         self.max_movement = self.movement  # To reset each turn
-        self.agility = agility or random.randint(1, 10)  # New agility attribute
+        self.agility = agility or rng.randint(1, 10)  # New agility attribute
+        
+        # Grid the goblin is standing on, set by Grid.place_entity
+        self.grid = None
         
         # Current state
         self.position = (0, 0)  # (x, y) coordinates
         self.has_ball = False
-        self.knocked_down = False
+        self._knocked_down = False
         self.momentum = 0
         
         # Carrier tracking
@@ -85,6 +112,9 @@ class Goblin:
         # Team reference
         self.team = None
         
+        # Slot in the game's Roster, set when a game adds the goblin
+        self.slot = None
+        
         # Game status
         self.out_of_game = False
         self.season_injury = False
@@ -93,7 +123,7 @@ class Goblin:
         self.unavailable = False
         
         # Phase 3: Combat Stats
-        self.injury_resistance = random.randint(0, 2)  # Bonus to injury rolls
+        self.injury_resistance = rng.randint(0, 2)  # Bonus to injury rolls
         
         # Statistics - preserved between games for season tracking
         self.stats = {
@@ -116,16 +146,33 @@ class Goblin:
             "injuries_suffered": 0
         }
         
-    def block(self, target):
-        """Attempt to block another goblin
+    @property
+    def knocked_down(self):
+        """Whether the goblin is lying on the ground"""
+        return self._knocked_down
+        
+    @knocked_down.setter
+    def knocked_down(self, value):
+        """Knock the goblin down or stand it up, keeping the grid's zones of control in step"""
+        if value == self._knocked_down:
+            return
+            
+        self._knocked_down = value
+        if self.grid is not None:
+            self.grid.update_standing(self)
+        
+    def block(self, target, rng=None):
+        """Attempt to block another goblin, rolling with rng (default: the random module)
         Returns a dictionary with the result of the block"""
+        rng = rng or random
+        
         # Update stats
         self.stats["blocks_attempted"] += 1
         target.stats["times_blocked"] += 1
         
         # Roll dice for both goblins
-        blocker_roll = random.randint(1, 10)
-        target_roll = random.randint(1, 10)
+        blocker_roll = rng.randint(1, 10)
+        target_roll = rng.randint(1, 10)
         
         # Apply strength and agility
         blocker_total = blocker_roll + self.strength
@@ -142,7 +189,7 @@ class Goblin:
             result = "knockdown_with_injury"
             target.knocked_down = True
             self.stats["blocks_successful"] += 1
-            self.perform_injury_check(target)
+            self.perform_injury_check(target, rng)
         elif margin > 0:
             # Regular success - knockdown
             result = "knockdown"
@@ -170,11 +217,14 @@ class Goblin:
             "target_roll": target_roll
         }
     
-    def perform_injury_check(self, target):
-        """Perform an injury check on the target when a block is very successful
+    def perform_injury_check(self, target, rng=None):
+        """Perform an injury check on the target when a block is very successful,
+        rolling with rng (default: the random module)
         Returns the result of the injury check"""
+        rng = rng or random
+        
         # Roll for injury
-        injury_roll = random.randint(1, 10)
+        injury_roll = rng.randint(1, 10)
         
         # Apply toughness and injury resistance
         injury_threshold = 5 + target.toughness // 3 + target.injury_resistance
@@ -191,12 +241,12 @@ class Goblin:
             return "minor_injury"
         else:
             # Major injury - miss multiple plays
-            target.misses_plays = random.randint(2, 3)
+            target.misses_plays = rng.randint(2, 3)
             target.stats["injuries_suffered"] += 1
             self.stats["injuries_caused"] += 1
             
             # Check for career-ending injury
-            if injury_roll == 1 and random.random() < 0.2:
+            if injury_roll == 1 and rng.random() < 0.2:
                 target.out_of_game = True
                 return "career_ending_injury"
             
@@ -1,5 +1,6 @@
 import pygame
 import math
+from text_cache import TEXT
 
 class GoblinRenderer:
     """Renders goblins on the game grid"""
@@ -20,15 +21,23 @@ class GoblinRenderer:
         
         # Fonts
         self.fonts = {
-            "tiny": pygame.font.SysFont(None, 12),
-            "small": pygame.font.SysFont(None, 14),
-            "medium": pygame.font.SysFont(None, 18, bold=True),
-            "large": pygame.font.SysFont(None, 22, bold=True),
+            "tiny": TEXT.font(None, 12),
+            "small": TEXT.font(None, 14),
+            "medium": TEXT.font(None, 18, bold=True),
+            "large": TEXT.font(None, 22, bold=True),
         }
         
         # Load or create goblin images
         self.load_goblin_images()
         
+        # Every goblin's movement trail, drawn onto one field-sized layer that is
+        # only redrawn when a trail changes
+        self.trail_layer = None
+        self.trail_layer_key = None
+        
+        # Arrowhead sprites by (direction, color, size)
+        self.arrow_heads = {}
+        
     def load_goblin_images(self):
         """Load or create goblin images for different states"""
         self.goblin_images = {}
@@ -47,7 +56,7 @@ class GoblinRenderer:
         pygame.draw.ellipse(red_knocked, (255, 255, 255), 
                          (self.cell_size//4, self.cell_size//2 - self.cell_size//6, 
                           self.cell_size//2, self.cell_size//3), 2)
-        red_font = pygame.font.SysFont(None, 20)
+        red_font = TEXT.font(None, 20)
         ko_text = red_font.render("K.O.", True, (255, 255, 255))
         ko_rect = ko_text.get_rect(center=(self.cell_size//2, self.cell_size//4))
         red_knocked.blit(ko_text, ko_rect)
@@ -75,7 +84,7 @@ class GoblinRenderer:
         pygame.draw.ellipse(blue_knocked, (255, 255, 255), 
                          (self.cell_size//4, self.cell_size//2 - self.cell_size//6, 
                           self.cell_size//2, self.cell_size//3), 2)
-        blue_font = pygame.font.SysFont(None, 20)
+        blue_font = TEXT.font(None, 20)
         ko_text = blue_font.render("K.O.", True, (255, 255, 255))
         ko_rect = ko_text.get_rect(center=(self.cell_size//2, self.cell_size//4))
         blue_knocked.blit(ko_text, ko_rect)
@@ -99,6 +108,9 @@ class GoblinRenderer:
             offset_y: The y offset for drawing
             selected_goblin: The currently selected goblin or None
         """
+        # Draw movement trails under the goblins
+        self.draw_trail_layer(screen, offset_x, offset_y)
+        
         for team in [self.game.team1, self.game.team2]:
             for goblin in team.goblins:
                 # Skip goblins that are out of the game
@@ -110,11 +122,6 @@ class GoblinRenderer:
                 screen_x = offset_x + x * self.cell_size + self.cell_size // 2
                 screen_y = offset_y + y * self.cell_size + self.cell_size // 2
                 
-                # Draw movement trail if available
-                trail = self.game.get_movement_trail(goblin)
-                if trail and len(trail) > 1:
-                    self.draw_movement_trail(screen, offset_x, offset_y, goblin, trail)
-                
                 # Determine goblin color
                 if goblin.knocked_down:
                     color = self.colors["knocked_down"]
@@ -131,6 +138,49 @@ class GoblinRenderer:
                 # Draw the goblin
                 self.draw_goblin(screen, screen_x, screen_y, goblin, color)
     
+    def dirty_rects(self, regions, offset_x, offset_y, selected_goblin=None):
+        """Report the areas of goblins that moved or changed since the last frame
+        
+        Args:
+            regions: The DirtyRegions shared by the renderers
+            offset_x: The x offset for drawing
+            offset_y: The y offset for drawing
+            selected_goblin: The currently selected goblin or None
+            
+        Returns:
+            list: Rects that changed, covering each changed goblin's old and new area
+        """
+        rects = []
+        for team in [self.game.team1, self.game.team2]:
+            for goblin in team.goblins:
+                trail = self.game.get_movement_trail(goblin)
+                key = (goblin.position, goblin.knocked_down, goblin.has_ball, goblin.movement,
+                       goblin.strength, goblin.toughness, tuple(trail), goblin == selected_goblin)
+                rect = None if goblin.out_of_game else self.goblin_bounds(goblin, trail, offset_x, offset_y)
+                rects.extend(regions.check(("goblin", goblin.id), key, rect))
+        return rects
+        
+    def goblin_bounds(self, goblin, trail, offset_x, offset_y):
+        """Screen area a goblin can draw on: its body, stats line, selection ring and trail
+        
+        Returns:
+            pygame.Rect: The area
+        """
+        cell_size = self.cell_size
+        x, y = goblin.position
+        center_x = offset_x + x * cell_size + cell_size // 2
+        center_y = offset_y + y * cell_size + cell_size // 2
+        
+        # The stats line under the goblin is wider than small cells
+        half_width = max(cell_size // 2 + 4, 40)
+        rect = pygame.Rect(center_x - half_width, center_y - cell_size // 2 - 4, half_width * 2, cell_size + 24)
+        
+        if len(trail) > 1:
+            xs = [offset_x + tx * cell_size + cell_size // 2 for tx, _ in trail]
+            ys = [offset_y + ty * cell_size + cell_size // 2 for _, ty in trail]
+            rect.union_ip(pygame.Rect(min(xs) - 8, min(ys) - 8, max(xs) - min(xs) + 16, max(ys) - min(ys) + 16))
+        return rect
+        
     def draw_goblin(self, screen, x, y, goblin, color):
         """Draw a single goblin
         
@@ -178,23 +228,50 @@ class GoblinRenderer:
             pygame.draw.circle(screen, self.colors["ball"], (ball_x, ball_y), radius // 2)
         
         # Draw initial of goblin name
-        text = self.fonts["small"].render(goblin.name[0], True, self.colors["text"])
+        text = TEXT.render(self.fonts["small"], goblin.name[0], self.colors["text"])
         text_rect = text.get_rect(center=(x, y))
         screen.blit(text, text_rect)
         
         # Draw stats if hovering/selected
         # (This would normally be linked to mouse position, but here we always show it)
-        stat_text = self.fonts["tiny"].render(f"S{goblin.strength} T{goblin.toughness} M{goblin.movement}", 
-                                           True, self.colors["text"])
+        stat_text = TEXT.render(self.fonts["tiny"], f"S{goblin.strength} T{goblin.toughness} M{goblin.movement}",
+                                self.colors["text"])
         screen.blit(stat_text, (x - stat_text.get_width() // 2, y + radius + 2))
         
-    def draw_movement_trail(self, screen, offset_x, offset_y, goblin, trail):
-        """Draw the movement trail for a goblin
+    def draw_trail_layer(self, screen, offset_x, offset_y):
+        """Draw every goblin's movement trail, redrawing the trail layer only if a trail changed
         
         Args:
             screen: The pygame screen to draw on
             offset_x: The x offset for drawing
             offset_y: The y offset for drawing
+        """
+        trails = []
+        for team in [self.game.team1, self.game.team2]:
+            for goblin in team.goblins:
+                trail = self.game.get_movement_trail(goblin)
+                if not goblin.out_of_game and len(trail) > 1:
+                    trails.append((goblin, tuple(trail)))
+                    
+        key = (self.game.grid.width, self.game.grid.height, self.cell_size,
+               tuple((goblin.team == self.game.team1, trail) for goblin, trail in trails))
+        if key != self.trail_layer_key:
+            size = (self.game.grid.width * self.cell_size, self.game.grid.height * self.cell_size)
+            if self.trail_layer is None or self.trail_layer.get_size() != size:
+                self.trail_layer = pygame.Surface(size, pygame.SRCALPHA)
+            self.trail_layer.fill((0, 0, 0, 0))
+            for goblin, trail in trails:
+                self.draw_movement_trail(self.trail_layer, goblin, trail)
+            self.trail_layer_key = key
+            
+        if trails:
+            screen.blit(self.trail_layer, (offset_x, offset_y))
+            
+    def draw_movement_trail(self, trail_surface, goblin, trail):
+        """Draw the movement trail for a goblin
+        
+        Args:
+            trail_surface: The field-sized surface to draw on
             goblin: The goblin whose trail to draw
             trail: The list of positions in the trail
         """
@@ -205,10 +282,6 @@ class GoblinRenderer:
         # Current turn's movement is the last position (to allow for clear visualization)
         # We'll show the trail from the previous turn's end position to the current position
         
-        # Create trail surface
-        trail_surface = pygame.Surface((self.game.grid.width * self.cell_size, 
-                                     self.game.grid.height * self.cell_size), pygame.SRCALPHA)
-        
         # Choose trail color based on team
         if goblin.team == self.game.team1:
             base_color = (220, 60, 60)  # Brighter red
@@ -265,9 +338,6 @@ class GoblinRenderer:
                 
                 # Small circle at each point
                 pygame.draw.circle(trail_surface, older_color, (start_screen_x, start_screen_y), 3)
-        
-        # Blit the trail surface to the screen
-        screen.blit(trail_surface, (offset_x, offset_y))
     
     def draw_arrow_head(self, surface, from_x, from_y, to_x, to_y, color, size):
         """Draw an arrow head to indicate direction
@@ -281,15 +351,37 @@ class GoblinRenderer:
             color: Arrow color
             size: Size of the arrow head
         """
-        # Calculate direction vector
         dx = to_x - from_x
         dy = to_y - from_y
+        if dx == 0 and dy == 0:
+            return
+            
+        # Moves in the same direction share a sprite, whatever their length
+        step = math.gcd(dx, dy)
+        sprite = self.get_arrow_head(dx // step, dy // step, color, size)
+        
+        # The sprite's centre is the tip of the arrow
+        surface.blit(sprite, (to_x - sprite.get_width() // 2, to_y - sprite.get_height() // 2))
+        
+    def get_arrow_head(self, dx, dy, color, size):
+        """Get the arrow head sprite for a direction, drawing it the first time
         
+        Args:
+            dx: X part of the direction
+            dy: Y part of the direction
+            color: Arrow color
+            size: Size of the arrow head
+            
+        Returns:
+            pygame.Surface: Arrow head with its tip at the centre of the surface
+        """
+        key = (dx, dy, tuple(color), size)
+        sprite = self.arrow_heads.get(key)
+        if sprite is not None:
+            return sprite
+            
         # Normalize
         length = math.sqrt(dx*dx + dy*dy)
-        if length == 0:
-            return
-            
         dx /= length
         dy /= length
         
@@ -297,14 +389,16 @@ class GoblinRenderer:
         px = -dy
         py = dx
         
-        # Calculate arrow head points
-        # At the destination point, draw a triangle
-        point1 = (to_x, to_y)
-        point2 = (to_x - dx*size - px*size/2, to_y - dy*size - py*size/2)
-        point3 = (to_x - dx*size + px*size/2, to_y - dy*size + py*size/2)
+        # Calculate arrow head points around the tip at the centre
+        half = size + 1
+        point1 = (half, half)
+        point2 = (half - dx*size - px*size/2, half - dy*size - py*size/2)
+        point3 = (half - dx*size + px*size/2, half - dy*size + py*size/2)
         
-        # Draw the arrow head
-        pygame.draw.polygon(surface, color, [point1, point2, point3])
+        sprite = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.polygon(sprite, color, [point1, point2, point3])
+        self.arrow_heads[key] = sprite
+        return sprite
 
     def draw_goblins(self, screen, game):
         """Draw all goblins on the screen
@@ -449,9 +543,9 @@ class GoblinRenderer:
         # Prepare the font
         if not hasattr(self, 'fonts'):
             self.fonts = {
-                'small': pygame.font.SysFont('Arial', 14),
-                'medium': pygame.font.SysFont('Arial', 16, bold=True),
-                'large': pygame.font.SysFont('Arial', 18, bold=True)
+                'small': TEXT.font('Arial', 14),
+                'medium': TEXT.font('Arial', 16, bold=True),
+                'large': TEXT.font('Arial', 18, bold=True)
             }
         
         # Title - Goblin ID with team color
@@ -461,7 +555,7 @@ class GoblinRenderer:
             title_color = (150, 150, 255)
             
         title_text = f"{goblin.team.upper()} Goblin #{goblin.id}"
-        title_surface = self.fonts['large'].render(title_text, True, title_color)
+        title_surface = TEXT.render(self.fonts['large'], title_text, title_color)
         info_surface.blit(title_surface, (10, 10))
         
         # Status info
@@ -470,7 +564,7 @@ class GoblinRenderer:
         
         # Position
         pos_text = f"Position: ({goblin.position[0]}, {goblin.position[1]})"
-        pos_surface = self.fonts['small'].render(pos_text, True, (255, 255, 255))
+        pos_surface = TEXT.render(self.fonts['small'], pos_text, (255, 255, 255))
         info_surface.blit(pos_surface, (10, y_offset))
         y_offset += line_height
         
@@ -484,7 +578,7 @@ class GoblinRenderer:
             state_info.append("Active")
             
         state_text = f"State: {', '.join(state_info)}"
-        state_surface = self.fonts['small'].render(state_text, True, (255, 255, 255))
+        state_surface = TEXT.render(self.fonts['small'], state_text, (255, 255, 255))
         info_surface.blit(state_surface, (10, y_offset))
         y_offset += line_height
         
@@ -492,20 +586,20 @@ class GoblinRenderer:
         if hasattr(goblin, 'movement_trail') and goblin.movement_trail:
             move_count = len(goblin.movement_trail)
             move_text = f"Moves made: {move_count}"
-            move_surface = self.fonts['small'].render(move_text, True, (255, 255, 255))
+            move_surface = TEXT.render(self.fonts['small'], move_text, (255, 255, 255))
             info_surface.blit(move_surface, (10, y_offset))
             y_offset += line_height
         
         # Stats
         stats_text = f"Block: {goblin.block_skill}  Dodge: {goblin.dodge_skill}"
-        stats_surface = self.fonts['small'].render(stats_text, True, (255, 255, 255))
+        stats_surface = TEXT.render(self.fonts['small'], stats_text, (255, 255, 255))
         info_surface.blit(stats_surface, (10, y_offset))
         y_offset += line_height
         
         # Recent actions
         y_offset += 5  # Add some space
         recent_title = "Recent Actions:"
-        recent_title_surface = self.fonts['medium'].render(recent_title, True, (200, 200, 200))
+        recent_title_surface = TEXT.render(self.fonts['medium'], recent_title, (200, 200, 200))
         info_surface.blit(recent_title_surface, (10, y_offset))
         y_offset += line_height
         
@@ -542,7 +636,7 @@ class GoblinRenderer:
         
         # Show recent actions (up to 3)
         for i, action in enumerate(recent_actions[:3]):
-            action_surface = self.fonts['small'].render(action, True, (200, 200, 200))
+            action_surface = TEXT.render(self.fonts['small'], action, (200, 200, 200))
             info_surface.blit(action_surface, (20, y_offset))
             y_offset += line_height
         
@@ -2,21 +2,164 @@ import logging
 
 logger = logging.getLogger("goblinball.grid")
 
+class ZoneMap:
+    """
+    Per-team occupancy bitboards and zone-of-control counts for a grid.
+    Cells are indexed as y * width + x. Bitboards are ints with one bit per cell,
+    and the zone-of-control maps count the standing goblins of each team that are
+    adjacent to every cell. Both are updated incrementally as goblins move.
+    """
+    
+    def __init__(self, width, height):
+        """Initialize empty maps for a grid of the specified size"""
+        self.width = width
+        self.height = height
+        
+        # Neighbour indices of every cell, in the same order as the 8-way scans used by the AI
+        self.neighbours = []
+        for y in range(height):
+            for x in range(width):
+                adjacent = []
+                for dx in [-1, 0, 1]:
+                    for dy in [-1, 0, 1]:
+                        if dx == 0 and dy == 0:
+                            continue
+                        nx, ny = x + dx, y + dy
+                        if 0 <= nx < width and 0 <= ny < height:
+                            adjacent.append(ny * width + nx)
+                self.neighbours.append(tuple(adjacent))
+                
+        self.clear()
+        
+    def clear(self):
+        """Remove every goblin from the maps"""
+        self.occupancy = {}  # team -> bitboard of cells holding that team's goblins
+        self.standing = {}  # team -> bitboard of cells holding that team's standing goblins
+        self.team_zoc = {}  # team -> per-cell count of that team's adjacent standing goblins
+        self.zoc_bits = {}  # team -> bitboard of cells where that count is non-zero
+        self.total_zoc = [0] * (self.width * self.height)  # Same count summed over all teams
+        
+    def index(self, position):
+        """Convert an (x, y) position to a cell index"""
+        x, y = position
+        return y * self.width + x
+        
+    def add(self, team, position, standing):
+        """Record a goblin arriving on a cell"""
+        idx = self.index(position)
+        self.occupancy[team] = self.occupancy.get(team, 0) | (1 << idx)
+        if standing:
+            self.set_standing(team, position, True)
+            
+    def remove(self, team, position, standing):
+        """Record a goblin leaving a cell"""
+        idx = self.index(position)
+        self.occupancy[team] = self.occupancy.get(team, 0) & ~(1 << idx)
+        if standing:
+            self.set_standing(team, position, False)
+            
+    def set_standing(self, team, position, standing):
+        """Add or remove the zone of control exerted from a cell
+        
+        Args:
+            team: The team of the goblin on the cell
+            position: Tuple (x, y) of the cell
+            standing: True when the goblin gets up, False when it goes down
+        """
+        idx = self.index(position)
+        delta = 1 if standing else -1
+        
+        if standing:
+            self.standing[team] = self.standing.get(team, 0) | (1 << idx)
+        else:
+            self.standing[team] = self.standing.get(team, 0) & ~(1 << idx)
+            
+        counts = self.team_zoc.get(team)
+        if counts is None:
+            counts = [0] * (self.width * self.height)
+            self.team_zoc[team] = counts
+            
+        total = self.total_zoc
+        bits = self.zoc_bits.get(team, 0)
+        for n in self.neighbours[idx]:
+            counts[n] += delta
+            total[n] += delta
+            if counts[n]:
+                bits |= 1 << n
+            else:
+                bits &= ~(1 << n)
+        self.zoc_bits[team] = bits
+            
+    def opponent_zoc(self, position, team):
+        """Count standing goblins not on a team whose zone of control covers a cell"""
+        idx = self.index(position)
+        counts = self.team_zoc.get(team)
+        return self.total_zoc[idx] - (counts[idx] if counts else 0)
+        
+    def standing_opponents(self, team):
+        """Get a bitboard of every standing goblin not on a team"""
+        board = 0
+        for other, bits in self.standing.items():
+            if other is not team:
+                board |= bits
+        return board
+        
+    def opponent_area(self, team):
+        """Get a bitboard of every cell on or adjacent to a standing goblin not on a team"""
+        board = 0
+        for other, bits in self.standing.items():
+            if other is not team:
+                board |= bits | self.zoc_bits.get(other, 0)
+        return board
+        
+    def __eq__(self, other):
+        """Compare two maps, ignoring teams that have left the grid entirely"""
+        def live(boards):
+            return {team: bits for team, bits in boards.items() if bits}
+        return (live(self.occupancy) == live(other.occupancy) and
+                live(self.standing) == live(other.standing) and
+                live(self.zoc_bits) == live(other.zoc_bits) and
+                self.total_zoc == other.total_zoc)
+
+
 class Grid:
     """
     Represents the game grid for GoblinBall.
     Manages entities on the grid and their positions.
     """
     
-    def __init__(self, width, height):
-        """Initialize a new grid of the specified size"""
+    def __init__(self, width, height, debug=False):
+        """Initialize a new grid of the specified size
+        
+        Args:
+            width: Number of columns
+            height: Number of rows
+            debug: Verify the position index against the cells after every change
+        """
         self.width = width
         self.height = height
+        self.debug = debug
         self.cells = [[None for _ in range(width)] for _ in range(height)]
         
+        # Reverse index of entity -> (x, y) so lookups never scan the board
+        self.positions = {}
+        
+        # Team occupancy and zone-of-control maps, kept in step with the cells
+        self.zones = ZoneMap(width, height)
+        
+        # Bumped on every change so callers can cache results per board state
+        self.version = 0
+        
     def clear(self):
         """Clear all entities from the grid"""
+        for entity in self.positions:
+            if hasattr(entity, 'grid'):
+                entity.grid = None
+                
         self.cells = [[None for _ in range(self.width)] for _ in range(self.height)]
+        self.positions = {}
+        self.zones.clear()
+        self.version += 1
         
     def is_valid_position(self, position):
         """Check if a position is within the grid bounds"""
@@ -38,6 +181,17 @@ class Grid:
         x, y = position
         return self.cells[y][x]
         
+    def get_position(self, entity):
+        """Get the position of an entity on the grid
+        
+        Args:
+            entity: The entity to look up
+            
+        Returns:
+            Tuple (x, y) of the entity's position, or None if it is not on the grid
+        """
+        return self.positions.get(entity)
+        
     def place_entity(self, entity, position):
         """Place an entity at the specified position
         
@@ -57,7 +211,25 @@ class Grid:
             logger.error(f"Position {position} is already occupied")
             return False
             
+        # An entity can only occupy one cell, so vacate any previous one
+        previous_position = self.positions.get(entity)
+        if previous_position is not None:
+            px, py = previous_position
+            self.cells[py][px] = None
+            self.update_zones(entity, previous_position, None)
+            
         self.cells[y][x] = entity
+        self.positions[entity] = position
+        self.sync_entity_position(entity, position)
+        self.update_zones(entity, None, position)
+        self.version += 1
+        
+        # Let the entity report knockdowns and stand-ups back to the grid
+        if hasattr(entity, 'grid'):
+            entity.grid = self
+        
+        if self.debug:
+            self.check_consistency()
         return True
         
     def move_entity(self, entity, new_position):
@@ -75,14 +247,7 @@ class Grid:
             return False
             
         # Find the entity's current position
-        current_position = None
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.cells[y][x] == entity:
-                    current_position = (x, y)
-                    break
-            if current_position:
-                break
+        current_position = self.positions.get(entity)
                 
         if not current_position:
             logger.error(f"Entity {entity} not found on grid")
@@ -98,6 +263,13 @@ class Grid:
         cx, cy = current_position
         self.cells[cy][cx] = None
         self.cells[ny][nx] = entity
+        self.positions[entity] = new_position
+        self.sync_entity_position(entity, new_position)
+        self.update_zones(entity, current_position, new_position)
+        self.version += 1
+        
+        if self.debug:
+            self.check_consistency()
         return True
         
     def remove_entity(self, entity):
@@ -110,14 +282,169 @@ class Grid:
             bool: True if the entity was removed, False otherwise
         """
         # Find the entity on the grid
+        position = self.positions.pop(entity, None)
+        if position is None:
+            logger.error(f"Entity {entity} not found on grid")
+            return False
+            
+        x, y = position
+        self.cells[y][x] = None
+        self.update_zones(entity, position, None)
+        self.version += 1
+        
+        if hasattr(entity, 'grid'):
+            entity.grid = None
+        
+        if self.debug:
+            self.check_consistency()
+        return True
+        
+    def update_zones(self, entity, old_position, new_position):
+        """Move an entity's occupancy and zone of control between cells
+        
+        Args:
+            entity: The entity that moved
+            old_position: The cell it left, or None if it was just placed
+            new_position: The cell it entered, or None if it was removed
+        """
+        team = getattr(entity, 'team', None)
+        if team is None:
+            return
+            
+        standing = not getattr(entity, 'knocked_down', False)
+        if old_position is not None:
+            self.zones.remove(team, old_position, standing)
+        if new_position is not None:
+            self.zones.add(team, new_position, standing)
+            
+    def update_standing(self, entity):
+        """Refresh the zone of control of an entity that was knocked down or stood up
+        
+        Args:
+            entity: The entity whose knocked_down state changed
+        """
+        position = self.positions.get(entity)
+        team = getattr(entity, 'team', None)
+        if position is None or team is None:
+            return
+            
+        self.zones.set_standing(team, position, not entity.knocked_down)
+        self.version += 1
+        
+        if self.debug:
+            self.check_consistency()
+            
+    def zone_count(self, position, team):
+        """Count standing opponents whose zone of control covers a position
+        
+        Args:
+            position: Tuple (x, y) of the position to check
+            team: The friendly team (opponents are every other team)
+            
+        Returns:
+            int: Number of standing enemy goblins adjacent to the position
+        """
+        return self.zones.opponent_zoc(position, team)
+        
+    def area_count(self, position, team):
+        """Count standing opponents in the 3x3 area centred on a position
+        
+        Args:
+            position: Tuple (x, y) of the centre of the area
+            team: The friendly team (opponents are every other team)
+            
+        Returns:
+            int: Number of standing enemy goblins on or adjacent to the position
+        """
+        count = self.zones.opponent_zoc(position, team)
+        x, y = position
+        entity = self.cells[y][x]
+        if entity is not None and getattr(entity, 'team', team) is not team and not entity.knocked_down:
+            count += 1
+        return count
+        
+    def get_standing_goblins(self, team, opponents=True):
+        """Get the standing goblins of a team, or of every other team
+        
+        Entities are returned in the same column-by-column order as a full scan
+        of the board, so callers that break ties on scan order behave the same.
+        
+        Args:
+            team: The team to select by
+            opponents: If True, return goblins not on the team instead
+            
+        Returns:
+            list: Standing goblins ordered by (x, y)
+        """
+        goblins = []
+        for entity, position in self.positions.items():
+            entity_team = getattr(entity, 'team', None)
+            if entity_team is None or entity.knocked_down:
+                continue
+            if (entity_team is not team) == opponents:
+                goblins.append((position, entity))
+                
+        goblins.sort(key=lambda item: item[0])
+        return [entity for _, entity in goblins]
+        
+    def sync_entity_position(self, entity, position):
+        """Keep an entity's own position attribute in step with the grid
+        
+        Args:
+            entity: The entity that was placed or moved
+            position: Tuple (x, y) of the entity's cell
+        """
+        if hasattr(entity, 'position') and entity.position != position:
+            entity.position = position
+            
+    def reconcile_positions(self):
+        """Correct any entity whose position attribute disagrees with the grid
+        
+        Returns:
+            int: Number of entities whose position was corrected
+        """
+        corrected = 0
+        for entity, position in self.positions.items():
+            if hasattr(entity, 'position') and entity.position != position:
+                logger.warning(f"Entity {entity} thought it was at {entity.position}, grid has {position}")
+                entity.position = position
+                corrected += 1
+                
+        return corrected
+        
+    def check_consistency(self):
+        """Verify the position index against the cells (debug aid)
+        
+        Returns:
+            bool: True if the index and cells agree, False otherwise
+        """
+        consistent = True
+        indexed = 0
         for y in range(self.height):
             for x in range(self.width):
-                if self.cells[y][x] == entity:
-                    self.cells[y][x] = None
-                    return True
+                entity = self.cells[y][x]
+                if entity is None:
+                    continue
+                indexed += 1
+                if self.positions.get(entity) != (x, y):
+                    logger.error(f"Index mismatch: {entity} is in cell {(x, y)} but indexed at {self.positions.get(entity)}")
+                    consistent = False
                     
-        logger.error(f"Entity {entity} not found on grid")
-        return False
+        if indexed != len(self.positions):
+            logger.error(f"Index has {len(self.positions)} entries but the grid holds {indexed} entities")
+            consistent = False
+            
+        # Rebuild the zone maps from scratch and compare with the incremental ones
+        expected = ZoneMap(self.width, self.height)
+        for entity, position in self.positions.items():
+            team = getattr(entity, 'team', None)
+            if team is not None:
+                expected.add(team, position, not getattr(entity, 'knocked_down', False))
+        if expected != self.zones:
+            logger.error("Zone-of-control maps are out of step with the grid")
+            consistent = False
+            
+        return consistent
         
     def get_empty_positions(self):
         """Get all empty positions on the grid
@@ -165,14 +492,7 @@ class Grid:
         Returns:
             list: List of entities of the specified type
         """
-        entities = []
-        for y in range(self.height):
-            for x in range(self.width):
-                entity = self.cells[y][x]
-                if entity and isinstance(entity, entity_type):
-                    entities.append(entity)
-                    
-        return entities
+        return [entity for entity in self.positions if isinstance(entity, entity_type)]
         
     def __str__(self):
         """String representation of the grid for debugging"""
@@ -1,4 +1,5 @@
 import pygame
+from text_cache import TEXT
 
 class GridRenderer:
     """Renders the game grid with end zones and hoops"""
@@ -17,10 +18,15 @@ class GridRenderer:
         
         # Fonts
         self.fonts = {
-            "small": pygame.font.SysFont(None, 14),
-            "medium": pygame.font.SysFont(None, 20),
+            "small": TEXT.font(None, 14),
+            "medium": TEXT.font(None, 20),
         }
         
+        # Pre-rendered field (end zones, row numbers, lines and hoops), rebuilt
+        # only when the grid or cell size it was drawn for changes
+        self.static_layer = None
+        self.static_layer_key = None
+        
     def draw(self, screen, offset_x, offset_y):
         """Draw the game grid with end zones
         
@@ -32,6 +38,36 @@ class GridRenderer:
         Returns:
             pygame.Surface: The grid surface that was drawn
         """
+        key = (self.game.grid_size, self.cell_size)
+        if key != self.static_layer_key:
+            self.static_layer = self.build_static_layer()
+            self.static_layer_key = key
+            
+        # Blit the grid to the screen at the specified offset
+        screen.blit(self.static_layer, (offset_x, offset_y))
+        
+        return self.static_layer
+        
+    def dirty_rects(self, regions, offset_x, offset_y):
+        """Report the field's area if it has to be drawn again
+        
+        Args:
+            regions: The DirtyRegions shared by the renderers
+            offset_x: The x offset for drawing
+            offset_y: The y offset for drawing
+            
+        Returns:
+            list: Rects that changed since the last frame
+        """
+        size = self.game.grid_size * self.cell_size
+        return regions.check("field", (self.game.grid_size, self.cell_size), (offset_x, offset_y, size, size))
+        
+    def build_static_layer(self):
+        """Render the parts of the field that never change during a game
+        
+        Returns:
+            pygame.Surface: The field, with end zones, row numbers, grid lines and hoops
+        """
         grid_size = self.game.grid_size
         cell_size = self.cell_size
         
@@ -45,7 +81,7 @@ class GridRenderer:
         # Draw row numbers
         for y in range(grid_size):
             # Draw row number on left side
-            row_text = self.fonts["medium"].render(f"{y+1}", True, self.colors["text"])
+            row_text = TEXT.render(self.fonts["medium"], f"{y+1}", self.colors["text"])
             grid_surface.blit(row_text, (5, y * cell_size + cell_size // 3))
         
         # Draw grid lines
@@ -82,8 +118,9 @@ class GridRenderer:
         bottom_hoop_y = (grid_size - 0.5) * cell_size
         pygame.draw.circle(grid_surface, self.colors["hoop"], (center_x, bottom_hoop_y), hoop_radius)
         pygame.draw.circle(grid_surface, self.colors["background"], (center_x, bottom_hoop_y), hoop_radius - 5)
-            
-        # Blit the grid to the screen at the specified offset
-        screen.blit(grid_surface, (offset_x, offset_y))
         
-        return grid_surface 
\ No newline at end of file
+        # Match the display's pixel format so the per-frame blit is a straight copy
+        if pygame.display.get_surface() is not None:
+            grid_surface = grid_surface.convert_alpha()
+            
+        return grid_surface
@@ -0,0 +1,168 @@
+"""
+Turn history for Goblinball
+This module keeps the snapshots behind the Previous Turn button. Each goblin's
+state is a fixed-layout row tuple, in roster slot order. A saved turn only stores
+what the rows that changed since the turn before it used to be - the rows they
+changed to are the next turn's, so they are never stored twice. History can be
+thousands of turns deep, and stepping through it only touches the goblins that differ.
+"""
+
+from collections import deque
+
+# Layout of a goblin's row: (position, on_grid, knocked_down, movement, has_ball, trail)
+POSITION, ON_GRID, KNOCKED_DOWN, MOVEMENT, HAS_BALL, TRAIL = range(6)
+
+
+def capture_rows(game):
+    """Snapshot every goblin in the game as a row tuple
+
+    Args:
+        game: The game to snapshot
+
+    Returns:
+        tuple: One row per roster slot; trail is None for goblins without one
+    """
+    on_grid = game.grid.positions
+    trails = game.movement_trails
+    rows = []
+    for goblin in game.roster.goblins:
+        trail = trails.get(goblin.id)
+        rows.append((goblin.position, goblin in on_grid, bool(goblin.knocked_down),
+                     goblin.movement, bool(goblin.has_ball),
+                     tuple(trail) if trail is not None else None))
+    return tuple(rows)
+
+
+def diff_rows(old_rows, new_rows):
+    """Find the rows that changed between two snapshots
+
+    Returns:
+        dict: Slot -> old row for every slot that differs
+    """
+    return {slot: old for slot, (old, new) in enumerate(zip(old_rows, new_rows)) if old != new}
+
+
+class TurnHistory:
+    """Snapshots of the start of recent turns, stored as changes between turns"""
+
+    def __init__(self, game, max_turns=1000):
+        """Create an empty history
+
+        Args:
+            game: The game to record
+            max_turns: Number of turns to keep; the oldest are dropped first
+        """
+        self.game = game
+
+        # (turn, play, changes) per saved turn, oldest first. changes maps each slot
+        # that differs from the turn before to its row in the turn before.
+        self.entries = deque(maxlen=max_turns)
+
+        # Full rows of the newest saved turn, for diffing the next one against
+        self.head = None
+
+        # One tuple per square, shared by every row and trail that mentions it
+        self.points = {}
+
+        # While browsing: the live state we left, which snapshot is shown and its rows,
+        # and the rows each step back replaced, for stepping forward again.
+        # Index 0 is the newest saved turn, -1 the live state.
+        self.live = None
+        self.cursor = -1
+        self.shown = None
+        self.redo = []
+
+    def __len__(self):
+        """Number of saved turns"""
+        return len(self.entries)
+
+    def record(self):
+        """Save the game's current state as the newest turn"""
+        rows = capture_rows(self.game)
+        if self.head is None:
+            changes = {}
+            rows = tuple(self.share_row(row, None) for row in rows)
+        else:
+            changes = diff_rows(self.head, rows)
+            # Share unchanged rows with the previous head rather than keeping copies
+            rows = tuple(self.share_row(new, old) if slot in changes else old
+                         for slot, (old, new) in enumerate(zip(self.head, rows)))
+
+        self.entries.append((self.game.turn, self.game.current_play, changes))
+        self.head = rows
+
+    def share_row(self, row, previous):
+        """Rebuild a row from shared parts before it is kept
+
+        Positions become the history's one tuple per square, and a trail equal to
+        the previous row's is replaced by that one, so a goblin that only lost
+        movement or was knocked down costs one new row tuple.
+
+        Args:
+            row: The captured row
+            previous: The slot's row in the turn before, or None
+
+        Returns:
+            tuple: A row equal to row
+        """
+        points = self.points
+        trail = row[TRAIL]
+        if previous is not None and trail == previous[TRAIL]:
+            trail = previous[TRAIL]
+        elif trail is not None:
+            trail = tuple(points.setdefault(point, point) for point in trail)
+        position = points.setdefault(row[POSITION], row[POSITION])
+        return (position, row[ON_GRID], row[KNOCKED_DOWN], row[MOVEMENT], row[HAS_BALL], trail)
+
+    def clear(self):
+        """Forget every saved turn"""
+        self.entries.clear()
+        self.head = None
+        self.points = {}
+        self.live = None
+        self.cursor = -1
+        self.shown = None
+        self.redo = []
+
+    def start_browsing(self):
+        """Remember the live state so browsing can return to it"""
+        rows = capture_rows(self.game)
+        changes = diff_rows(self.head, rows) if self.head is not None else {}
+        self.live = (self.game.turn, self.game.current_play, changes)
+        self.cursor = -1
+        self.shown = list(rows)
+        self.redo = []
+
+    def seek(self, index):
+        """Move the shown snapshot, collecting only the rows that change
+
+        Args:
+            index: Snapshot to show, 0 for the newest saved turn or -1 for the live state
+
+        Returns:
+            tuple: (turn, play, {slot: row}) to apply, or None if index is out of range
+        """
+        if self.live is None or not -1 <= index < len(self.entries):
+            return None
+
+        changes = {}
+        while self.cursor < index:
+            # The shown snapshot's changes hold the rows of the one before it
+            older = self.live[2] if self.cursor == -1 else self.entries[-1 - self.cursor][2]
+            self.redo.append({slot: self.shown[slot] for slot in older})
+            for slot, row in older.items():
+                self.shown[slot] = row
+            changes.update(older)
+            self.cursor += 1
+        while self.cursor > index:
+            newer = self.redo.pop()
+            for slot, row in newer.items():
+                self.shown[slot] = row
+            changes.update(newer)
+            self.cursor -= 1
+
+        turn, play, _ = self.live if index == -1 else self.entries[-1 - index]
+        if index == -1:
+            self.live = None
+            self.shown = None
+        return turn, play, changes
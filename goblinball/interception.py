@@ -0,0 +1,176 @@
+"""
+Interception fields for Goblinball defenders
+This module works out, once per carrier move, where the ball carrier is expected to
+run, how far each square is from the carrier and how far it is from that route. A
+defender's score for a square only depends on the carrier, so the map scores each
+square once and every defender moving that turn reads the shared result instead of
+re-deriving the carrier's route per move.
+"""
+
+
+def walk_distances(grid, sources, limit):
+    """Breadth-first walking distances over free squares
+
+    Args:
+        grid: The Grid to walk on
+        sources: Positions at distance 0 (these may be occupied)
+        limit: Furthest distance to explore; squares beyond it are left out
+
+    Returns:
+        dict: Position -> number of orthogonal steps from the nearest source
+    """
+    distances = {}
+    frontier = []
+    for pos in sources:
+        if pos not in distances:
+            distances[pos] = 0
+            frontier.append(pos)
+
+    # Expand a whole ring at a time, reading the cell rows directly - this runs
+    # for every carrier move, so it avoids per-square bounds and helper calls
+    width, height, cells = grid.width, grid.height, grid.cells
+    steps = 0
+    while frontier and steps < limit:
+        steps += 1
+        ring = []
+        for x, y in frontier:
+            row = cells[y]
+            if x > 0 and row[x - 1] is None and (x - 1, y) not in distances:
+                distances[(x - 1, y)] = steps
+                ring.append((x - 1, y))
+            if x + 1 < width and row[x + 1] is None and (x + 1, y) not in distances:
+                distances[(x + 1, y)] = steps
+                ring.append((x + 1, y))
+            if y > 0 and cells[y - 1][x] is None and (x, y - 1) not in distances:
+                distances[(x, y - 1)] = steps
+                ring.append((x, y - 1))
+            if y + 1 < height and cells[y + 1][x] is None and (x, y + 1) not in distances:
+                distances[(x, y + 1)] = steps
+                ring.append((x, y + 1))
+        frontier = ring
+
+    return distances
+
+
+class InterceptionMap:
+    """A ball carrier's projected route and the defenders' square scores for one turn"""
+
+    def __init__(self, grid, carrier, target_y, walk=True):
+        """Project the carrier's route and build the distance fields around it
+
+        Args:
+            grid: The Grid the carrier is on
+            carrier: The ball carrier
+            target_y: Row of the end zone the carrier is running to
+            walk: Measure distances on foot around other goblins, and route the
+                  carrier around them, instead of straight up the field
+        """
+        self.carrier_position = carrier.position
+        self.target_y = target_y
+        self.distance_cap = 20  # Squares this far away or more all score the same
+        self.route_cap = 2  # Squares this far off the route or more all count as off it
+
+        # Walking distances from the carrier, or None to use Manhattan distance
+        self.carrier_distance = walk_distances(grid, [carrier.position], self.distance_cap) if walk else None
+
+        self.route = self.project_route()
+
+        # Walking distances from the route, or None to use the distance from the carrier's column
+        self.route_distance = walk_distances(grid, self.route, self.route_cap) if walk else None
+
+        # Square -> score, filled in as defenders ask
+        self.square_scores = {}
+
+    def project_route(self):
+        """Predict the carrier's path to its end zone
+
+        Returns:
+            list: Positions from the carrier to the end zone. Without walking
+                  distances this is a straight run up the carrier's column.
+                  Otherwise it is a shortest walk, preferring steps along the
+                  field, to the square within distance_cap that gets nearest
+                  the end zone, then straight on from there.
+        """
+        carrier_x, carrier_y = self.carrier_position
+        step_y = -1 if self.target_y < carrier_y else 1
+
+        distances = self.carrier_distance
+        if distances is None:
+            return [(carrier_x, y) for y in range(carrier_y, self.target_y + step_y, step_y)]
+
+        # Furthest square up the field, then the nearest on foot, then the one closest to the carrier's column
+        pos = min(distances, key=lambda p: (abs(p[1] - self.target_y), distances[p], abs(p[0] - carrier_x)))
+        steps = distances[pos]
+
+        # Walk back to the carrier through squares one step nearer each time
+        route = [pos]
+        while steps > 0:
+            x, y = pos
+            for prev_pos in ((x, y - step_y), (x - 1, y), (x + 1, y), (x, y + step_y)):
+                if distances.get(prev_pos) == steps - 1:
+                    break
+            pos = prev_pos
+            route.append(pos)
+            steps -= 1
+
+        route.reverse()
+
+        # Beyond the walked part, expect a straight run to the end zone
+        end_x, end_y = route[-1]
+        route.extend((end_x, y) for y in range(end_y + step_y, self.target_y + step_y, step_y))
+        return route
+
+    def distance_to_carrier(self, position):
+        """Distance from a square to the carrier, capped at distance_cap"""
+        if self.carrier_distance is None:
+            distance = abs(position[0] - self.carrier_position[0]) + abs(position[1] - self.carrier_position[1])
+        else:
+            distance = self.carrier_distance.get(position, self.distance_cap)
+        return min(self.distance_cap, distance)
+
+    def distance_to_route(self, position):
+        """Distance from a square to the carrier's projected route, capped at route_cap"""
+        if self.route_distance is None:
+            distance = abs(position[0] - self.carrier_position[0])
+        else:
+            distance = self.route_distance.get(position, self.route_cap)
+        return min(self.route_cap, distance)
+
+    def score(self, position):
+        """Score a square for a defender, apart from the mover's own movement points
+
+        Args:
+            position: The square to score
+
+        Returns:
+            int: Bonuses for blocking, closing on and cutting off the carrier
+        """
+        score = self.square_scores.get(position)
+        if score is not None:
+            return score
+
+        x, y = position
+        carrier_x, carrier_y = self.carrier_position
+        score = 0
+
+        # HIGHEST PRIORITY: Get adjacent to carrier for blocking
+        if abs(x - carrier_x) + abs(y - carrier_y) == 1:
+            score += 2000
+
+        # SECOND PRIORITY: Get as close as possible to carrier
+        score += (self.distance_cap - self.distance_to_carrier(position)) * 50
+
+        # THIRD PRIORITY: Intercept path to end zone
+        if abs(y - self.target_y) < abs(carrier_y - self.target_y):
+            # Between the carrier and its goal
+            score += 150
+
+            # Bonus for standing on the projected route or beside it
+            if self.distance_to_route(position) <= 1:
+                score += 200
+
+            # Position relative to end zone
+            score += 100
+
+        self.square_scores[position] = score
+        return score
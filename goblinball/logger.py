@@ -1,46 +1,137 @@
 import os
+import time
+import atexit
+import collections
 import datetime
+import threading
 from config import CONFIG
 
+# Message levels, lowest first (same numbers as the logging module)
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
 # Setup debug logging
 class DebugLogger:
-    def __init__(self, enabled=True):
+    def __init__(self, enabled=True, level=None, buffered=None):
+        """Initialize the logger
+
+        Args:
+            enabled: Whether messages are written at all
+            level: Lowest level written, defaults to the "debug_log_level" config value
+            buffered: Write from a background thread instead of flushing every message,
+                      defaults to the "debug_log_buffered" config value
+        """
         self.enabled = enabled
+        self.level = LEVELS[level or CONFIG.get("debug_log_level", "INFO")]
+        self.buffered = CONFIG.get("debug_log_buffered", True) if buffered is None else buffered
         self.log_file = None
-        if enabled:
-            # Create logs directory if it doesn't exist
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            log_dir = os.path.join(script_dir, "logs")
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-            
-            # Create a new log file with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_path = os.path.join(log_dir, f"goblinball_debug_{timestamp}.txt")
-            self.log_file = open(log_path, "w")
-            self.log(f"=== Goblinball Debug Log - {timestamp} ===")
-            self.log(f"Log file path: {log_path}")
-    
-    def log(self, message, level="INFO"):
-        """Write a message to the debug log"""
-        if not self.enabled or not self.log_file:
+
+        # Buffered mode: messages wait in a queue that the writer thread drains and
+        # flushes every flush_interval seconds. When queue_size messages are waiting,
+        # the caller writes them itself, so memory stays bounded if the disk is slow.
+        self.pending = collections.deque()
+        self.queue_size = CONFIG.get("debug_log_queue_size", 10000)
+        self.flush_interval = CONFIG.get("debug_log_flush_interval", 0.5)
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.writer = None
+
+        # The log file is created on the first message rather than at import,
+        # so headless runs that disable logging never touch the disk
+
+    def open(self):
+        """Create the timestamped debug log file"""
+        # Create logs directory if it doesn't exist
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        log_dir = os.path.join(script_dir, "logs")
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        # Create a new log file with timestamp
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = os.path.join(log_dir, f"goblinball_debug_{timestamp}.txt")
+        self.log_file = open(log_path, "w")
+
+        if self.buffered:
+            self.wake.clear()
+            self.writer = threading.Thread(target=self.write_queued, name="goblinball-debug-log", daemon=True)
+            self.writer.start()
+            atexit.register(self.close)
+
+        self.log(f"=== Goblinball Debug Log - {timestamp} ===")
+        self.log(f"Log file path: {log_path}")
+
+    def is_enabled_for(self, level):
+        """Check whether a message at a level would be written"""
+        return self.enabled and LEVELS.get(level, 20) >= self.level
+
+    def log(self, message, *args, level="INFO"):
+        """Write a message to the debug log
+
+        Nothing is formatted unless the message will be written, so hot paths should
+        pass format arguments (or a callable returning the message) instead of an f-string.
+
+        Args:
+            message: The message, a %-format string for args, or a callable returning the message
+            *args: Values for the %-format placeholders in message
+            level: One of LEVELS
+        """
+        if not self.enabled or LEVELS.get(level, 20) < self.level:
             return
-            
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+
+        if not self.log_file:
+            self.open()
+
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+
+        if self.writer is not None:
+            self.pending.append((time.time(), level, message))
+            if len(self.pending) >= self.queue_size:
+                self.drain()
+        else:
+            self.write(time.time(), level, message)
+            self.log_file.flush()
+
+    def write(self, created, level, message):
+        """Format and write a single message"""
+        timestamp = datetime.datetime.fromtimestamp(created).strftime("%H:%M:%S.%f")[:-3]
         log_message = f"[{timestamp}] [{level}] {message}"
-        
-        # Write to file and flush immediately
         self.log_file.write(log_message + "\n")
-        self.log_file.flush()
-        
+
         # Echo to console if in verbose mode
         if CONFIG.get("verbose_debug", False):
             print(log_message)
-    
+
+    def drain(self):
+        """Write every queued message and flush the file"""
+        with self.write_lock:
+            pending = self.pending
+            while pending:
+                self.write(*pending.popleft())
+            if self.log_file:
+                self.log_file.flush()
+
+    def write_queued(self):
+        """Writer thread: drain the queue periodically until close() stops it"""
+        while self.writer is not None:
+            self.wake.wait(self.flush_interval)
+            self.drain()
+
     def close(self):
-        """Close the log file"""
+        """Write any queued messages and close the log file"""
+        if self.writer is not None:
+            writer = self.writer
+            self.writer = None
+            self.wake.set()
+            writer.join()
+            self.drain()
+            atexit.unregister(self.close)
+
         if self.log_file:
             self.log_file.close()
+            self.log_file = None
 
 # Create global debug logger
-DEBUG = DebugLogger(CONFIG.get("debug_logging", True)) 
\ No newline at end of file
+DEBUG = DebugLogger(CONFIG.get("debug_logging", True))
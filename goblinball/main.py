@@ -1,13 +1,14 @@
-import pygame
-import random
 import sys
 import os
-import time
 import datetime
 import logging
+import argparse
 import traceback
 import importlib
 
+# Directory the game was launched from, for resolving paths given on the command line
+launch_dir = os.getcwd()
+
 # Make sure we're in the right directory and setup proper import paths
 if getattr(sys, 'frozen', False):
     # Running as compiled executable
@@ -68,13 +69,22 @@ def validate_imports():
         'carrier_movement',
         'blocker_movement',
         'ai_goals',
+        'field_goal',
+        'roster',
+        'interception',
+        'history',
+        'replay',
         'utils',
         'grid',
         'game_controller',
+        'game',
         'grid_renderer',
         'goblin_renderer',
         'ui_renderer',
-        'animation_renderer'
+        'animation_renderer',
+        'dirty_regions',
+        'text_cache',
+        'simulation_thread'
     ]
     
     missing_modules = []
@@ -115,19 +125,10 @@ try:
         sys.exit(1)
         
     from config import CONFIG
-    from goblin import Goblin
     from team import Team
-    from event import EventManager
     from renderer import GameRenderer
-    from logger import DEBUG, DebugLogger
-    from animation import AnimationManager
-    from movement_system import MovementSystem
-    from carrier_movement import CarrierMovement
-    from blocker_movement import BlockerMovement
-    from ai_goals import AIGoalSystem, MovementStyleSelector
-    from utils import is_adjacent, manhattan_distance
-    from grid import Grid
-    from game_controller import GameController
+    from logger import DEBUG
+    from game import Game
 except ImportError as e:
     logger.critical(f"Could not import required modules: {e}")
     logger.critical("Make sure you're running the game from the correct directory.")
@@ -136,416 +137,55 @@ except ImportError as e:
     logger.critical(f"Sys path: {sys.path}")
     sys.exit(1)
 
-class Game:
-    def __init__(self, team1, team2, config=None):
-        """Initialize a new game between two teams"""
-        # Configuration
-        self.config = CONFIG
-        
-        # Teams
-        self.team1 = team1
-        self.team2 = team2
-        
-        # Field
-        self.grid_size = CONFIG.get("grid_size", 10)
-        self.grid = Grid(self.grid_size, self.grid_size)
-        
-        # Game state
-        self.current_play = 0
-        self.max_plays = CONFIG.get("plays_per_game", 20)
-        self.turn = 0
-        self.play_complete = False
-        self.game_complete = False
-        self.auto_advance = False
-        self.turn_delay = 0.5  # Seconds between automatic turns
-        self.last_turn_time = time.time()
-        
-        # Turn history for Previous Turn functionality
-        self.turn_history = []
-        self.max_history = 20  # Maximum number of turns to keep in history
-        self.current_history_index = -1  # -1 means we're at the current state
-        
-        # Role assignment
-        self.offense_team = team1
-        self.defense_team = team2
-        self.offense_team.is_offense = True
-        
-        # Events and logs
-        self.event_manager = EventManager()
-        
-        # Animation system
-        self.animation_manager = AnimationManager()
-        
-        # Movement systems
-        self.movement_system = MovementSystem(self)
-        self.carrier_movement = CarrierMovement(self, self.movement_system)
-        self.blocker_movement = BlockerMovement(self, self.movement_system)
-        
-        # AI systems
-        self.goal_system = AIGoalSystem(self)
-        self.style_selector = MovementStyleSelector(self)
-        
-        # Game-specific stats that don't persist to team/goblin records
-        self.game_stats = {
-            "longest_play_turns": 0,
-            "most_blocks_in_play": 0,
-            "injuries_this_game": 0
-        }
-        
-        # For each new game, reset team scores but preserve stats
-        self.team1.score = 0
-        self.team2.score = 0
-        
-        # Reset carrier tracking for new game
-        self.team1.carrier_rotation_counter = 0
-        self.team2.carrier_rotation_counter = 0
-        self.team1.carrier_history = []
-        self.team2.carrier_history = []
-        
-        # Movement trail tracking
-        self.movement_trails = {}  # Dictionary to store recent positions of goblins
-        self.trail_length = 5  # Number of previous positions to track
-        self.max_turn_movement = 3  # Maximum number of moves a goblin can make in a turn
-        
-        # Create the game controller
-        self.controller = GameController(self)
-        
-        DEBUG.log(f"Game initialized with teams: {team1.name} vs {team2.name}")
-        
-        # Position the teams on the field
-        self.controller.position_teams()
-    
-    def update_movement_trail(self, goblin, new_position):
-        """Update the movement trail for a goblin after it moves"""
-        if goblin.id not in self.movement_trails:
-            self.movement_trails[goblin.id] = []
-            
-        # Add new position to the trail
-        self.movement_trails[goblin.id].append(new_position)
-        
-        # Keep only the most recent positions
-        if len(self.movement_trails[goblin.id]) > self.trail_length:
-            self.movement_trails[goblin.id].pop(0)
-            
-    def get_movement_trail(self, goblin):
-        """Get the movement trail for a goblin"""
-        return self.movement_trails.get(goblin.id, [])
-    
-    def score_touchdown(self, carrier):
-        """Score a touchdown
-        
-        Args:
-            carrier: The carrier goblin who scored
-        """
-        if not carrier or not carrier.has_ball:
-            return
-            
-        # Award points to the carrier's team
-        touchdown_points = self.config.get("touchdown_points", 3)
-        carrier.team.score += touchdown_points
-        
-        # Update stats
-        carrier.stats["touchdowns"] += 1
-        carrier.stats["career_touchdowns"] += 1
-        carrier.team.stats["touchdowns"] += 1
-        
-        # Log the event
-        self.event_manager.create_and_dispatch("touchdown", {
-            "carrier_id": carrier.id,
-            "carrier_name": carrier.name,
-            "team_id": carrier.team.id,
-            "team_name": carrier.team.name,
-            "points": touchdown_points,
-            "position": carrier.position,
-            "goblin": carrier  # Store reference to the goblin
-        })
-        
-        # End the play
-        self.end_play()
-        
-    def score_field_goal(self, carrier):
-        """Score a field goal
-        
-        Args:
-            carrier: The carrier goblin who scored
-        """
-        if not carrier or not carrier.has_ball:
-            return
-            
-        # Award points to the carrier's team
-        field_goal_points = self.config.get("field_goal_points", 1)
-        carrier.team.score += field_goal_points
-        
-        # Update stats
-        carrier.stats["field_goals"] += 1
-        carrier.team.stats["field_goals"] += 1
-        
-        # Log the event
-        self.event_manager.create_and_dispatch("field_goal", {
-            "carrier_id": carrier.id,
-            "carrier_name": carrier.name,
-            "team_id": carrier.team.id,
-            "team_name": carrier.team.name,
-            "points": field_goal_points,
-            "position": carrier.position
-        })
-        
-        # End the play
-        self.end_play()
-    
-    def start_play(self):
-        """Start a new play"""
-        self.controller.start_play()
-    
-    def process_turn(self):
-        """Process a single turn of the game"""
-        return self.controller.process_turn()
-    
-    def end_play(self):
-        """End the current play and swap offense/defense"""
-        self.controller.end_play()
-        
-        # After each play is over, swap offense and defense
-        # for the next play if the game isn't over
-        if not self.game_complete:
-            temp = self.offense_team
-            self.offense_team = self.defense_team
-            self.defense_team = temp
-            
-            # Update is_offense flags
-            self.offense_team.is_offense = True
-            self.defense_team.is_offense = False
-    
-    def end_game(self):
-        """End the game"""
-        self.controller.end_game()
-    
-    def auto_advance_turns(self):
-        """Auto-advance turns if enough time has passed"""
-        return self.controller.auto_advance_turns()
-        
-    def get_ball_carrier(self):
-        """Get the current ball carrier from the offense team
-        
-        Returns:
-            Goblin or None: The current ball carrier, or None if no carrier
-        """
-        return self.offense_team.get_carrier()
-        
-    def turn_movement_count(self, goblin):
-        """Get the number of moves a goblin has made in the current turn
-        
-        Args:
-            goblin: The goblin to check
-            
-        Returns:
-            int: Number of moves in the current turn
-        """
-        # Default to 1 move per turn if not tracking
-        return 1
-    
-    def next_turn(self):
-        """Process the next turn"""
-        # If we're viewing history, move forward in history
-        if self.current_history_index >= 0:
-            self.current_history_index -= 1
-            if self.current_history_index >= 0:
-                # Restore state from history
-                self.restore_state_from_history(self.current_history_index)
-            else:
-                # Back to current state
-                self.restore_current_state()
-            return True
-            
-        # Save current state to history before processing next turn
-        self.save_state_to_history()
-        
-        # Process the turn
-        return self.process_turn()
-    
-    def previous_turn(self):
-        """Go back to the previous turn"""
-        # If we're already at the earliest saved turn, do nothing
-        if self.current_history_index >= len(self.turn_history) - 1:
-            return False
-            
-        # If we're at current state, save it first
-        if self.current_history_index == -1:
-            self.save_current_state()
-            
-        # Move back in history
-        self.current_history_index += 1
-        
-        # Restore state from history
-        self.restore_state_from_history(self.current_history_index)
-        return True
-    
-    def save_state_to_history(self):
-        """Save the current game state to history"""
-        # Limit the size of history
-        while len(self.turn_history) >= self.max_history:
-            self.turn_history.pop()
-            
-        # Create a state snapshot
-        state = {
-            'turn': self.turn,
-            'play': self.current_play,
-            'goblin_positions': {},
-            'goblin_states': {},
-            'trails': {},
-            'ball_carrier': self.get_ball_carrier().id if self.get_ball_carrier() else None
-        }
-        
-        # Save goblin positions and states
-        for team in [self.team1, self.team2]:
-            for goblin in team.goblins:
-                state['goblin_positions'][goblin.id] = goblin.position
-                state['goblin_states'][goblin.id] = {
-                    'knocked_down': goblin.knocked_down,
-                    'movement': goblin.movement,
-                    'has_ball': goblin.has_ball
-                }
-                
-        # Save movement trails
-        for goblin_id, trail in self.movement_trails.items():
-            state['trails'][goblin_id] = trail.copy()
-            
-        # Insert at the beginning (newest first)
-        self.turn_history.insert(0, state)
-    
-    def save_current_state(self):
-        """Save the current state for returning to it later"""
-        self.current_state = {
-            'turn': self.turn,
-            'play': self.current_play,
-            'goblin_positions': {},
-            'goblin_states': {},
-            'trails': {},
-            'ball_carrier': self.get_ball_carrier().id if self.get_ball_carrier() else None
-        }
-        
-        # Save goblin positions and states
-        for team in [self.team1, self.team2]:
-            for goblin in team.goblins:
-                self.current_state['goblin_positions'][goblin.id] = goblin.position
-                self.current_state['goblin_states'][goblin.id] = {
-                    'knocked_down': goblin.knocked_down,
-                    'movement': goblin.movement,
-                    'has_ball': goblin.has_ball
-                }
-                
-        # Save movement trails
-        for goblin_id, trail in self.movement_trails.items():
-            self.current_state['trails'][goblin_id] = trail.copy()
-    
-    def restore_state_from_history(self, index):
-        """Restore a game state from history
-        
-        Args:
-            index: The index in history to restore from
-        """
-        if index < 0 or index >= len(self.turn_history):
-            return
-            
-        state = self.turn_history[index]
-        
-        # Restore turn and play
-        self.turn = state['turn']
-        self.current_play = state['play']
-        
-        # Clear the grid
-        self.grid.clear()
-        
-        # Restore goblin positions and states
-        for team in [self.team1, self.team2]:
-            for goblin in team.goblins:
-                if goblin.id in state['goblin_positions']:
-                    # Restore position
-                    goblin.position = state['goblin_positions'][goblin.id]
-                    
-                    # Place on grid
-                    self.grid.place_entity(goblin, goblin.position)
-                    
-                    # Restore state
-                    if goblin.id in state['goblin_states']:
-                        goblin_state = state['goblin_states'][goblin.id]
-                        goblin.knocked_down = goblin_state['knocked_down']
-                        goblin.movement = goblin_state['movement']
-                        goblin.has_ball = goblin_state['has_ball']
-                        
-        # Restore movement trails
-        self.movement_trails = {}
-        for goblin_id, trail in state['trails'].items():
-            self.movement_trails[goblin_id] = trail.copy()
-    
-    def restore_current_state(self):
-        """Restore the current game state"""
-        if not hasattr(self, 'current_state'):
-            return
-            
-        state = self.current_state
-        
-        # Restore turn and play
-        self.turn = state['turn']
-        self.current_play = state['play']
-        
-        # Clear the grid
-        self.grid.clear()
-        
-        # Restore goblin positions and states
-        for team in [self.team1, self.team2]:
-            for goblin in team.goblins:
-                if goblin.id in state['goblin_positions']:
-                    # Restore position
-                    goblin.position = state['goblin_positions'][goblin.id]
-                    
-                    # Place on grid
-                    self.grid.place_entity(goblin, goblin.position)
-                    
-                    # Restore state
-                    if goblin.id in state['goblin_states']:
-                        goblin_state = state['goblin_states'][goblin.id]
-                        goblin.knocked_down = goblin_state['knocked_down']
-                        goblin.movement = goblin_state['movement']
-                        goblin.has_ball = goblin_state['has_ball']
-                        
-        # Restore movement trails
-        self.movement_trails = {}
-        for goblin_id, trail in state['trails'].items():
-            self.movement_trails[goblin_id] = trail.copy()
-            
-        # Reset history index
-        self.current_history_index = -1
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Goblinball")
+    parser.add_argument("--replay", help="open a recorded match instead of playing a new game")
+    parser.add_argument("--play", type=int, default=1, help="play to open the replay at")
+    parser.add_argument("--turn", type=int, default=0, help="turn within that play, 0 for its start")
+    return parser.parse_args()
 
 def main():
     """Main entry point for the Goblinball simulation"""
+    game = None
     try:
         logger.info("Starting Goblinball")
         logger.info(f"Running from directory: {os.getcwd()}")
         
-        # Create teams
-        team1 = Team("Mudcrushers", (200, 50, 50))  # Red team
-        team2 = Team("Skullsmashers", (50, 50, 200))  # Blue team
-        
-        # Add goblins to teams
-        team1.create_team(5)
-        team2.create_team(5)
+        args = parse_args()
         
-        # Print out the created teams
-        print("Team 1:", team1.name)
-        for goblin in team1.goblins:
-            print(f"  {goblin.name}: STR={goblin.strength}, TOU={goblin.toughness}, MOV={goblin.movement}")
+        if args.replay:
+            # Show a recorded match instead of playing a new one
+            game = Game.from_replay(os.path.join(launch_dir, args.replay))
+            game.replay.seek(args.play, args.turn)
+        else:
+            # Create teams
+            team1 = Team("Mudcrushers", (200, 50, 50))  # Red team
+            team2 = Team("Skullsmashers", (50, 50, 200))  # Blue team
+            
+            # Add goblins to teams
+            team1.create_team(5)
+            team2.create_team(5)
+            
+            # Print out the created teams
+            print("Team 1:", team1.name)
+            for goblin in team1.goblins:
+                print(f"  {goblin.name}: STR={goblin.strength}, TOU={goblin.toughness}, MOV={goblin.movement}")
+            
+            print("\nTeam 2:", team2.name)
+            for goblin in team2.goblins:
+                print(f"  {goblin.name}: STR={goblin.strength}, TOU={goblin.toughness}, MOV={goblin.movement}")
+            
+            # Create a game
+            game = Game(team1, team2)
+            
+            # Start first play
+            game.start_play()
+            
+            # Optionally play turns on a worker thread instead of in the render loop
+            if CONFIG.get("simulation_thread", False):
+                game = game.run_on_worker()
             
-        print("\nTeam 2:", team2.name)
-        for goblin in team2.goblins:
-            print(f"  {goblin.name}: STR={goblin.strength}, TOU={goblin.toughness}, MOV={goblin.movement}")
-        
-        # Create a game
-        game = Game(team1, team2)
-        
-        # Start first play
-        game.start_play()
-        
         # Create renderer
         renderer = GameRenderer(game)
         game.renderer = renderer  # Store reference to renderer in game
@@ -562,6 +202,10 @@ def main():
         print(f"Log file: {log_file}")
         sys.exit(1)
     finally:
+        # Stop the simulation thread and finish the replay, however the viewer exited
+        if game is not None:
+            game.close()
+        
         # Close debug logger
         DEBUG.close()
         logger.info("Goblinball ended")
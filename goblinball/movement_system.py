@@ -1,4 +1,5 @@
-import random
+import math
+import heapq
 import logging
 from config import CONFIG
 from utils import (
@@ -7,6 +8,9 @@ from utils import (
     get_line_positions, get_positions_in_range,
     weighted_choice
 )
+from event import (
+    MoveEvent, BlockEvent, PushEvent, DukeCheckEvent, KnockdownEvent, BallDroppedEvent
+)
 
 # Import the DEBUG logger
 from logger import DEBUG
@@ -17,6 +21,10 @@ class MovementSystem:
     def __init__(self, game):
         self.game = game
         self.logger = logging.getLogger("goblinball.movement")
+        
+        # Pathfinding results for the current turn, keyed by board state and query
+        self.path_cache = {}
+        self.pathfinding_stats = {"searches": 0, "cache_hits": 0, "nodes_expanded": 0}
     
     def reset_movement_points(self, goblin):
         """Reset a goblin's movement points for a new turn
@@ -61,11 +69,11 @@ class MovementSystem:
                 return self.attempt_block(goblin, occupied)
             return False
         
-        # Calculate movement distance (using Manhattan distance)
-        move_distance = manhattan_distance(goblin.position, target_pos)
-        
-        # Check if goblin has enough movement points
-        if move_distance > goblin.movement:
+        # The move costs the steps of the shortest walk around occupied squares
+        route = self.get_reachable_squares(goblin).get(target_pos)
+        if route is None:
+            route = self.find_route(goblin, target_pos, goblin.movement)
+        if route is None:
             return False
             
         # First check if the goblin is currently in any opponent's zone of control
@@ -75,18 +83,18 @@ class MovementSystem:
         if current_blockers:
             # DUKE check is only needed when LEAVING a zone of control
             # Log for debugging
-            blocker_names = ", ".join([b.name for b in current_blockers])
-            DEBUG.log(f"Goblin {goblin.name} is attempting to leave the zone of control of: {blocker_names}")
+            DEBUG.log(lambda: f"Goblin {goblin.name} is attempting to leave the zone of control of: "
+                              f"{', '.join(b.name for b in current_blockers)}")
             
             # Need to make DUKE check to leave ZoC
             duke_result = self.perform_duke_check(goblin, current_blockers)
             
             if not duke_result["success"]:
                 # Failed to leave ZoC
-                DEBUG.log(f"Goblin {goblin.name} failed DUKE check to leave zone of control")
+                DEBUG.log("Goblin %s failed DUKE check to leave zone of control", goblin.name)
                 return False
             else:
-                DEBUG.log(f"Goblin {goblin.name} succeeded DUKE check to leave zone of control")
+                DEBUG.log("Goblin %s succeeded DUKE check to leave zone of control", goblin.name)
         
         # Move the goblin to the new position and update the game state
         old_pos = goblin.position
@@ -111,12 +119,14 @@ class MovementSystem:
         while len(self.game.movement_trails[goblin.id]) > self.game.trail_length:
             self.game.movement_trails[goblin.id].pop(0)
         
-        # Log the movement for debugging
-        DEBUG.log(f"Goblin {goblin.name} moved from {old_pos} to {target_pos}")
-        DEBUG.log(f"Movement trail: {self.game.movement_trails[goblin.id]}")
-        
         # Reduce movement points
-        goblin.movement -= move_distance
+        goblin.movement -= route["steps"]
+        
+        self.game.event_manager.emit(MoveEvent, goblin, old_pos, target_pos)
+        
+        # Log the movement for debugging
+        DEBUG.log("Goblin %s moved from %s to %s", goblin.name, old_pos, target_pos)
+        DEBUG.log("Movement trail: %s", self.game.movement_trails[goblin.id])
         
         # Update stats
         goblin.stats["moves_made"] += 1
@@ -158,6 +168,150 @@ class MovementSystem:
         
         return path
     
+    def clear_path_cache(self):
+        """Forget cached paths, typically at the start of a turn"""
+        self.path_cache = {}
+    
+    def find_path_to(self, goblin, target_pos, max_steps=None):
+        """Find the safest path for a goblin to a target position
+        
+        Args:
+            goblin: The goblin to move
+            target_pos: Tuple (x, y) of the target position
+            max_steps: Longest path to accept, or None for no limit
+            
+        Returns:
+            list: Positions to move through, ending at the target, or empty list if no path
+        """
+        route = self.find_route(goblin, target_pos, max_steps)
+        return route["path"] if route else []
+    
+    def find_route(self, goblin, target_pos, max_steps=None):
+        """A* search for the safest orthogonal route to a target position
+        
+        Each step costs 1, and stepping out of an opponent's zone of control adds
+        the DUKE risk, -ln(success chance) scaled by the "ai_duke_risk_weight"
+        config value. Manhattan distance never overestimates the remaining cost,
+        so the route found is the cheapest one. Intermediate squares must be
+        empty; the target may hold an opponent, in which case arriving is a block.
+        
+        Args:
+            goblin: The goblin to move
+            target_pos: Tuple (x, y) of the target position
+            max_steps: Longest path to accept, or None for no limit
+            
+        Returns:
+            dict: The "path" (excluding the start), its "steps" and the combined
+                  DUKE "success_chance", or None if the target cannot be reached
+        """
+        grid = self.game.grid
+        start = goblin.position
+        
+        if not grid.is_valid_position(target_pos) or target_pos == start:
+            return None
+            
+        # A target occupied by a teammate can never be reached
+        occupant = grid.get_entity_at_position(target_pos)
+        if occupant is not None and getattr(occupant, 'team', goblin.team) == goblin.team:
+            return None
+            
+        # The DUKE chance depends on the goblin's agility and whether it has the ball
+        key = (grid.version, start, target_pos, max_steps, goblin.team, goblin.agility, goblin.has_ball)
+        self.pathfinding_stats["searches"] += 1
+        if key in self.path_cache:
+            self.pathfinding_stats["cache_hits"] += 1
+            return self.path_cache[key]
+            
+        risk_weight = self.game.config.get("ai_duke_risk_weight", 10.0)
+        target_x, target_y = target_pos
+        
+        # With a step limit the same square can be worth revisiting on a shorter path,
+        # so search over (position, steps) instead of position alone
+        def state(pos, steps):
+            return (pos, steps) if max_steps is not None else pos
+        
+        # Heap entries: (estimated total cost, remaining distance, tie breaker, cost, steps, position).
+        # Among equally promising squares the one nearest the target goes first, so an
+        # open field is crossed along one path instead of filling the whole rectangle
+        counter = 0
+        start_distance = abs(target_x - start[0]) + abs(target_y - start[1])
+        heap = [(start_distance, start_distance, counter, 0.0, 0, start)]
+        came_from = {state(start, 0): None}
+        best_cost = {state(start, 0): 0.0}
+        route = None
+        
+        while heap:
+            _, _, _, cost, steps, pos = heapq.heappop(heap)
+            current = state(pos, steps)
+            if cost > best_cost[current]:
+                continue  # Stale heap entry
+                
+            self.pathfinding_stats["nodes_expanded"] += 1
+            
+            if pos == target_pos:
+                path = []
+                while current is not None:
+                    path.append(current[0] if max_steps is not None else current)
+                    current = came_from[current]
+                path.reverse()
+                route = {
+                    "path": path[1:],
+                    "steps": steps,
+                    "success_chance": self.route_success_chance(goblin, path)
+                }
+                break
+                
+            if max_steps is not None and steps >= max_steps:
+                continue
+                
+            # Leaving a zone of control requires a DUKE check
+            step_cost = 1.0
+            num_blockers = grid.zone_count(pos, goblin.team)
+            if num_blockers:
+                step_cost -= risk_weight * math.log(self.estimate_duke_success_chance(goblin, num_blockers))
+                
+            x, y = pos
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < grid.width and 0 <= ny < grid.height):
+                    continue
+                    
+                new_pos = (nx, ny)
+                if grid.cells[ny][nx] is not None and new_pos != target_pos:
+                    continue
+                    
+                remaining = abs(target_x - nx) + abs(target_y - ny)
+                if max_steps is not None and steps + 1 + remaining > max_steps:
+                    continue
+                    
+                new_cost = cost + step_cost
+                next_state = state(new_pos, steps + 1)
+                if next_state not in best_cost or new_cost < best_cost[next_state]:
+                    best_cost[next_state] = new_cost
+                    came_from[next_state] = current
+                    counter += 1
+                    heapq.heappush(heap, (new_cost + remaining, remaining, counter, new_cost, steps + 1, new_pos))
+                    
+        self.path_cache[key] = route
+        return route
+    
+    def route_success_chance(self, goblin, path):
+        """Combined chance of passing every DUKE check along a path
+        
+        Args:
+            goblin: The goblin walking the path
+            path: List of positions, starting with the goblin's square
+            
+        Returns:
+            float: Probability of completing the path without failing a DUKE check
+        """
+        chance = 1.0
+        for pos in path[:-1]:
+            num_blockers = self.game.grid.zone_count(pos, goblin.team)
+            if num_blockers:
+                chance *= self.estimate_duke_success_chance(goblin, num_blockers)
+        return chance
+    
     def get_adjacent_blockers(self, position, team):
         """Get all enemy goblins adjacent to a position
         
@@ -168,6 +322,10 @@ class MovementSystem:
         Returns:
             list: List of enemy goblins adjacent to the position
         """
+        # Most squares are outside every zone of control - answer from the zone map
+        if self.game.grid.zone_count(position, team) == 0:
+            return []
+            
         blockers = []
         x, y = position
         
@@ -188,21 +346,21 @@ class MovementSystem:
         
         return blockers
     
-    def perform_duke_check(self, goblin, blockers):
-        """Perform a DUKE (Dodge Under Killer Enemies) check
+    def estimate_duke_success_chance(self, goblin, num_blockers):
+        """Estimate the chance of a successful DUKE check without rolling for it
         
         Args:
             goblin: The goblin attempting to dodge
-            blockers: List of enemy goblins in zone of control
+            num_blockers: Number of enemy goblins whose zone of control it is leaving
             
         Returns:
-            dict: Result of the DUKE check
+            float: Success chance (0.1-0.9)
         """
         # Base success chance
         success_chance = 0.5
         
         # Adjust for number of blockers (-10% per additional blocker)
-        success_chance -= (len(blockers) - 1) * 0.1
+        success_chance -= (num_blockers - 1) * 0.1
         
         # Adjust for goblin's agility (+10% per point)
         success_chance += goblin.agility * 0.1
@@ -212,10 +370,22 @@ class MovementSystem:
             success_chance -= 0.2
         
         # Ensure chance is between 0.1 and 0.9
-        success_chance = max(0.1, min(0.9, success_chance))
+        return max(0.1, min(0.9, success_chance))
+    
+    def perform_duke_check(self, goblin, blockers):
+        """Perform a DUKE (Dodge Under Killer Enemies) check
+        
+        Args:
+            goblin: The goblin attempting to dodge
+            blockers: List of enemy goblins in zone of control
+            
+        Returns:
+            dict: Result of the DUKE check
+        """
+        success_chance = self.estimate_duke_success_chance(goblin, len(blockers))
         
         # Roll for success
-        success = random.random() < success_chance
+        success = self.game.rng.random() < success_chance
         
         if success:
             goblin.stats["successful_dukes"] += 1
@@ -224,43 +394,20 @@ class MovementSystem:
             goblin.knocked_down = True
             
             # Create knockdown event
-            self.game.event_manager.create_and_dispatch("knockdown", {
-                "goblin_id": goblin.id,
-                "goblin_name": goblin.name,
-                "goblin": goblin,
-                "cause": "failed_duke"
-            })
+            self.game.event_manager.emit(KnockdownEvent, goblin, "failed_duke")
             
             # If the goblin had the ball, it's dropped and the play ends
             if goblin.has_ball:
                 goblin.has_ball = False
                 
                 # Log ball dropped event
-                self.game.event_manager.create_and_dispatch("ball_dropped", {
-                    "goblin_id": goblin.id,
-                    "goblin_name": goblin.name,
-                    "goblin": goblin,
-                    "position": goblin.position
-                })
+                self.game.event_manager.emit(BallDroppedEvent, goblin, goblin.position)
                 
                 # End the play since the ball carrier was knocked down
                 self.game.end_play()
         
         # Create event for DUKE check
-        self.game.event_manager.create_and_dispatch("duke_check", {
-            "goblin_id": goblin.id,
-            "goblin_name": goblin.name,
-            "goblin": goblin,
-            "blockers": blockers,
-            "success": success,
-            "chance": success_chance
-        })
-        
-        # Add visualization if renderer exists
-        if hasattr(self.game, 'renderer') and self.game.renderer:
-            self.game.renderer.ui_renderer.add_duke_visualization(
-                goblin, blockers, success, success_chance
-            )
+        self.game.event_manager.emit(DukeCheckEvent, goblin, blockers, success, success_chance)
         
         return {
             "success": success,
@@ -300,9 +447,9 @@ class MovementSystem:
         # Perform the block
         # Blocker: Strength + d10
         # Defender: Agility + d10 (-3 if carrying ball)
-        blocker_roll = goblin.strength + random.randint(1, 10)
+        blocker_roll = goblin.strength + self.game.rng.randint(1, 10)
         defender_penalty = self.game.config.get("carrier_penalty", -3) if target.has_ball else 0
-        defender_roll = target.agility + random.randint(1, 10) + defender_penalty
+        defender_roll = target.agility + self.game.rng.randint(1, 10) + defender_penalty
         
         # Calculate the difference
         diff = blocker_roll - defender_roll
@@ -326,23 +473,14 @@ class MovementSystem:
             goblin.stats["career_blocks"] += 1
             
             # Create event for knockdown
-            self.game.event_manager.create_and_dispatch("knockdown", {
-                "goblin_id": target.id,
-                "goblin_name": target.name,
-                "goblin": target
-            })
+            self.game.event_manager.emit(KnockdownEvent, target)
             
             # If the target had the ball, it's dropped and the play ends
             if target.has_ball:
                 target.has_ball = False
                 
                 # Log ball dropped event
-                self.game.event_manager.create_and_dispatch("ball_dropped", {
-                    "goblin_id": target.id,
-                    "goblin_name": target.name,
-                    "goblin": target,
-                    "position": target.position
-                })
+                self.game.event_manager.emit(BallDroppedEvent, target, target.position)
                 
                 # End the play since the ball carrier was knocked down
                 self.game.end_play()
@@ -377,40 +515,89 @@ class MovementSystem:
                     target.position = push_pos
                     
                     # Create event for push
-                    self.game.event_manager.create_and_dispatch("push", {
-                        "pusher_id": goblin.id,
-                        "pusher_name": goblin.name,
-                        "pusher": goblin,
-                        "target_id": target.id,
-                        "target_name": target.name,
-                        "target": target,
-                        "from_pos": target.position,
-                        "to_pos": push_pos
-                    })
+                    self.game.event_manager.emit(PushEvent, goblin, target, target.position, push_pos)
         
         # Log the block event
-        self.game.event_manager.create_and_dispatch("block", {
-            "blocker_id": goblin.id,
-            "blocker_name": goblin.name,
-            "blocker": goblin,
-            "target_id": target.id,
-            "target_name": target.name,
-            "target": target,
-            "result": result,
-            "blocker_roll": blocker_roll,
-            "defender_roll": defender_roll,
-            "diff": diff,
-            "target_knocked_down": target.knocked_down
-        })
-        
-        # Add visualization if renderer exists
-        if hasattr(self.game, 'renderer') and self.game.renderer:
-            self.game.renderer.ui_renderer.add_block_visualization(
-                goblin, target, result, blocker_roll, defender_roll
-            )
+        self.game.event_manager.emit(BlockEvent, goblin, target, result, blocker_roll, defender_roll, diff,
+                                     target.knocked_down)
         
         return result != "fail"
     
+    def get_reachable_squares(self, goblin):
+        """Flood fill the squares a goblin can walk to this turn
+        
+        Explores outward from the goblin one orthogonal step at a time, never
+        entering an occupied square, so each square keeps its shortest route
+        within the goblin's movement. Only leaving the starting square's zone of
+        control takes a DUKE check, so every route shares that one chance.
+        
+        Args:
+            goblin: The goblin to flood fill from
+            
+        Returns:
+            dict: Maps each reachable (x, y) position to a dict with the "path" to it
+                  (excluding the start), its "steps", and the DUKE "success_chance" of
+                  the move, also given as "worst_chance"
+        """
+        grid = self.game.grid
+        start = goblin.position
+        
+        # move_goblin floods again for the move the AI just picked
+        key = ("reachable", grid.version, start, goblin.movement, goblin.team, goblin.agility, goblin.has_ball)
+        if key in self.path_cache:
+            return self.path_cache[key]
+            
+        # No move may need a DUKE check below the most lenient risk threshold
+        min_threshold = 0.2
+        
+        # Leaving a zone of control requires a DUKE check
+        chance = 1.0
+        num_blockers = grid.zone_count(start, goblin.team)
+        if num_blockers:
+            chance = self.estimate_duke_success_chance(goblin, num_blockers)
+            if chance < min_threshold:
+                self.path_cache[key] = {}
+                return {}
+                
+        # Shortest known route to each square
+        paths = {start: []}
+        frontier = [start]
+        
+        for _ in range(goblin.movement):
+            next_frontier = []
+            for pos in frontier:
+                path = paths[pos]
+                x, y = pos
+                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < grid.width and 0 <= ny < grid.height):
+                        continue
+                    if grid.cells[ny][nx] is not None:
+                        continue
+                        
+                    new_pos = (nx, ny)
+                    if new_pos not in paths:
+                        paths[new_pos] = path + [new_pos]
+                        next_frontier.append(new_pos)
+                        
+            frontier = next_frontier
+            
+        # Report squares in column order so move generation is deterministic
+        reachable = {}
+        for pos in sorted(paths):
+            if pos == start:
+                continue
+            path = paths[pos]
+            reachable[pos] = {
+                "path": path,
+                "steps": len(path),
+                "success_chance": chance,
+                "worst_chance": chance
+            }
+            
+        self.path_cache[key] = reachable
+        return reachable
+    
     def get_possible_moves(self, goblin):
         """Get all possible valid move positions for a goblin
         
@@ -423,12 +610,10 @@ class MovementSystem:
         if goblin.movement <= 0 or goblin.knocked_down or goblin.unavailable:
             return []
             
-        current_x, current_y = goblin.position
         possible_moves = []
         
         # Check if the goblin is currently in any opponent's zone of control
-        current_blockers = self.get_adjacent_blockers(goblin.position, goblin.team)
-        current_duke_risk = len(current_blockers)
+        current_duke_risk = self.game.grid.zone_count(goblin.position, goblin.team)
         
         # Determine if this is a defensive blocker trying to get to the carrier
         is_defensive_blocker = False
@@ -437,83 +622,22 @@ class MovementSystem:
             is_defensive_blocker = True
             carrier = self.game.offense_team.get_carrier()
         
-        # Check all positions within movement range
-        for dx in range(-goblin.movement, goblin.movement + 1):
-            for dy in range(-goblin.movement, goblin.movement + 1):
-                # Skip the current position
-                if dx == 0 and dy == 0:
-                    continue
-                    
-                # Skip positions beyond movement range (using Manhattan distance)
-                if abs(dx) + abs(dy) > goblin.movement:
-                    continue
-                    
-                new_x = current_x + dx
-                new_y = current_y + dy
-                new_pos = (new_x, new_y)
-                
-                # Ensure the position is on the grid
-                if not (0 <= new_x < self.game.grid.width and 0 <= new_y < self.game.grid.height):
-                    continue
-                    
-                # Ensure the position is empty
-                if self.game.grid.get_entity_at_position(new_pos) is not None:
-                    continue
-                
-                # Check for zone of control along the path
-                path = self.calculate_path(goblin.position, new_pos)
-                can_reach = True
-                
-                # First check if the goblin has to leave a zone of control
-                if current_blockers:
-                    # The success chance calculation should match perform_duke_check
-                    success_chance = 0.5
-                    success_chance -= (len(current_blockers) - 1) * 0.1
-                    success_chance += goblin.agility * 0.1
-                    if goblin.has_ball:
-                        success_chance -= 0.2
-                    
-                    # If chance is very low, don't consider this move
-                    # Use a lower threshold for defensive blockers trying to reach the carrier
-                    risk_threshold = 0.2 if (is_defensive_blocker and carrier and manhattan_distance(new_pos, carrier.position) <= 2) else 0.3
-                    
-                    if success_chance < risk_threshold:  # Threshold for "too risky"
-                        continue
-                
-                # Check path for zone control issues
-                for pos in path[1:]:  # Skip starting position
-                    blockers = self.get_adjacent_blockers(pos, goblin.team)
-                    
-                    if blockers and pos != new_pos:  # If not the final position
-                        # Calculate DUKE success chance
-                        success_chance = 0.5
-                        success_chance -= (len(blockers) - 1) * 0.1
-                        success_chance += goblin.agility * 0.1
-                        if goblin.has_ball:
-                            success_chance -= 0.2
-                        
-                        # If chance is very low, don't consider this move
-                        # Again, use a lower threshold for defensive blockers
-                        risk_threshold = 0.2 if (is_defensive_blocker and carrier and manhattan_distance(new_pos, carrier.position) <= 2) else 0.3
-                        
-                        if success_chance < risk_threshold:  # Threshold for "too risky"
-                            can_reach = False
-                            break
+        for new_pos, route in self.get_reachable_squares(goblin).items():
+            # Use a lower threshold for defensive blockers trying to reach the carrier
+            risk_threshold = 0.2 if (is_defensive_blocker and carrier and manhattan_distance(new_pos, carrier.position) <= 2) else 0.3
+            
+            # If any DUKE check on the way is too risky, don't consider this move
+            if route["worst_chance"] < risk_threshold:
+                continue
                 
-                if can_reach:
-                    possible_moves.append(new_pos)
+            possible_moves.append(new_pos)
                     
         # If current position is surrounded by lots of blockers, 
         # and moving is very risky, consider staying put
         if current_duke_risk > 0:
-            # Check if there are any good blocking targets from current position
-            for adj_pos in get_adjacent_positions(goblin.position, self.game.grid.width):
-                entity = self.game.grid.get_entity_at_position(adj_pos)
-                if entity and hasattr(entity, 'team') and entity.team != goblin.team and not entity.knocked_down:
-                    # Found a potential blocking target
-                    # Add current position as a valid "move" to indicate blocking might be better
-                    possible_moves.append(goblin.position)
-                    break
+            # Being in a zone of control means there is a standing opponent to block,
+            # so add current position as a valid "move" to indicate blocking might be better
+            possible_moves.append(goblin.position)
         
         return possible_moves
         
@@ -527,6 +651,10 @@ class MovementSystem:
         Returns:
             tuple: (bool, target) where bool is True if can block, and target is the goblin to block
         """
+        # No standing enemy is adjacent, so there is nothing to block
+        if self.game.grid.zone_count(position, goblin.team) == 0:
+            return False, None
+            
         # Check all adjacent positions for enemies
         for adj_pos in get_adjacent_positions(position, self.game.grid.width):
             entity = self.game.grid.get_entity_at_position(adj_pos)
@@ -5,6 +5,9 @@ from grid_renderer import GridRenderer
 from goblin_renderer import GoblinRenderer
 from ui_renderer import UIRenderer
 from animation_renderer import AnimationRenderer
+from dirty_regions import DirtyRegions, merge_rects
+from text_cache import TEXT
+from simulation_thread import PLAY
 
 class GameRenderer:
     def __init__(self, game, screen_width=1024, screen_height=768):
@@ -27,10 +30,17 @@ class GameRenderer:
         self.ui_renderer = UIRenderer(game, screen_width, screen_height)
         self.animation_renderer = AnimationRenderer(game, self.cell_size)
         
+        # What every screen region showed when last drawn, so frames only redraw what changed
+        self.dirty_regions = DirtyRegions()
+        
         # Animation state
         self.animation_speed = CONFIG.get("animation_speed", 1.0)
         self.paused = True
         
+        # Frame rates while anything on screen is changing, and while nothing is
+        self.fps = 60
+        self.idle_fps = CONFIG.get("idle_fps", 10)
+        
         # Debug state
         self.show_debug = CONFIG.get("show_debug_info", False)
         self.selected_goblin = None
@@ -50,19 +60,71 @@ class GameRenderer:
         game.event_manager.add_listener("ball_pickup_failed", self.handle_game_event)
         game.event_manager.add_listener("ball_dropped", self.handle_game_event)
         game.event_manager.add_listener("duke_check", self.handle_game_event)
+        game.event_manager.add_listener("move", self.handle_move_event)
         
-    def draw(self):
-        """Draw the game state to the screen"""
-        # Clear screen
-        self.screen.fill((20, 100, 20))  # Field green background
-        
-        # Calculate offsets for centering the grid in the right portion of the screen
+    def grid_offset(self):
+        """Screen position of the field's top-left corner, centred right of the event log"""
         grid_width = self.game.grid_size * self.cell_size
         grid_height = self.game.grid_size * self.cell_size
         
         # Adjust offset to account for the event log on the left (300px reserved space)
         offset_x = (self.screen_width - 300 - grid_width) // 2 + 300
         offset_y = (self.screen_height - grid_height - 100) // 2
+        return offset_x, offset_y
+        
+    def draw(self):
+        """Redraw the parts of the screen that changed since the last frame
+        
+        Returns:
+            bool: True if anything was drawn
+        """
+        offset_x, offset_y = self.grid_offset()
+        mouse_pos = pygame.mouse.get_pos() if pygame.get_init() else None
+        self.ui_renderer.update(mouse_pos)
+        
+        rects = self.dirty_rects(offset_x, offset_y, mouse_pos)
+        if not rects:
+            return False
+            
+        # Draw every layer again, clipped to each changed area in turn
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.draw_layers(offset_x, offset_y, mouse_pos)
+        self.screen.set_clip(None)
+        
+        # Update display
+        pygame.display.update(rects)
+        return True
+        
+    def dirty_rects(self, offset_x, offset_y, mouse_pos):
+        """Collect the areas each renderer changed since the last frame
+        
+        Returns:
+            list: Disjoint screen rects to redraw, empty if nothing changed
+        """
+        regions = self.dirty_regions
+        screen_rect = self.screen.get_rect()
+        
+        # The whole screen on the first frame (and after invalidate)
+        rects = regions.check("screen", screen_rect.size, screen_rect)
+        rects += self.grid_renderer.dirty_rects(regions, offset_x, offset_y)
+        rects += self.goblin_renderer.dirty_rects(regions, offset_x, offset_y, self.selected_goblin)
+        if self.game.animation_manager:
+            rects += self.animation_renderer.dirty_rects(regions, self.game.animation_manager, offset_x, offset_y)
+        rects += self.ui_renderer.dirty_rects(regions, mouse_pos)
+        
+        key = rect = None
+        if self.show_debug:
+            key = tuple(self.debug_lines())
+            rect = (self.screen_width - 200, 10, 200, 20 * len(key))
+        rects += regions.check("debug", key, rect)
+        
+        return merge_rects(rects, screen_rect)
+        
+    def draw_layers(self, offset_x, offset_y, mouse_pos):
+        """Draw the game state to the screen, bottom layer first"""
+        # Clear screen
+        self.screen.fill((20, 100, 20))  # Field green background
         
         # Draw grid
         self.grid_renderer.draw(self.screen, offset_x, offset_y)
@@ -75,20 +137,14 @@ class GameRenderer:
             self.animation_renderer.draw(self.screen, self.game.animation_manager, offset_x, offset_y)
         
         # Draw UI elements
-        mouse_pos = pygame.mouse.get_pos() if pygame.get_init() else None
         self.ui_renderer.draw(self.screen, mouse_pos)
         
         # Draw debug info if enabled
         if self.show_debug:
             self.draw_debug_info()
         
-        # Update display
-        pygame.display.flip()
-        
-    def draw_debug_info(self):
-        """Draw debug information"""
-        debug_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        
+    def debug_lines(self):
+        """Lines of game state and selected goblin information for the debug panel"""
         # Display game state information
         lines = [
             f"Turn: {self.game.turn}",
@@ -116,15 +172,30 @@ class GameRenderer:
             # Add AI info if available
             if hasattr(g, "current_goal"):
                 lines.append(f"Goal: {g.current_goal}")
-            
+                
+        return lines
+        
+    def draw_debug_info(self):
+        """Draw debug information"""
+        debug_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        
         y = 10
-        for line in lines:
-            text = pygame.font.SysFont(None, 16).render(line, True, (255, 255, 255))
+        for line in self.debug_lines():
+            text = TEXT.render(TEXT.font(None, 16), line, (255, 255, 255))
             debug_surface.blit(text, (self.screen_width - 200, y))
             y += 20
             
         self.screen.blit(debug_surface, (0, 0))
         
+    def handle_move_event(self, event):
+        """Slide a goblin along the move it just made, together with the rest of its turn"""
+        self.game.animation_manager.add_animation(
+            "move", event.data["goblin"], event.data["target"],
+            duration=CONFIG.get("animation_move_duration", 0.2),
+            group=(self.game.current_play, self.game.turn),
+            origin=event.data["from_pos"]
+        )
+        
     def handle_game_event(self, event):
         """Process a game event"""
         # Add event to UI event log with appropriate color
@@ -132,6 +203,18 @@ class GameRenderer:
         color = self.get_event_color(event)
         self.ui_renderer.add_event(text, color)
         
+        # Draw blocks and DUKE checks on the field, from events so the viewer
+        # shows them whether the game plays inline or on the simulation thread
+        if event.event_type == "block":
+            self.ui_renderer.add_block_visualization(
+                event.data["blocker"], event.data["target"], event.data["result"],
+                event.data["blocker_roll"], event.data["defender_roll"]
+            )
+        elif event.event_type == "duke_check":
+            self.ui_renderer.add_duke_visualization(
+                event.data["goblin"], event.data["blockers"], event.data["success"], event.data["chance"]
+            )
+        
         # Show important messages as overlays
         if event.event_type == "touchdown":
             scorer = event.data.get("goblin")
@@ -177,10 +260,17 @@ class GameRenderer:
             
         elif event.event_type == "game_end":
             winner = event.data.get("winner")
-            if winner:
+            if winner == "Tie":
+                self.ui_renderer.show_message(
+                    "GAME OVER!", 
+                    "The game ends in a tie!",
+                    duration=10.0,
+                    color=(255, 215, 0)
+                )
+            elif winner:
                 self.ui_renderer.show_message(
                     "GAME OVER!", 
-                    f"{winner.name} wins the game!",
+                    f"{winner} wins the game!",
                     duration=10.0,
                     color=(255, 215, 0)
                 )
@@ -255,15 +345,17 @@ class GameRenderer:
                 return "Push attempt!"
             
         elif event.event_type == "play_start":
-            offense = data.get("offense")
-            return f"Play started! {offense.name} on offense."
+            # The event names the offense rather than holding the team
+            return f"Play started! {data.get('offense_team')} on offense."
             
         elif event.event_type == "play_end":
             return "Play ended!"
             
         elif event.event_type == "game_end":
             winner = data.get("winner")
-            return f"Game over! {winner.name} wins!"
+            if winner == "Tie":
+                return "Game over! It's a tie!"
+            return f"Game over! {winner} wins!"
             
         elif event.event_type == "block_attempt":
             blocker = data.get("blocker")
@@ -319,11 +411,57 @@ class GameRenderer:
     def toggle_auto_play(self):
         """Toggle automatic play mode"""
         self.paused = not self.paused
+        self.game.auto_advance = not self.paused
         
     def new_play(self):
         """Start a new play"""
+        if self.game.replay is not None:
+            self.jump_replay(self.game.replay.step_play, 1)
+            return
+        if self.game.simulation is not None:
+            self.game.simulation.advance(PLAY)
+            return
         self.game.controller.start_play()
         
+    def jump_replay(self, jump, *args):
+        """Jump through a recorded match and note where it landed in the event log
+        
+        Args:
+            jump: A ReplayPlayer method (seek, step, step_play or scrub)
+            *args: Arguments for it
+        """
+        if jump(*args):
+            self.ui_renderer.add_event(f"Replay: play {self.game.current_play}, turn {self.game.turn}",
+                                       (0, 200, 200))
+            
+    def handle_replay_key(self, key):
+        """Handle the keys for scrubbing through a recorded match
+        
+        Left/Right step a turn, Page Up/Page Down a play, Home/End go to the ends
+        of the match and 0-9 jump to that tenth of it.
+        
+        Returns:
+            bool: True if the key was a replay key
+        """
+        replay = self.game.replay
+        if key == pygame.K_LEFT:
+            self.jump_replay(replay.step, -1)
+        elif key == pygame.K_RIGHT:
+            self.jump_replay(replay.step, 1)
+        elif key == pygame.K_PAGEUP:
+            self.jump_replay(replay.step_play, -1)
+        elif key == pygame.K_PAGEDOWN:
+            self.jump_replay(replay.step_play, 1)
+        elif key == pygame.K_HOME:
+            self.jump_replay(replay.scrub, 0.0)
+        elif key == pygame.K_END:
+            self.jump_replay(replay.scrub, 1.0)
+        elif pygame.K_0 <= key <= pygame.K_9:
+            self.jump_replay(replay.scrub, (key - pygame.K_0) / 10)
+        else:
+            return False
+        return True
+        
     def increase_speed(self):
         """Increase animation speed"""
         self.animation_speed = min(5.0, self.animation_speed + 0.5)
@@ -356,8 +494,7 @@ class GameRenderer:
         # Calculate grid coordinates
         grid_width = self.game.grid_size * self.cell_size
         grid_height = self.game.grid_size * self.cell_size
-        offset_x = (self.screen_width - 300 - grid_width) // 2 + 300
-        offset_y = (self.screen_height - grid_height - 100) // 2
+        offset_x, offset_y = self.grid_offset()
         
         if (pos[0] < offset_x or pos[0] >= offset_x + grid_width or 
             pos[1] < offset_y or pos[1] >= offset_y + grid_height):
@@ -369,31 +506,30 @@ class GameRenderer:
         grid_x = (pos[0] - offset_x) // self.cell_size
         grid_y = (pos[1] - offset_y) // self.cell_size
         
-        # Find goblin at this position
-        for team in [self.game.team1, self.game.team2]:
-            for goblin in team.goblins:
-                if not goblin.out_of_game and goblin.position == (grid_x, grid_y):
-                    self.selected_goblin = goblin
-                    return
-                    
-        # No goblin at this position
-        self.selected_goblin = None
+        # Select the goblin at this position, if any
+        goblin = self.game.grid.get_entity_at_position((grid_x, grid_y))
+        self.selected_goblin = goblin if goblin is not None and not goblin.out_of_game else None
     
     def run(self):
         """Run the game loop"""
         running = True
         clock = pygame.time.Clock()
-        fps = 60
+        elapsed = 1.0 / self.fps  # Seconds since the last frame
         
         while running:
             # Process events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    # The window was uncovered, so nothing on screen can be trusted
+                    self.dirty_regions.invalidate()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(event.pos)
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+                    if self.game.replay is not None and self.handle_replay_key(event.key):
+                        pass
+                    elif event.key == pygame.K_ESCAPE:
                         running = False
                     elif event.key == pygame.K_SPACE:
                         self.next_turn()
@@ -408,15 +544,26 @@ class GameRenderer:
             if not self.paused and self.game.auto_advance_turns():
                 pass  # Turn was advanced
                 
-            # Update animations
-            if self.game.animation_manager:
-                self.game.animation_manager.update(1.0 / fps * self.animation_speed)
+            # Show the turns the simulation thread has finished
+            simulation = self.game.simulation
+            if simulation is not None:
+                simulation.update()
+                
+            # Update animations by the real time since the last frame, which is
+            # longer while the viewer idles
+            animation_manager = self.game.animation_manager
+            if animation_manager:
+                animation_manager.update(elapsed * self.animation_speed)
             
-            # Draw the game
-            self.draw()
+            # Draw what changed
+            drew = self.draw()
             
-            # Limit to 60 FPS
-            clock.tick(fps)
+            # Run at full speed while anything is changing, and idle otherwise
+            busy = (drew or not self.paused or (animation_manager and not animation_manager.is_complete())
+                    or (simulation is not None and simulation.due))
+            elapsed = clock.tick(self.fps if busy else self.idle_fps) / 1000.0
         
         # Clean up
+        if self.game.simulation is not None:
+            self.game.simulation.stop()
         pygame.quit() 
\ No newline at end of file
@@ -0,0 +1,571 @@
+"""
+Binary replays for Goblinball
+A replay file holds a header (seed, field size and both team rosters) followed by
+a stream of fixed-width 8-byte action records: moves, pushes, blocks, DUKE checks,
+knockdowns, scores and turn markers. Records are grouped into zlib-compressed
+segments, and every segment opens with a keyframe holding the full state of every
+goblin. An index of segments at the end of the file lets a reader jump to any turn
+by decoding a single segment, and counts each segment's turn starts so the turns
+in a match can be listed without decoding any.
+
+ReplayWriter is an EventManager sink, so a game records itself as it plays.
+ReplayPlayer shows a recording in a Game (see Game.from_replay), so the viewer can
+jump to any play or turn without running the AI.
+Run from any directory: python goblinball/replay.py <replay file> [--play N --turn N]
+"""
+
+import os
+import sys
+import zlib
+import struct
+import bisect
+import argparse
+
+# Make the flat module imports work when run from elsewhere
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from config import CONFIG
+
+MAGIC = b"GBRP"
+INDEX_MAGIC = b"GBIX"
+VERSION = 2
+
+# Every record: kind, slot, x, y, value, extra
+RECORD = struct.Struct("<BBBBhh")
+SEGMENT = struct.Struct("<II")  # Compressed and raw length of a segment
+INDEX_ENTRY = struct.Struct("<HHIH")  # Play, turn, file offset and turn start count of a segment
+FOOTER = struct.Struct("<I4s")  # File offset of the index, INDEX_MAGIC
+
+# Record kinds
+MOVE = 1            # slot moved to (x, y), value: movement left
+PUSH = 2            # slot pushed to (x, y), value: pusher's slot
+BLOCK = 3           # slot blocked x (a slot), y: result code, value/extra: blocker/defender roll
+DUKE = 4            # slot left a zone of control, x: blockers, y: success, value: chance x 10000
+KNOCKDOWN = 5       # slot was knocked down
+BALL_DROPPED = 6    # slot dropped the ball at (x, y)
+TOUCHDOWN = 7       # slot scored at (x, y), value: points
+FIELD_GOAL = 8      # slot kicked a field goal from (x, y), value: points
+FIELD_GOAL_MISS = 9 # slot missed from (x, y), value: chance x 10000, extra: distance
+TURN_START = 10     # value: turn, extra: play
+TURN_END = 11       # value: turn, extra: play
+PLAY_START = 12     # slot: carrier, x: offense team, extra: play
+PLAY_END = 13       # x, y: team scores, value: turns, extra: play
+GAME_END = 14       # x, y: team scores, extra: plays
+KEYFRAME = 15       # x, y: team scores, slot: offense team, value: turn, extra: play
+GOBLIN = 16         # slot at (x, y), value: movement, extra: GOBLIN_* flags
+TRAIL = 17          # next point (x, y) of slot's movement trail
+
+# GOBLIN record flags
+GOBLIN_KNOCKED_DOWN = 1
+GOBLIN_HAS_BALL = 2
+GOBLIN_ON_GRID = 4
+GOBLIN_UNAVAILABLE = 8
+GOBLIN_OUT_OF_GAME = 16
+GOBLIN_HAS_TRAIL = 32
+
+BLOCK_RESULTS = ["fail", "push", "knockdown"]
+NO_SLOT = 255
+
+
+def write_string(out, text):
+    """Append a length-prefixed UTF-8 string"""
+    data = text.encode("utf-8")[:255]
+    out.append(len(data))
+    out.extend(data)
+
+
+def read_string(data, offset):
+    """Read a length-prefixed UTF-8 string
+
+    Returns:
+        tuple: (string, offset after it)
+    """
+    length = data[offset]
+    return data[offset + 1:offset + 1 + length].decode("utf-8"), offset + 1 + length
+
+
+class ReplayWriter:
+    """Streams a game's events to a replay file, as the game's EventManager sink"""
+
+    def __init__(self, path, game, keyframe_interval=None):
+        """Open the file and write the header
+
+        Args:
+            path: File to write
+            game: The game being recorded, before its first play
+            keyframe_interval: Turns between keyframes within a play, defaults to
+                               the "replay_keyframe_interval" config value
+        """
+        self.path = path
+        self.game = game
+        self.keyframe_interval = keyframe_interval or CONFIG.get("replay_keyframe_interval", 10)
+        self.file = open(path, "wb")
+
+        self.records = bytearray()  # Records of the segment being written
+        self.segment_key = None  # (play, turn) of that segment's keyframe
+        self.segment_turns = 0  # Turn starts recorded in that segment
+        self.index = []
+
+        header = bytearray(MAGIC)
+        header.append(VERSION)
+        write_string(header, str(game.seed))
+        header.extend([game.grid.width, game.grid.height, game.trail_length,
+                       game.config.get("blocking_cost", 2), len(game.roster.teams)])
+        for team in game.roster.teams:
+            write_string(header, team.name)
+            header.extend(team.color[:3])
+            header.append(len(team.goblins))
+        for goblin in game.roster.goblins:
+            write_string(header, goblin.name)
+            header.extend([goblin.strength, goblin.toughness, goblin.max_movement, goblin.agility])
+        self.file.write(header)
+
+    def record(self, kind, slot=0, x=0, y=0, value=0, extra=0):
+        """Append one record to the current segment"""
+        self.records += RECORD.pack(kind, slot, x, y, value, extra)
+
+    def write(self, event):
+        """Translate an event into records"""
+        event_type = event.event_type
+        if event_type == "move":
+            # The event fires once the move's cost is taken off
+            x, y = event.to_pos
+            self.record(MOVE, event.goblin.slot, x, y, event.goblin.movement)
+        elif event_type == "turn_start":
+            if event.turn % self.keyframe_interval == 0:
+                self.write_keyframe(event.play, event.turn)
+            self.record(TURN_START, value=event.turn, extra=event.play)
+            self.segment_turns += 1
+        elif event_type == "duke_check":
+            self.record(DUKE, event.goblin.slot, len(event.blockers), int(event.success),
+                        int(round(event.chance * 10000)))
+        elif event_type == "block":
+            self.record(BLOCK, event.blocker.slot, event.target.slot, BLOCK_RESULTS.index(event.result),
+                        event.blocker_roll, event.defender_roll)
+        elif event_type == "push":
+            x, y = event.to_pos
+            self.record(PUSH, event.target.slot, x, y, event.pusher.slot)
+        elif event_type == "knockdown":
+            self.record(KNOCKDOWN, event.goblin.slot)
+        elif event_type == "ball_dropped":
+            x, y = event.position
+            self.record(BALL_DROPPED, event.goblin.slot, x, y)
+        elif event_type in ("touchdown", "field_goal"):
+            x, y = event.position
+            self.record(TOUCHDOWN if event_type == "touchdown" else FIELD_GOAL, event.carrier.slot, x, y, event.points)
+        elif event_type == "field_goal_miss":
+            x, y = event.position
+            self.record(FIELD_GOAL_MISS, event.carrier.slot, x, y, int(round(event.success_chance * 10000)),
+                        event.distance)
+        elif event_type == "turn_end":
+            self.record(TURN_END, value=event.turn, extra=event.play)
+        elif event_type == "play_start":
+            self.write_keyframe(event.play_number, 0)
+            carrier = event.carrier.slot if event.carrier else NO_SLOT
+            self.record(PLAY_START, carrier, self.game.roster.teams.index(event.offense_team),
+                        extra=event.play_number)
+            self.segment_turns += 1
+        elif event_type == "play_end":
+            self.record(PLAY_END, 0, *self.scores(), value=event.turns, extra=event.play_number)
+        elif event_type == "game_end":
+            self.record(GAME_END, 0, *self.scores(), extra=event.plays)
+
+    def scores(self):
+        """Both teams' scores, clamped to a byte"""
+        return [min(255, team.score) for team in self.game.roster.teams]
+
+    def write_keyframe(self, play, turn):
+        """Close the current segment and start a new one with the full game state"""
+        self.flush_segment()
+        self.segment_key = (play, turn)
+
+        game = self.game
+        roster = game.roster
+        offense = roster.teams.index(game.offense_team)
+        self.record(KEYFRAME, offense, *self.scores(), value=turn, extra=play)
+
+        on_grid = game.grid.positions
+        for slot, goblin in enumerate(roster.goblins):
+            trail = game.movement_trails.get(goblin.id)
+            flags = ((GOBLIN_KNOCKED_DOWN if goblin.knocked_down else 0) |
+                     (GOBLIN_HAS_BALL if goblin.has_ball else 0) |
+                     (GOBLIN_ON_GRID if goblin in on_grid else 0) |
+                     (GOBLIN_UNAVAILABLE if goblin.unavailable else 0) |
+                     (GOBLIN_OUT_OF_GAME if goblin.out_of_game else 0) |
+                     (GOBLIN_HAS_TRAIL if trail is not None else 0))
+            x, y = goblin.position
+            self.record(GOBLIN, slot, x, y, goblin.movement, flags)
+            for x, y in trail or ():
+                self.record(TRAIL, slot, x, y)
+
+    def flush_segment(self):
+        """Compress and write the records gathered since the last keyframe"""
+        if self.segment_key is None or self.file is None:
+            return
+        offset = self.file.tell()
+        compressed = zlib.compress(bytes(self.records))
+        self.file.write(SEGMENT.pack(len(compressed), len(self.records)))
+        self.file.write(compressed)
+        self.index.append((self.segment_key[0], self.segment_key[1], offset, self.segment_turns))
+        self.records = bytearray()
+        self.segment_key = None
+        self.segment_turns = 0
+
+    def close(self):
+        """Write the last segment and the index, then close the file"""
+        if self.file is None:
+            return
+        self.flush_segment()
+        index_offset = self.file.tell()
+        self.file.write(struct.pack("<I", len(self.index)))
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(index_offset, INDEX_MAGIC))
+        self.file.close()
+        self.file = None
+
+
+class ReplayState:
+    """Every goblin's state at the start of a turn, rebuilt from a replay"""
+
+    def __init__(self, play, turn, offense, scores, rows, unavailable, out_of_game):
+        """Create a state
+
+        Args:
+            play: Play number
+            turn: Turn number within the play, 0 for the start of the play
+            offense: Index of the team on offense
+            scores: List of team scores
+            rows: One history row per roster slot (see history.py)
+            unavailable: Slots sitting out the play
+            out_of_game: Slots out for the rest of the game
+        """
+        self.play = play
+        self.turn = turn
+        self.offense = offense
+        self.scores = scores
+        self.rows = rows
+        self.unavailable = unavailable
+        self.out_of_game = out_of_game
+
+
+class ReplayReader:
+    """Reads a replay file and rebuilds the game state at any turn"""
+
+    def __init__(self, path):
+        """Read the header and the segment index
+
+        Args:
+            path: Replay file to read
+
+        Raises:
+            ValueError: If the file is not a replay
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+
+        data = self.data
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a Goblinball replay")
+        self.version = data[4]
+        if self.version != VERSION:
+            raise ValueError(f"Unsupported replay version {self.version}")
+
+        seed, offset = read_string(data, 5)
+        self.seed = int(seed)
+        self.width, self.height, self.trail_length, self.blocking_cost, team_count = data[offset:offset + 5]
+        offset += 5
+
+        self.teams = []
+        for _ in range(team_count):
+            name, offset = read_string(data, offset)
+            color = tuple(data[offset:offset + 3])
+            self.teams.append({"name": name, "color": color, "size": data[offset + 3], "goblins": []})
+            offset += 4
+
+        # Goblins in roster slot order, with the index of their team
+        self.goblins = []
+        for team_index, team in enumerate(self.teams):
+            for _ in range(team["size"]):
+                name, offset = read_string(data, offset)
+                strength, toughness, movement, agility = data[offset:offset + 4]
+                offset += 4
+                goblin = {"name": name, "strength": strength, "toughness": toughness,
+                          "movement": movement, "agility": agility, "team": team_index}
+                team["goblins"].append(goblin)
+                self.goblins.append(goblin)
+        self.segments_start = offset
+
+        self.index = self.read_index()
+        self.keys = [(play, turn) for play, turn, _, _ in self.index]
+        self.segment_cache = {}
+
+    def read_index(self):
+        """Read the segment index, or rebuild it if the file was never closed
+
+        Returns:
+            list: (play, turn, offset, turn start count) of every segment, in file order
+        """
+        data = self.data
+        if len(data) >= FOOTER.size:
+            index_offset, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                count = struct.unpack_from("<I", data, index_offset)[0]
+                return [INDEX_ENTRY.unpack_from(data, index_offset + 4 + i * INDEX_ENTRY.size)
+                        for i in range(count)]
+
+        # Walk the segments, stopping at the first one cut short
+        index = []
+        offset = self.segments_start
+        while offset + SEGMENT.size <= len(data):
+            compressed_length, _ = SEGMENT.unpack_from(data, offset)
+            end = offset + SEGMENT.size + compressed_length
+            if end > len(data):
+                break
+            records = self.decode_segment(offset)
+            _, _, _, _, turn, play = RECORD.unpack_from(records, 0)
+            count = sum(1 for kind, *_ in RECORD.iter_unpack(records) if kind in (PLAY_START, TURN_START))
+            index.append((play, turn, offset, count))
+            offset = end
+        return index
+
+    def decode_segment(self, offset):
+        """Decompress the segment at a file offset
+
+        Returns:
+            bytes: The segment's records
+        """
+        compressed_length, _ = SEGMENT.unpack_from(self.data, offset)
+        start = offset + SEGMENT.size
+        return zlib.decompress(self.data[start:start + compressed_length])
+
+    def segment_records(self, segment):
+        """Decode the records of a segment, keeping the most recent one decoded
+
+        Args:
+            segment: Position of the segment in the index
+
+        Returns:
+            list: (kind, slot, x, y, value, extra) tuples
+        """
+        records = self.segment_cache.get(segment)
+        if records is None:
+            records = list(RECORD.iter_unpack(self.decode_segment(self.index[segment][2])))
+            self.segment_cache = {segment: records}
+        return records
+
+    def records(self):
+        """Iterate over every record in the file, in order"""
+        for segment in range(len(self.index)):
+            yield from self.segment_records(segment)
+
+    def turns(self):
+        """List the (play, turn) of every turn start in the replay, play starts as turn 0
+
+        Read from the index alone: a segment starts at its keyframe's turn and the
+        turns within a play are numbered one after another.
+        """
+        return [(play, turn + n) for play, turn, _, count in self.index for n in range(count)]
+
+    def state_at(self, play, turn=0):
+        """Rebuild the state at the start of a turn, as it stood when the turn began
+
+        Finds the last keyframe at or before the turn with a binary search of the
+        index, then applies the records after it up to the turn's start.
+
+        Args:
+            play: Play number
+            turn: Turn number within the play, 0 for the start of the play
+
+        Returns:
+            ReplayState or None: The state, or None if the replay has no such turn
+        """
+        segment = bisect.bisect_right(self.keys, (play, turn)) - 1
+        if segment < 0:
+            return None
+
+        state = None
+        for kind, slot, x, y, value, extra in self.segment_records(segment):
+            if kind == KEYFRAME:
+                state = ReplayState(extra, value, slot, [x, y], [None] * len(self.goblins), set(), set())
+                trails = {}
+            elif kind == GOBLIN:
+                state.rows[slot] = [(x, y), bool(extra & GOBLIN_ON_GRID), bool(extra & GOBLIN_KNOCKED_DOWN),
+                                    value, bool(extra & GOBLIN_HAS_BALL), None]
+                if extra & GOBLIN_HAS_TRAIL:
+                    trails[slot] = []
+                if extra & GOBLIN_UNAVAILABLE:
+                    state.unavailable.add(slot)
+                if extra & GOBLIN_OUT_OF_GAME:
+                    state.out_of_game.add(slot)
+            elif kind == TRAIL:
+                trails[slot].append((x, y))
+            elif (kind == PLAY_START and (extra, 0) == (play, turn)) or \
+                 (kind == TURN_START and (extra, value) == (play, turn)):
+                for slot, trail in trails.items():
+                    state.rows[slot][5] = tuple(trail)
+                state.play, state.turn = play, turn
+                state.rows = tuple(tuple(row) for row in state.rows)
+                return state
+            else:
+                self.apply_record(state, trails, kind, slot, x, y, value)
+
+        return None
+
+    def apply_record(self, state, trails, kind, slot, x, y, value):
+        """Update a state with one action record
+
+        Args:
+            state: The ReplayState to update, with rows as lists
+            trails: Slot -> list of trail points
+            kind, slot, x, y, value: Fields of the record
+        """
+        if kind == MOVE:
+            row = state.rows[slot]
+            trail = trails.setdefault(slot, [])
+            if not trail or trail[-1] != row[0]:
+                trail.append(row[0])
+            trail.append((x, y))
+            del trail[:-self.trail_length]
+            row[0] = (x, y)
+            row[3] = value
+        elif kind == PUSH:
+            state.rows[slot][0] = (x, y)
+        elif kind == BLOCK:
+            state.rows[slot][3] -= self.blocking_cost
+        elif kind == KNOCKDOWN:
+            state.rows[slot][2] = True
+        elif kind in (BALL_DROPPED, FIELD_GOAL_MISS):
+            state.rows[slot][4] = False
+        elif kind in (TOUCHDOWN, FIELD_GOAL):
+            state.scores[self.goblins[slot]["team"]] += value
+        elif kind == TURN_START:
+            # Goblins on their feet get their movement back at the start of a turn
+            for slot, row in enumerate(state.rows):
+                if not row[2] and slot not in state.unavailable:
+                    row[3] = self.goblins[slot]["movement"]
+
+
+class ReplayPlayer:
+    """Shows a recorded match in a Game, jumping between turns without running the AI"""
+
+    def __init__(self, game, reader):
+        """Attach a replay to a game built from its header (see Game.from_replay)
+
+        Args:
+            game: The game to show the replay in
+            reader: ReplayReader of the match
+        """
+        self.game = game
+        self.reader = reader
+
+        # (play, turn) of every turn start, in order; turn 0 is the start of a play
+        self.turns = reader.turns()
+        self.plays = sorted({play for play, _ in self.turns})
+        self.index = -1
+
+        # Rows the game is showing, so a jump only touches the goblins that differ
+        self.shown_rows = None
+
+    def __len__(self):
+        """Number of turn starts in the replay"""
+        return len(self.turns)
+
+    def show(self, index):
+        """Show the state at one turn start
+
+        Args:
+            index: Position in self.turns
+
+        Returns:
+            bool: True if the game now shows that turn
+        """
+        if not 0 <= index < len(self.turns):
+            return False
+        state = self.reader.state_at(*self.turns[index])
+        if state is None:
+            return False
+
+        game = self.game
+        if self.shown_rows is None:
+            changes = dict(enumerate(state.rows))
+        else:
+            changes = {slot: row for slot, row in enumerate(state.rows) if row != self.shown_rows[slot]}
+        game.apply_history_snapshot((state.turn, state.play, changes))
+        self.shown_rows = state.rows
+        self.index = index
+
+        for slot, goblin in enumerate(game.roster.goblins):
+            goblin.unavailable = slot in state.unavailable
+            goblin.out_of_game = slot in state.out_of_game
+        for team, score in zip(game.roster.teams, state.scores):
+            team.score = score
+
+        offense = game.roster.teams[state.offense]
+        if offense is not game.offense_team:
+            game.offense_team, game.defense_team = game.defense_team, game.offense_team
+            game.offense_team.is_offense = True
+            game.defense_team.is_offense = False
+
+        game.play_complete = False
+        game.game_complete = index == len(self.turns) - 1
+        return True
+
+    def seek(self, play, turn=0):
+        """Show the last recorded turn start at or before a play and turn
+
+        Returns:
+            bool: True if the game moved to a recorded turn
+        """
+        return self.show(max(0, bisect.bisect_right(self.turns, (play, turn)) - 1))
+
+    def step(self, turns=1):
+        """Move forward (or back, for a negative count) through the recorded turns"""
+        return self.show(self.index + turns)
+
+    def step_play(self, plays=1):
+        """Jump to the start of a later (or earlier, for a negative count) play"""
+        play = self.turns[self.index][0] if self.index >= 0 else self.plays[0]
+        position = bisect.bisect_left(self.plays, play) + plays
+        if not 0 <= position < len(self.plays):
+            return False
+        return self.seek(self.plays[position])
+
+    def scrub(self, fraction):
+        """Jump to a point part way through the match, 0.0 for the start and 1.0 for the end"""
+        return self.show(min(len(self.turns) - 1, max(0, int(fraction * len(self.turns)))))
+
+
+def main():
+    """Print a summary of a replay, or the state at one turn"""
+    parser = argparse.ArgumentParser(description="Inspect a Goblinball replay")
+    parser.add_argument("replay")
+    parser.add_argument("--play", type=int, default=None)
+    parser.add_argument("--turn", type=int, default=0)
+    args = parser.parse_args()
+
+    reader = ReplayReader(args.replay)
+    names = [team["name"] for team in reader.teams]
+    turns = reader.turns()
+    print(f"{args.replay}: seed {reader.seed}, {reader.width}x{reader.height}, {' vs '.join(names)}, "
+          f"{len(turns)} turn starts in {len(reader.index)} segments, {len(reader.data)} bytes")
+
+    if args.play is not None:
+        state = reader.state_at(args.play, args.turn)
+        if state is None:
+            print(f"No turn {args.turn} in play {args.play}")
+            return
+        print(f"Play {state.play}, turn {state.turn}: {names[0]} {state.scores[0]} - {state.scores[1]} {names[1]}, "
+              f"{names[state.offense]} on offense")
+        for goblin, row in zip(reader.goblins, state.rows):
+            position, on_grid, knocked_down, movement, has_ball, _ = row
+            status = "off the field" if not on_grid else ("down" if knocked_down else "up")
+            print(f"  {goblin['name']:<24} {names[goblin['team']]:<14} {str(position):<9} {status:<13} "
+                  f"movement {movement}{' (ball)' if has_ball else ''}")
+
+
+if __name__ == "__main__":
+    main()
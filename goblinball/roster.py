@@ -0,0 +1,45 @@
+"""
+Roster for Goblinball
+This module numbers every goblin in a game with a fixed slot, so turn history,
+replays and the viewer's simulation thread can store per-goblin state in plain
+rows and records instead of holding on to Goblin objects.
+"""
+
+
+class Roster:
+    """The goblins and teams of one game, in slot order"""
+
+    def __init__(self, teams=()):
+        """Create a roster
+
+        Args:
+            teams: Teams whose goblins should be added straight away
+        """
+        self.goblins = []  # slot -> goblin
+        self.teams = []  # team index -> team
+
+        for team in teams:
+            for goblin in team.goblins:
+                self.add(goblin)
+
+    def __len__(self):
+        """Number of goblins in the roster"""
+        return len(self.goblins)
+
+    def add(self, goblin):
+        """Give a goblin the next slot, and its team the next team index if it is new
+
+        Args:
+            goblin: The goblin to add
+
+        Returns:
+            int: The goblin's slot
+        """
+        team = getattr(goblin, 'team', None)
+        if team is not None and team not in self.teams:
+            self.teams.append(team)
+
+        slot = len(self.goblins)
+        self.goblins.append(goblin)
+        goblin.slot = slot
+        return slot
@@ -0,0 +1,218 @@
+"""
+Headless simulation engine for Goblinball
+This module plays complete games without any rendering so they can be run in bulk
+on machines without a display. It never imports pygame or the renderer modules.
+"""
+
+import time
+import random
+import logging
+from config import CONFIG
+from team import Team
+from game import Game
+from logger import DEBUG
+
+logger = logging.getLogger("goblinball.simulation")
+
+class SimulationResult:
+    """Summary of a single headless game"""
+
+    def __init__(self, game, elapsed, counters):
+        """Build the result from a finished game
+
+        Args:
+            game: The completed Game instance
+            elapsed: Wall time spent playing the game, in seconds
+            counters: Per-team event counts collected while the game ran
+        """
+        self.seed = game.seed
+        self.team1_name = game.team1.name
+        self.team2_name = game.team2.name
+        self.team1_score = game.team1.score
+        self.team2_score = game.team2.score
+        self.plays = game.current_play
+        self.turns = counters["turns"]
+        self.completed = game.game_complete
+        self.elapsed = elapsed
+
+        # Per-team counts keyed by team name
+        self.touchdowns = counters["touchdowns"]
+        self.field_goals = counters["field_goals"]
+        self.knockdowns = counters["knockdowns"]
+        self.injuries = counters["injuries"]
+
+        if self.team1_score > self.team2_score:
+            self.winner = self.team1_name
+        elif self.team2_score > self.team1_score:
+            self.winner = self.team2_name
+        else:
+            self.winner = None  # Tie
+
+    def to_dict(self):
+        """Convert result to dictionary for saving/loading"""
+        return {
+            "seed": self.seed,
+            "team1_name": self.team1_name,
+            "team2_name": self.team2_name,
+            "team1_score": self.team1_score,
+            "team2_score": self.team2_score,
+            "winner": self.winner,
+            "plays": self.plays,
+            "turns": self.turns,
+            "completed": self.completed,
+            "elapsed": self.elapsed,
+            "touchdowns": self.touchdowns,
+            "field_goals": self.field_goals,
+            "knockdowns": self.knockdowns,
+            "injuries": self.injuries
+        }
+
+    def __str__(self):
+        """String representation for logging"""
+        return (f"{self.team1_name} {self.team1_score} - {self.team2_score} {self.team2_name} "
+                f"({self.plays} plays, {self.turns} turns)")
+
+
+class SimulationEngine:
+    """Plays Goblinball games to completion without a renderer"""
+
+    def __init__(self, team1=None, team2=None, team_size=5, debug_logging=False, seed=None, fast_events=True):
+        """Initialize the engine
+
+        Args:
+            team1: First team, or None to create a default team
+            team2: Second team, or None to create a default team
+            team_size: Number of goblins to create for default teams
+            debug_logging: Whether the AI debug log is written while run_game plays
+            seed: Seed for default teams and game seeds, or None to use the random module
+            fast_events: Skip building events nobody listens to (see EventManager.fast_path),
+                         which leaves them out of the event history
+        """
+        # Source of default teams and of the seed of every game that isn't given one
+        self.rng = random.Random(seed) if seed is not None else random
+
+        if team1 is None:
+            team1 = Team("Mudcrushers", (200, 50, 50))
+            team1.create_team(team_size, rng=self.rng)
+        if team2 is None:
+            team2 = Team("Skullsmashers", (50, 50, 200))
+            team2.create_team(team_size, rng=self.rng)
+
+        self.team1 = team1
+        self.team2 = team2
+        self.game = None
+        self.fast_events = fast_events
+
+        # The debug log is shared by every game in the process, so run_game only
+        # switches it for the games it plays and puts it back afterwards
+        self.debug_logging = debug_logging
+
+        # Safety net against a play that never completes
+        self.max_turns_per_game = (CONFIG.get("plays_per_game", 20) + 1) * (CONFIG.get("max_turns_per_play", 30) + 2)
+
+    def create_game(self, seed=None):
+        """Create a fresh game between the engine's teams
+
+        Args:
+            seed: Seed for the game's random stream, or None to draw one from the engine
+
+        Returns:
+            Game: The new game, ready for its first play
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+
+        self.team1.reset_for_new_game()
+        self.team2.reset_for_new_game()
+        self.game = Game(self.team1, self.team2, seed=seed)
+        self.game.event_manager.fast_path = self.fast_events
+        return self.game
+
+    def run_game(self, seed=None):
+        """Play a full game in a tight loop
+
+        Args:
+            seed: Seed for the game's random stream, or None to draw one from the engine
+
+        Returns:
+            SimulationResult: Summary of the finished game
+        """
+        debug_enabled = DEBUG.enabled
+        DEBUG.enabled = self.debug_logging
+        try:
+            game = self.create_game(seed)
+            counters = self.attach_counters(game)
+
+            start_time = time.perf_counter()
+            try:
+                game.start_play()
+
+                steps = 0
+                while not game.game_complete and steps < self.max_turns_per_game:
+                    if game.play_complete:
+                        game.start_play()
+                    else:
+                        game.process_turn()
+                    steps += 1
+            finally:
+                # Finish the replay of a game that ran out of steps or raised
+                game.close()
+        finally:
+            DEBUG.enabled = debug_enabled
+
+        if not game.game_complete:
+            logger.warning(f"Game stopped after {steps} steps without completing")
+
+        elapsed = time.perf_counter() - start_time
+        return SimulationResult(game, elapsed, counters)
+
+    def run(self, num_games):
+        """Play several games back to back
+
+        Args:
+            num_games: Number of games to play
+
+        Returns:
+            list: A SimulationResult for each game
+        """
+        return [self.run_game() for _ in range(num_games)]
+
+    def attach_counters(self, game):
+        """Register listeners that tally per-team events during a game
+
+        Args:
+            game: The game to listen to
+
+        Returns:
+            dict: Counters that fill in as the game is played
+        """
+        team_names = [game.team1.name, game.team2.name]
+        counters = {
+            "turns": 0,
+            "touchdowns": {name: 0 for name in team_names},
+            "field_goals": {name: 0 for name in team_names},
+            "knockdowns": {name: 0 for name in team_names},
+            "injuries": {name: 0 for name in team_names}
+        }
+        goblin_teams = {g.id: g.team.name for team in [game.team1, game.team2] for g in team.goblins}
+
+        def on_turn(event):
+            counters["turns"] += 1
+
+        def on_score(event):
+            counters[event.event_type + "s"][event.data["team_name"]] += 1
+
+        def on_goblin_event(event):
+            # Knockdowns and injuries are credited to the team that suffered them
+            team_name = goblin_teams.get(event.data.get("goblin_id"))
+            if team_name:
+                key = "knockdowns" if event.event_type == "knockdown" else "injuries"
+                counters[key][team_name] += 1
+
+        game.event_manager.add_listener("turn_start", on_turn)
+        game.event_manager.add_listener("touchdown", on_score)
+        game.event_manager.add_listener("field_goal", on_score)
+        game.event_manager.add_listener("knockdown", on_goblin_event)
+        game.event_manager.add_listener("injury", on_goblin_event)
+
+        return counters
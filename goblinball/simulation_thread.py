@@ -0,0 +1,279 @@
+"""
+Simulation thread for the Goblinball viewer
+Working out a turn runs every goblin's AI, which can take hundreds of milliseconds
+on a big field. Run inline in the render loop, that freezes drawing and input for
+the whole turn. Instead, the live game plays on a worker thread and publishes an
+immutable TurnSnapshot after each turn. The viewer shows a second Game built from
+copies of both teams (see Game.run_on_worker), and only ever applies snapshots
+to it, so the live game is never touched by the render thread.
+The AI is pure Python, so under the GIL the worker still competes with drawing,
+and the frames benchmark shows no shorter frames than inline play. The viewer
+only uses it when the "simulation_thread" config value is set.
+"""
+
+import copy
+import queue
+import logging
+import threading
+from collections import deque
+
+from team import Team
+from goblin import Goblin
+from event import TypedEvent
+from history import capture_rows
+
+logger = logging.getLogger("goblinball.simulation_thread")
+
+# Commands the worker understands
+TURN = "turn"  # Play one turn, as the Next Turn button does
+PLAY = "play"  # Start a new play, as the New Play button does
+ADVANCE = "advance"  # One step of auto play: a turn, or the next play once this one is over
+
+
+class TurnSnapshot:
+    """The state of the live game after a step, as plain values that are never changed"""
+
+    __slots__ = ("play", "turn", "offense", "scores", "rows", "stats", "unavailable", "out_of_game",
+                 "play_complete", "game_complete", "events")
+
+    def __init__(self, play, turn, offense, scores, rows, stats, unavailable, out_of_game,
+                 play_complete, game_complete, events):
+        """Create a snapshot
+
+        Args:
+            play: Play number
+            turn: Turn number within the play
+            offense: Index of the team on offense
+            scores: Tuple of team scores
+            rows: One history row per roster slot (see history.py)
+            stats: (strength, toughness, max_movement) per roster slot, which injuries lower
+            unavailable: Frozenset of slots sitting out the play
+            out_of_game: Frozenset of slots out for the rest of the game
+            play_complete: Whether the play is over
+            game_complete: Whether the game is over
+            events: Tuple of the events dispatched during the step, oldest first
+        """
+        self.play = play
+        self.turn = turn
+        self.offense = offense
+        self.scores = scores
+        self.rows = rows
+        self.stats = stats
+        self.unavailable = unavailable
+        self.out_of_game = out_of_game
+        self.play_complete = play_complete
+        self.game_complete = game_complete
+        self.events = events
+
+
+class Simulation:
+    """Plays a game on a worker thread and shows each step in another game"""
+
+    def __init__(self, view, game, lookahead=1):
+        """Pair a live game with the game that shows it
+
+        Args:
+            view: The game the renderer draws; only touched from the render thread
+            game: The live game; only touched from the worker thread once it starts
+            lookahead: Steps worked out ahead of the viewer during auto play
+        """
+        self.view = view
+        self.game = game
+        self.lookahead = lookahead
+
+        # Live game's goblins and teams -> their copies in the view, matched by roster slot
+        self.copies = dict(zip(game.roster.goblins, view.roster.goblins))
+        self.copies.update(zip(game.roster.teams, view.roster.teams))
+
+        # Commands to the worker, and snapshots (or the exception that stopped it) back
+        self.commands = queue.Queue()
+        self.snapshots = queue.Queue()
+        self.worker = None
+
+        # Render thread: commands sent without a snapshot back yet, snapshots received but
+        # not shown, and how many of those the viewer is waiting to show
+        self.requested = 0
+        self.ready = deque()
+        self.due = 0
+
+        # Worker thread: events dispatched during the step being played
+        self.collected = []
+
+    def start(self):
+        """Start the worker, forwarding every event type the view has listeners for"""
+        for event_type in self.view.event_manager.listeners:
+            self.game.event_manager.add_listener(event_type, self.collected.append)
+        self.worker = threading.Thread(target=self.run, name="goblinball-simulation", daemon=True)
+        self.worker.start()
+
+    def stop(self):
+        """Stop the worker once it finishes the step it is on, and finish the live game's replay"""
+        if self.worker is not None:
+            self.commands.put(None)
+            self.worker.join()
+            self.worker = None
+        self.game.close()
+
+    def run(self):
+        """Worker thread: carry out commands until stop() sends None"""
+        game = self.game
+        while True:
+            command = self.commands.get()
+            if command is None:
+                return
+            try:
+                if command == PLAY or (command == ADVANCE and game.play_complete):
+                    if not game.game_complete:
+                        game.start_play()
+                else:
+                    game.process_turn()
+                snapshot = self.capture()
+            except Exception as e:
+                logger.exception("Simulation stopped")
+                self.snapshots.put(e)
+                return
+            self.snapshots.put(snapshot)
+
+    def capture(self):
+        """Snapshot the live game, taking the events collected since the last snapshot
+
+        Returns:
+            TurnSnapshot: The snapshot
+        """
+        game = self.game
+        roster = game.roster
+        goblins = roster.goblins
+        events = tuple(self.collected)
+        self.collected.clear()
+        return TurnSnapshot(
+            game.current_play, game.turn, roster.teams.index(game.offense_team),
+            tuple(team.score for team in roster.teams), capture_rows(game),
+            tuple((goblin.strength, goblin.toughness, goblin.max_movement) for goblin in goblins),
+            frozenset(slot for slot, goblin in enumerate(goblins) if goblin.unavailable),
+            frozenset(slot for slot, goblin in enumerate(goblins) if goblin.out_of_game),
+            game.play_complete, game.game_complete, events)
+
+    def request(self, command):
+        """Send the worker a command, starting it the first time"""
+        if self.worker is None:
+            self.start()
+        self.commands.put(command)
+        self.requested += 1
+
+    def advance(self, command=TURN):
+        """Ask for one more step to be shown, as soon as the worker has it
+
+        Args:
+            command: TURN, PLAY or ADVANCE
+
+        Returns:
+            bool: True if a step is on its way, False if there is nothing to do
+        """
+        if self.view.game_complete and not self.ready and not self.requested:
+            return False
+
+        if command == PLAY:
+            # Show anything already worked out on the way, then the new play
+            self.request(PLAY)
+            self.due = len(self.ready) + self.requested
+            return True
+
+        if command == ADVANCE:
+            # Wait for a slow turn rather than piling up steps to rush through
+            if self.due:
+                return False
+            self.due = 1
+            while len(self.ready) + self.requested < self.due + self.lookahead:
+                self.request(ADVANCE)
+            return True
+
+        if self.view.play_complete and not self.ready and not self.requested:
+            return False
+        self.due += 1
+        if len(self.ready) + self.requested < self.due:
+            self.request(command)
+        return True
+
+    def update(self):
+        """Show the steps the viewer is waiting for that the worker has finished
+
+        Returns:
+            bool: True if the view changed
+        """
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(snapshot, Exception):
+                raise snapshot
+            self.requested -= 1
+            self.ready.append(snapshot)
+
+        # Hold new steps back while the Previous Turn button is showing an older one
+        shown = False
+        while self.due and self.ready and self.view.current_history_index < 0:
+            self.due -= 1
+            self.view.save_state_to_history()
+            self.show(self.ready.popleft())
+            shown = True
+        return shown
+
+    def show(self, snapshot):
+        """Bring the view in step with a snapshot and replay its events to the view's listeners
+
+        Args:
+            snapshot: TurnSnapshot from the worker
+        """
+        view = self.view
+        shown_rows = capture_rows(view)
+        changes = {slot: row for slot, row in enumerate(snapshot.rows) if row != shown_rows[slot]}
+        view.apply_history_snapshot((snapshot.turn, snapshot.play, changes))
+
+        for slot, goblin in enumerate(view.roster.goblins):
+            goblin.strength, goblin.toughness, goblin.max_movement = snapshot.stats[slot]
+            goblin.unavailable = slot in snapshot.unavailable
+            goblin.out_of_game = slot in snapshot.out_of_game
+        for team, score in zip(view.roster.teams, snapshot.scores):
+            team.score = score
+
+        offense = view.roster.teams[snapshot.offense]
+        if offense is not view.offense_team:
+            view.offense_team, view.defense_team = view.defense_team, view.offense_team
+            view.offense_team.is_offense = True
+            view.defense_team.is_offense = False
+
+        view.play_complete = snapshot.play_complete
+        view.game_complete = snapshot.game_complete
+
+        for event in snapshot.events:
+            view.event_manager.dispatch(self.copy_event(event))
+
+    def copy_event(self, event):
+        """Copy an event from the live game, pointing it at the view's goblins and teams
+
+        Args:
+            event: An event dispatched by the live game
+
+        Returns:
+            GameEvent: The copy
+        """
+        event = copy.copy(event)
+        if isinstance(event, TypedEvent):
+            for cls in type(event).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if name not in ("event_type", "timestamp", "_data"):
+                        setattr(event, name, self.copy_value(getattr(event, name)))
+            # Rebuilt from the copied fields if anyone asks for it
+            event._data = None
+        else:
+            event._data = {key: self.copy_value(value) for key, value in event._data.items()}
+        return event
+
+    def copy_value(self, value):
+        """Swap a live goblin or team, or a list or tuple of them, for the view's copy"""
+        if isinstance(value, (Goblin, Team)):
+            return self.copies.get(value, value)
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.copy_value(item) for item in value)
+        return value
@@ -41,10 +41,10 @@ class Team:
         self.goblins.append(goblin)
         goblin.team = self
         
-    def create_team(self, num_goblins=5):
-        """Create a team with the specified number of goblins"""
+    def create_team(self, num_goblins=5, rng=None):
+        """Create a team with the specified number of goblins, rolled with rng if given"""
         for _ in range(num_goblins):
-            goblin = Goblin()
+            goblin = Goblin(rng=rng)
             self.add_goblin(goblin)
         
     def get_carrier(self):
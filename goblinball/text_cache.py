@@ -0,0 +1,105 @@
+"""
+Text rendering cache for the Goblinball viewer
+Rendering text is one of the slowest things the viewer does each frame, and most
+of the text on screen is the same from one frame to the next. The renderers share
+one cache of fonts and rendered text surfaces, keyed by font, text and colour,
+that drops the least recently used surfaces once it is full.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from config import CONFIG
+
+
+class TextCache:
+    """Shared fonts and least-recently-used cache of rendered text"""
+
+    def __init__(self, max_surfaces=512):
+        """Create an empty cache
+
+        Args:
+            max_surfaces: Number of rendered surfaces to keep
+        """
+        self.max_surfaces = max_surfaces
+        self.surfaces = OrderedDict()  # (font, text, color) -> surface, oldest first
+        self.fonts = {}  # (name, size, bold) -> pygame Font
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size, bold=False):
+        """Get a system font, creating it the first time it is asked for
+
+        Args:
+            name: Font name, or None for pygame's default font
+            size: Point size
+            bold: Whether to use the bold face
+
+        Returns:
+            pygame.font.Font: The font
+        """
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color):
+        """Render antialiased text, reusing the surface if it was rendered recently
+
+        Args:
+            font: The pygame Font to render with
+            text: The text
+            color: Text colour
+
+        Returns:
+            pygame.Surface: The rendered text; treat it as read-only, as it is shared
+        """
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every rendered surface"""
+        self.surfaces.clear()
+
+
+def wrap_text(font, text, width):
+    """Split text into lines that fit a width when rendered in a font
+
+    Args:
+        font: The pygame Font the lines will be rendered in
+        text: The text to wrap, split at spaces
+        width: Widest a line may be, in pixels
+
+    Returns:
+        list: The lines, each ending in a space
+    """
+    lines = []
+    line = ""
+    for word in text.split(' '):
+        test_line = line + word + " "
+        # If line would be too long with the new word, start a new line
+        if font.size(test_line)[0] > width:
+            lines.append(line)
+            line = word + " "
+        else:
+            line = test_line
+    if line:
+        lines.append(line)
+    return lines
+
+
+TEXT = TextCache(CONFIG.get("text_cache_size", 512))
@@ -2,6 +2,7 @@ import pygame
 import time
 import math
 import logging
+from text_cache import TEXT, wrap_text
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +38,10 @@ class UIRenderer:
         
         # Fonts
         self.fonts = {
-            "small": pygame.font.SysFont(None, 16),
-            "medium": pygame.font.SysFont(None, 24),
-            "large": pygame.font.SysFont(None, 32),
-            "symbol": pygame.font.SysFont(None, 20, bold=True),  # Bold font for symbols
+            "small": TEXT.font(None, 16),
+            "medium": TEXT.font(None, 24),
+            "large": TEXT.font(None, 32),
+            "symbol": TEXT.font(None, 20, bold=True),  # Bold font for symbols
         }
         
         # UI buttons
@@ -79,7 +80,10 @@ class UIRenderer:
             }
         ]
         
-        # Event display
+        # Event display, in a log down the far left side, leaving space for buttons at the bottom
+        self.event_log_rect = pygame.Rect(10, 80, 280, self.screen_height - 160)
+        self.event_log_version = 0  # Bumped whenever the log's contents change
+        self.event_log_surface = None  # (version, surface) of the log as last drawn
         self.displayed_events = []
         self.max_displayed_events = 10  # Show more events
         self.event_display_time = 3.0  # Seconds to display each event
@@ -100,6 +104,7 @@ class UIRenderer:
         # Persistent event symbols
         self.event_symbols = []  # List of event symbols to display (persists longer)
         self.event_symbol_duration = 10.0  # Symbols stay visible for 10 seconds
+        self.symbol_cells = {}  # (x, y) grid cell -> symbols whose hit area overlaps it, oldest first
         
         # Hover state
         self.hovered_goblin = None
@@ -125,13 +130,6 @@ class UIRenderer:
         # Draw event log
         self.draw_event_log(screen)
         
-        # Update hover state
-        if hover_pos:
-            self.update_hover_state(screen, hover_pos)
-        else:
-            self.hovered_goblin = None
-            self.hovered_symbol = None
-        
         # Draw block visualizations
         self.draw_block_visualizations(screen)
         
@@ -149,6 +147,97 @@ class UIRenderer:
         if self.message:
             self.draw_message(screen)
             
+    def update(self, hover_pos=None):
+        """Work out what the mouse is over, ahead of checking what needs drawing
+        
+        Args:
+            hover_pos: The current mouse position
+        """
+        if hover_pos:
+            self.update_hover_state(hover_pos)
+        else:
+            self.hovered_goblin = None
+            self.hovered_symbol = None
+            
+    def grid_offset(self):
+        """Screen position of the field's top-left corner"""
+        grid_size = self.game.grid_size * self.cell_size
+        return (self.screen_width - 300 - grid_size) // 2 + 300, (self.screen_height - grid_size - 100) // 2
+        
+    def popup_rect(self, hover_pos, width, height):
+        """Place an info popup beside the mouse, keeping it on screen"""
+        return pygame.Rect(min(hover_pos[0] + 10, self.screen_width - width - 10),
+                           min(hover_pos[1] + 10, self.screen_height - height - 10), width, height)
+        
+    def dirty_rects(self, regions, hover_pos=None):
+        """Report the UI areas whose contents changed since the last frame
+        
+        Args:
+            regions: The DirtyRegions shared by the renderers
+            hover_pos: The current mouse position
+            
+        Returns:
+            list: Rects that changed
+        """
+        game = self.game
+        now = time.time()
+        rects = []
+        
+        # Scores, play, turn and offense along the top
+        status = (game.team1.name, game.team1.score, game.team2.name, game.team2.score,
+                  game.current_play, game.max_plays, game.turn, game.offense_team.name)
+        rects += regions.check("status", status, (0, 0, self.screen_width, 70))
+        
+        # Buttons only change when the mouse moves onto or off one
+        hovered_button = None
+        for index, button in enumerate(self.buttons):
+            if hover_pos and button["rect"].collidepoint(hover_pos):
+                hovered_button = index
+        button_bar = self.buttons[0]["rect"].unionall([button["rect"] for button in self.buttons[1:]])
+        rects += regions.check("buttons", hovered_button, button_bar.inflate(4, 4))
+        
+        rects += regions.check("event_log", self.event_log_version, self.event_log_rect)
+        
+        # Block arrows, DUKE rings and event symbols on the field, which follow the goblins
+        # they belong to, brighten while new and disappear when they expire
+        offset_x, offset_y = self.grid_offset()
+        grid_size = self.game.grid_size * self.cell_size
+        field = pygame.Rect(offset_x, offset_y, grid_size, grid_size).inflate(2 * self.cell_size, 2 * self.cell_size)
+        blocks = tuple((block["time"], now - block["time"] < 1.0, block["blocker"].position, block["target"].position)
+                       for block in self.block_visualizations if now - block["time"] <= self.block_viz_duration)
+        dukes = tuple((duke["time"], duke["goblin"].position, tuple(blocker.position for blocker in duke["blockers"]))
+                      for duke in self.duke_visualizations if now - duke["time"] <= self.duke_viz_duration)
+        symbols = tuple(symbol["time"] for symbol in self.event_symbols
+                        if now - symbol["time"] <= self.event_symbol_duration)
+        rects += regions.check("overlays", (blocks, dukes, symbols), field if blocks or dukes or symbols else None)
+        
+        # Hover popups, and the highlights they add on the field
+        key = rect = None
+        if self.hovered_goblin:
+            goblin = self.hovered_goblin
+            has_dukes = any(duke["goblin"] == goblin for duke in self.duke_visualizations)
+            popup = self.popup_rect(hover_pos, 250, 200 if has_dukes else 150)
+            key = (goblin.id, tuple(popup), self.flash_timer > 0.5, goblin.position, goblin.movement,
+                   goblin.knocked_down, goblin.has_ball, has_dukes)
+            rect = popup.union(field)
+        elif self.hovered_symbol:
+            symbol = self.hovered_symbol
+            popup = self.popup_rect(hover_pos, 280, 180)
+            symbol_x = offset_x + symbol["position"][0] * self.cell_size + symbol["x_offset"]
+            symbol_y = offset_y + symbol["position"][1] * self.cell_size + symbol["y_offset"]
+            key = (symbol["time"], tuple(popup), 12 + int(3 * math.sin(now * 4)))
+            rect = popup.union(pygame.Rect(symbol_x - 16, symbol_y - 16, 32, 32))
+        rects += regions.check("hover", key, rect)
+        
+        # The centre message, until it expires
+        key = rect = None
+        if self.message and now - self.message_time <= self.message_duration:
+            key = (self.message_time, self.message.get("title"), self.message["text"])
+            rect = (self.screen_width // 2 - 200, self.screen_height // 2 - 50, 400, 100)
+        rects += regions.check("message", key, rect)
+        
+        return rects
+        
     def draw_scoreboard(self, screen):
         """Draw the scoreboard with team scores
         
@@ -157,12 +246,12 @@ class UIRenderer:
         """
         # Draw team 1 score
         team1_text = f"{self.game.team1.name}: {self.game.team1.score}"
-        team1_surface = self.fonts["large"].render(team1_text, True, self.colors["team1"])
+        team1_surface = TEXT.render(self.fonts["large"], team1_text, self.colors["team1"])
         screen.blit(team1_surface, (20, 10))
         
         # Draw team 2 score
         team2_text = f"{self.game.team2.name}: {self.game.team2.score}"
-        team2_surface = self.fonts["large"].render(team2_text, True, self.colors["team2"])
+        team2_surface = TEXT.render(self.fonts["large"], team2_text, self.colors["team2"])
         screen.blit(team2_surface, (self.screen_width - 20 - team2_surface.get_width(), 10))
         
     def draw_game_status(self, screen):
@@ -173,13 +262,13 @@ class UIRenderer:
         """
         # Draw play/turn info
         status_text = f"Play {self.game.current_play}/{self.game.max_plays} - Turn {self.game.turn}"
-        status_surface = self.fonts["medium"].render(status_text, True, self.colors["text"])
+        status_surface = TEXT.render(self.fonts["medium"], status_text, self.colors["text"])
         screen.blit(status_surface, (self.screen_width // 2 - status_surface.get_width() // 2, 15))
         
         # Draw offense team info
         offense_text = f"Offense: {self.game.offense_team.name}"
         offense_color = self.colors["team1"] if self.game.offense_team == self.game.team1 else self.colors["team2"]
-        offense_surface = self.fonts["medium"].render(offense_text, True, offense_color)
+        offense_surface = TEXT.render(self.fonts["medium"], offense_text, offense_color)
         screen.blit(offense_surface, (self.screen_width // 2 - offense_surface.get_width() // 2, 40))
         
     def draw_buttons(self, screen, hover_pos=None):
@@ -201,7 +290,7 @@ class UIRenderer:
             pygame.draw.rect(screen, self.colors["text"], button["rect"], width=2, border_radius=5)
             
             # Draw button text
-            text_surface = self.fonts["medium"].render(button["text"], True, self.colors["button_text"])
+            text_surface = TEXT.render(self.fonts["medium"], button["text"], self.colors["button_text"])
             text_rect = text_surface.get_rect(center=button["rect"].center)
             screen.blit(text_surface, text_rect)
     
@@ -211,12 +300,13 @@ class UIRenderer:
         Args:
             screen: The pygame screen to draw on
         """
-        # Draw event log background
-        log_width = 280  # Slightly wider log
-        log_height = self.screen_height - 160  # Almost full height, leaving space for buttons at bottom
-        
-        # Position log on the far left side of the screen
-        log_rect = pygame.Rect(10, 80, log_width, log_height)
+        # Reuse the log drawn last time if no event has been added since
+        log_rect = self.event_log_rect
+        if self.event_log_surface is not None and self.event_log_surface[0] == self.event_log_version:
+            screen.blit(self.event_log_surface[1], log_rect)
+            return
+            
+        # Draw event log background, on the far left side of the screen
         log_surface = pygame.Surface((log_rect.width, log_rect.height), pygame.SRCALPHA)
         log_surface.fill((0, 0, 0, 128))  # Semi-transparent black
         
@@ -225,33 +315,15 @@ class UIRenderer:
         
         # Draw title
         title_text = "Event Log"
-        title_surface = self.fonts["medium"].render(title_text, True, (200, 200, 200))
+        title_surface = TEXT.render(self.fonts["medium"], title_text, (200, 200, 200))
         log_surface.blit(title_surface, (log_rect.width // 2 - title_surface.get_width() // 2, 5))
         
         # Draw events
         y_offset = 40  # Start below the title
         for event in self.displayed_events:
-            event_text = event["text"]
-            event_color = event["color"]
-            
-            # Wrap text if it's too long
-            words = event_text.split(' ')
-            lines = []
-            line = ""
-            for word in words:
-                test_line = line + word + " "
-                # If line would be too long with the new word, start a new line
-                if self.fonts["small"].size(test_line)[0] > log_rect.width - 20:
-                    lines.append(line)
-                    line = word + " "
-                else:
-                    line = test_line
-            if line:
-                lines.append(line)
-            
-            # Draw each line of the event
-            for line in lines:
-                text_surface = self.fonts["small"].render(line, True, event_color)
+            # Draw each line of the event, wrapped when it was added
+            for line in event["lines"]:
+                text_surface = TEXT.render(self.fonts["small"], line, event["color"])
                 log_surface.blit(text_surface, (10, y_offset))
                 y_offset += 20
             
@@ -268,6 +340,7 @@ class UIRenderer:
                 
         # Blit log to screen
         screen.blit(log_surface, log_rect)
+        self.event_log_surface = (self.event_log_version, log_surface)
         
     def draw_message(self, screen):
         """Draw an important message on screen
@@ -295,12 +368,12 @@ class UIRenderer:
         
         # Draw message title
         if "title" in self.message:
-            title_surface = self.fonts["large"].render(self.message["title"], True, self.message["color"])
+            title_surface = TEXT.render(self.fonts["large"], self.message["title"], self.message["color"])
             title_rect = title_surface.get_rect(centerx=message_width // 2, top=10)
             message_surface.blit(title_surface, title_rect)
             
         # Draw message text
-        text_surface = self.fonts["medium"].render(self.message["text"], True, self.colors["text"])
+        text_surface = TEXT.render(self.fonts["medium"], self.message["text"], self.colors["text"])
         text_rect = text_surface.get_rect(centerx=message_width // 2, centery=message_height // 2 + 10)
         message_surface.blit(text_surface, text_rect)
         
@@ -334,12 +407,16 @@ class UIRenderer:
         self.displayed_events.insert(0, {
             "text": text,
             "color": color,
-            "time": time.time()
+            "time": time.time(),
+            # Wrap once here rather than every time the log is drawn
+            "lines": wrap_text(self.fonts["small"], text, self.event_log_rect.width - 20)
         })
         
         # Keep only the most recent events
         while len(self.displayed_events) > self.max_displayed_events:
             self.displayed_events.pop()
+            
+        self.event_log_version += 1
     
     def handle_click(self, pos):
         """Handle mouse click on UI elements
@@ -393,7 +470,7 @@ class UIRenderer:
         y_offset = -self.cell_size // 3
         
         # Add symbol to list of event symbols
-        self.event_symbols.append({
+        self.add_event_symbol({
             "type": symbol_type,
             "position": target.position,
             "x_offset": x_offset,
@@ -436,7 +513,7 @@ class UIRenderer:
         y_offset = -self.cell_size // 3
         
         # Add symbol to list of event symbols
-        self.event_symbols.append({
+        self.add_event_symbol({
             "type": "duke",
             "position": goblin.position,
             "x_offset": x_offset,
@@ -471,17 +548,31 @@ class UIRenderer:
         offset_x = (self.screen_width - 300 - grid_width) // 2 + 300
         offset_y = (self.screen_height - grid_height - 100) // 2
         
-        # Draw each active block visualization
+        # Drop expired block visualizations
         current_time = time.time()
-        active_blocks = []
+        self.block_visualizations = [block for block in self.block_visualizations
+                                     if current_time - block["time"] <= self.block_viz_duration]
         
+        # Draw a glowing effect around the arrows of new blocks, on one surface for all of them
+        glow_surface = None
+        for block in self.block_visualizations:
+            if current_time - block["time"] < 1.0:
+                if glow_surface is None:
+                    glow_surface = pygame.Surface((grid_width, grid_height), pygame.SRCALPHA)
+                color = self.block_color(block["result"])
+                start = (block["blocker"].position[0] * self.cell_size + self.cell_size // 2,
+                         block["blocker"].position[1] * self.cell_size + self.cell_size // 2)
+                end = (block["target"].position[0] * self.cell_size + self.cell_size // 2,
+                       block["target"].position[1] * self.cell_size + self.cell_size // 2)
+                for glow_width in range(10, 2, -2):
+                    # Fade the glow as it gets wider
+                    glow_opacity = int(200 * (1 - glow_width / 10))
+                    self.draw_arrow(glow_surface, start, end, (*color, glow_opacity), glow_width)
+        if glow_surface is not None:
+            screen.blit(glow_surface, (offset_x, offset_y))
+        
+        # Draw each active block visualization
         for block in self.block_visualizations:
-            # Check if the block visualization has expired
-            if current_time - block["time"] > self.block_viz_duration:
-                continue
-                
-            active_blocks.append(block)
-            
             blocker = block["blocker"]
             target = block["target"]
             result = block["result"]
@@ -494,39 +585,10 @@ class UIRenderer:
             target_x = offset_x + target.position[0] * self.cell_size + self.cell_size // 2
             target_y = offset_y + target.position[1] * self.cell_size + self.cell_size // 2
             
-            # Choose color based on result
-            if result == "knockdown":
-                color = (255, 0, 0)  # Red for knockdown
-            elif result == "push":
-                color = (255, 165, 0)  # Orange for push
-            else:
-                color = (255, 255, 0)  # Yellow for attempt
-            
-            # Calculate the age of the visualization
-            age = current_time - block["time"]
+            color = self.block_color(result)
             
             # Make the arrow more prominent for newer blocks
-            if age < 1.0:
-                # Draw a thicker, more opaque arrow for new blocks
-                arrow_width = 5
-                
-                # Draw a glowing effect around the arrow
-                glow_surface = pygame.Surface((grid_width, grid_height), pygame.SRCALPHA)
-                for glow_width in range(10, 2, -2):
-                    # Fade the glow as it gets wider
-                    glow_opacity = int(200 * (1 - glow_width / 10))
-                    glow_color = (*color, glow_opacity)
-                    self.draw_arrow(glow_surface, 
-                                  (blocker_x - offset_x, blocker_y - offset_y), 
-                                  (target_x - offset_x, target_y - offset_y), 
-                                  glow_color, 
-                                  glow_width)
-                
-                # Blit the glow to the screen
-                screen.blit(glow_surface, (offset_x, offset_y))
-            else:
-                # Regular arrow for older blocks
-                arrow_width = 3
+            arrow_width = 5 if current_time - block["time"] < 1.0 else 3
             
             # Draw the main arrow
             self.draw_arrow(screen, (blocker_x, blocker_y), (target_x, target_y), color, arrow_width)
@@ -537,7 +599,7 @@ class UIRenderer:
             
             # Draw rolls
             roll_text = f"{blocker_roll} vs {defender_roll}"
-            roll_surface = self.fonts["small"].render(roll_text, True, (255, 255, 255))
+            roll_surface = TEXT.render(self.fonts["small"], roll_text, (255, 255, 255))
             roll_rect = roll_surface.get_rect(center=(midpoint_x, midpoint_y))
             
             # Draw background for text
@@ -551,7 +613,7 @@ class UIRenderer:
             
             # Draw result
             result_text = result.upper()
-            result_surface = self.fonts["small"].render(result_text, True, color)
+            result_surface = TEXT.render(self.fonts["small"], result_text, color)
             result_rect = result_surface.get_rect(center=(midpoint_x, midpoint_y + 15))
             
             # Draw background for result text
@@ -563,8 +625,20 @@ class UIRenderer:
             # Draw the result text
             screen.blit(result_surface, result_rect)
             
-        # Replace the list with only active visualizations
-        self.block_visualizations = active_blocks
+    def block_color(self, result):
+        """Color of a block's arrow and result text
+        
+        Args:
+            result: The result of the block
+            
+        Returns:
+            tuple: RGB color
+        """
+        if result == "knockdown":
+            return (255, 0, 0)  # Red for knockdown
+        elif result == "push":
+            return (255, 165, 0)  # Orange for push
+        return (255, 255, 0)  # Yellow for attempt
         
     def draw_duke_visualizations(self, screen):
         """Draw all active DUKE visualizations
@@ -619,7 +693,7 @@ class UIRenderer:
             
             # Draw DUKE text with success chance
             duke_text = f"DUKE: {'SUCCESS' if success else 'FAIL'} ({int(chance*100)}%)"
-            duke_surface = self.fonts["small"].render(duke_text, True, color)
+            duke_surface = TEXT.render(self.fonts["small"], duke_text, color)
             duke_rect = duke_surface.get_rect(center=(goblin_x, goblin_y - 25))
             
             # Draw background for text
@@ -748,50 +822,71 @@ class UIRenderer:
                 
                 # Draw letter
                 letter = symbol["type"][0].upper()  # First letter of event type (B for Block, D for Duke, etc.)
-                letter_text = self.fonts["symbol"].render(letter, True, (255, 255, 255))
+                letter_text = TEXT.render(self.fonts["symbol"], letter, (255, 255, 255))
                 letter_rect = letter_text.get_rect(center=(screen_x, screen_y))
                 screen.blit(letter_text, letter_rect)
         
-        # Update the list
-        self.event_symbols = active_symbols
+        # Update the list, and the hover index if any expired
+        if len(active_symbols) != len(self.event_symbols):
+            self.event_symbols = active_symbols
+            self.index_event_symbols()
+            
+    def add_event_symbol(self, symbol):
+        """Show a persistent event symbol and make it hoverable
+        
+        Args:
+            symbol: The symbol's dict, with its position, offsets, color, time and details
+        """
+        self.event_symbols.append(symbol)
+        for cell in self.symbol_hit_cells(symbol):
+            self.symbol_cells.setdefault(cell, []).append(symbol)
+            
+    def index_event_symbols(self):
+        """Rebuild the grid cell index of event symbols from the list"""
+        self.symbol_cells = {}
+        for symbol in self.event_symbols:
+            for cell in self.symbol_hit_cells(symbol):
+                self.symbol_cells.setdefault(cell, []).append(symbol)
+                
+    def symbol_hit_cells(self, symbol):
+        """Grid cells a symbol's 20x20 hit area overlaps, which can be off the field
         
-    def update_hover_state(self, screen, hover_pos):
+        Args:
+            symbol: The symbol's dict
+            
+        Returns:
+            list: (x, y) cells
+        """
+        # Hit area relative to the field's top-left corner
+        left = symbol["position"][0] * self.cell_size + symbol["x_offset"] - 10
+        top = symbol["position"][1] * self.cell_size + symbol["y_offset"] - 10
+        return [(x, y)
+                for x in range(left // self.cell_size, (left + 19) // self.cell_size + 1)
+                for y in range(top // self.cell_size, (top + 19) // self.cell_size + 1)]
+        
+    def update_hover_state(self, hover_pos):
         """Update which goblin or symbol is being hovered over
         
         Args:
-            screen: The pygame screen to draw on
             hover_pos: The current mouse position
         """
-        # Calculate grid offsets
-        grid_width = self.game.grid_size * self.cell_size
-        grid_height = self.game.grid_size * self.cell_size
+        # Only what is in the cell under the mouse can be hovered
+        offset_x, offset_y = self.grid_offset()
+        cell = ((hover_pos[0] - offset_x) // self.cell_size, (hover_pos[1] - offset_y) // self.cell_size)
         
-        # Adjust offset to account for the event log on the left
-        offset_x = (self.screen_width - 300 - grid_width) // 2 + 300
-        offset_y = (self.screen_height - grid_height - 100) // 2
-        
-        # Check if hovering over a goblin
+        # Check if hovering over a goblin, within its radius of the cell's centre
         self.hovered_goblin = None
-        for team in [self.game.team1, self.game.team2]:
-            for goblin in team.goblins:
-                if goblin.out_of_game:
-                    continue
-                
-                # Get goblin screen position
-                goblin_x = offset_x + goblin.position[0] * self.cell_size + self.cell_size // 2
-                goblin_y = offset_y + goblin.position[1] * self.cell_size + self.cell_size // 2
-                
-                # Check if mouse is within goblin radius
-                radius = self.cell_size // 3
-                distance = math.sqrt((hover_pos[0] - goblin_x) ** 2 + (hover_pos[1] - goblin_y) ** 2)
-                
-                if distance <= radius:
-                    self.hovered_goblin = goblin
-                    break
+        goblin = self.game.grid.get_entity_at_position(cell)
+        if goblin is not None and not goblin.out_of_game:
+            dx = hover_pos[0] - (offset_x + goblin.position[0] * self.cell_size + self.cell_size // 2)
+            dy = hover_pos[1] - (offset_y + goblin.position[1] * self.cell_size + self.cell_size // 2)
+            radius = self.cell_size // 3
+            if dx * dx + dy * dy <= radius * radius:
+                self.hovered_goblin = goblin
         
         # Check if hovering over an event symbol
         self.hovered_symbol = None
-        for symbol in self.event_symbols:
+        for symbol in self.symbol_cells.get(cell, ()):
             # Calculate symbol position
             symbol_x = offset_x + symbol["position"][0] * self.cell_size + symbol["x_offset"]
             symbol_y = offset_y + symbol["position"][1] * self.cell_size + symbol["y_offset"]
@@ -803,8 +898,9 @@ class UIRenderer:
                 self.hovered_symbol = symbol
                 break
                 
-        # Update flash timer for animations - slowed down by factor of 4
-        self.flash_timer = (self.flash_timer + 0.025) % 1.0  # Oscillates between 0 and 1, 4x slower
+        # Update flash timer for animations, from the clock so it flashes at the
+        # same speed however often frames are drawn
+        self.flash_timer = (time.time() * 1.5) % 1.0  # Oscillates between 0 and 1
             
     def draw_hover_info(self, screen, hover_pos):
         """Draw information popup for hovered goblin or event symbol
@@ -877,21 +973,20 @@ class UIRenderer:
             # Create info popup
             popup_width = 250
             popup_height = 200 if duke_attempts else 150  # Larger popup if we have duke attempts
-            popup_x = min(hover_pos[0] + 10, self.screen_width - popup_width - 10)
-            popup_y = min(hover_pos[1] + 10, self.screen_height - popup_height - 10)
+            popup_x, popup_y = self.popup_rect(hover_pos, popup_width, popup_height).topleft
             
             # Create popup surface
             popup = pygame.Surface((popup_width, popup_height), pygame.SRCALPHA)
             popup.fill(self.colors["info_bg"])
             
             # Draw goblin name
-            name_text = self.fonts["medium"].render(goblin.name, True, self.colors["text"])
+            name_text = TEXT.render(self.fonts["medium"], goblin.name, self.colors["text"])
             popup.blit(name_text, (10, 10))
             
             # Draw team name and color
             team_name = goblin.team.name
             team_color = self.colors["team1"] if goblin.team == self.game.team1 else self.colors["team2"]
-            team_text = self.fonts["small"].render(team_name, True, team_color)
+            team_text = TEXT.render(self.fonts["small"], team_name, team_color)
             popup.blit(team_text, (10, 35))
             
             # Draw detailed stats
@@ -905,14 +1000,14 @@ class UIRenderer:
             
             y_offset = 60
             for stat in stats:
-                stat_text = self.fonts["small"].render(stat, True, self.colors["text"])
+                stat_text = TEXT.render(self.fonts["small"], stat, self.colors["text"])
                 popup.blit(stat_text, (10, y_offset))
                 y_offset += 15
             
             # If there are any duke attempts, show them
             if duke_attempts:
                 y_offset += 10
-                duke_title = self.fonts["medium"].render("Recent DUKE Attempts:", True, (200, 200, 200))
+                duke_title = TEXT.render(self.fonts["medium"], "Recent DUKE Attempts:", (200, 200, 200))
                 popup.blit(duke_title, (10, y_offset))
                 y_offset += 25
                 
@@ -922,14 +1017,14 @@ class UIRenderer:
                     duke_color = (0, 200, 0) if success else (200, 0, 0)
                     
                     duke_result = f"{'SUCCESS' if success else 'FAILURE'} - {int(chance*100)}% chance"
-                    duke_text = self.fonts["small"].render(duke_result, True, duke_color)
+                    duke_text = TEXT.render(self.fonts["small"], duke_result, duke_color)
                     popup.blit(duke_text, (15, y_offset))
                     y_offset += 15
                 
                     # If it failed, also show how many blockers
                     if not success:
                         blockers_text = f"Blockers: {len(duke['blockers'])}"
-                        blockers_surface = self.fonts["small"].render(blockers_text, True, self.colors["text"])
+                        blockers_surface = TEXT.render(self.fonts["small"], blockers_text, self.colors["text"])
                         popup.blit(blockers_surface, (15, y_offset))
                         y_offset += 15
             
@@ -955,8 +1050,7 @@ class UIRenderer:
             # Create info popup
             popup_width = 280
             popup_height = 180
-            popup_x = min(hover_pos[0] + 10, self.screen_width - popup_width - 10)
-            popup_y = min(hover_pos[1] + 10, self.screen_height - popup_height - 10)
+            popup_x, popup_y = self.popup_rect(hover_pos, popup_width, popup_height).topleft
             
             # Create popup surface
             popup = pygame.Surface((popup_width, popup_height), pygame.SRCALPHA)
@@ -964,7 +1058,7 @@ class UIRenderer:
             
             # Draw event type
             event_type = symbol["type"].upper()
-            type_text = self.fonts["medium"].render(event_type, True, symbol["color"])
+            type_text = TEXT.render(self.fonts["medium"], event_type, symbol["color"])
             popup.blit(type_text, (10, 10))
             
             # Draw event details
@@ -1015,7 +1109,7 @@ class UIRenderer:
             
             y_offset = 40
             for line in lines:
-                line_text = self.fonts["small"].render(line, True, self.colors["text"])
+                line_text = TEXT.render(self.fonts["small"], line, self.colors["text"])
                 popup.blit(line_text, (10, y_offset))
                 y_offset += 20
             
@@ -93,10 +93,10 @@ def get_positions_in_range(center, max_distance, grid_size):
                     
     return positions
     
-def weighted_choice(choices):
-    """Make a weighted random choice from a list of (item, weight) tuples"""
+def weighted_choice(choices, rng=None):
+    """Make a weighted random choice from a list of (item, weight) tuples, drawing from rng if given"""
     total = sum(weight for _, weight in choices)
-    r = random.random() * total
+    r = (rng or random).random() * total
     
     running_total = 0
     for item, weight in choices: